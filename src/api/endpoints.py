@@ -1,13 +1,77 @@
 # src/api/endpoints.py
-from fastapi import APIRouter, HTTPException, Request
+import os
+from fastapi import APIRouter, Body, HTTPException, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 from typing import List, Optional, Dict
+from src.api.executor import DeadlineExceededError, SaturatedError
+from src.api.jobs import request_prefork_reload
+from src.api.metrics import profiled, update_model_gauges
+from src.api.responses import RawJSONResponse
+from src.models.catalog import process_rss_mb
+from src.models.recency import decode_cursor
 from src.models.recommender import NewsRecommendationSystem
 from src.utils.logger import logger
 from src.utils.config import Config
+from src.utils.metrics import registry
+from src.utils.serialization import render_object
 
 router = APIRouter()
 
 
+class ClickEvent(BaseModel):
+    """Clique de um usuário em uma notícia."""
+
+    page: str
+    userId: Optional[str] = None
+    # Instante do clique em ms desde a época; por padrão, o recebimento
+    timestamp: Optional[float] = None
+
+
+class EventsRequest(BaseModel):
+    """Corpo da requisição de ingestão de cliques."""
+
+    events: List[ClickEvent]
+
+
+class BatchRecommendationRequest(BaseModel):
+    """Corpo da requisição de recomendações em lote."""
+
+    user_ids: List[str]
+    n: int = 5
+
+
+async def _score(request: Request, function, *args, timeout: Optional[float] = None):
+    """Calcula no executor de scoring; responde 503 se saturado ou fora do prazo."""
+    # Com `?profile=1`, o cálculo também é perfilado na thread de scoring
+    sessions = getattr(request.state, "profile_sessions", None)
+    if sessions is not None:
+        function = profiled(function, sessions)
+    try:
+        return await request.app.state.scoring.run(function, *args, timeout=timeout)
+    except (SaturatedError, DeadlineExceededError) as e:
+        logger.warning(f"Requisição recusada: {e}")
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(Config.RETRY_AFTER_SECONDS)},
+        )
+
+
+def _require_single_process(request: Request, endpoint: str) -> None:
+    """Recusa, no modo multi-worker, endpoints que alteram só um worker."""
+    if getattr(request.app.state, "prefork_parent", None) is not None:
+        raise HTTPException(
+            status_code=501,
+            detail=(
+                f"{endpoint} não está disponível no modo multi-worker: a "
+                "alteração valeria só para o worker que atendesse a requisição. "
+                "Sirva com um único processo ou retreine o modelo."
+            ),
+        )
+
+
 @router.get("/", response_model=dict)
 async def root(request: Request):
     """Endpoint raiz com informações básicas da API."""
@@ -19,11 +83,16 @@ async def root(request: Request):
         "endpoints": [
             "/health",
             "/recommend/{user_id}",
+            "/recommend/batch",
             "/popular",
             "/recent",
             "/train-model",
+            "/train-model/{job_id}",
             "/reload-model",
             "/add-new",
+            "/events",
+            "/cache/stats",
+            "/metrics",
         ],
     }
 
@@ -37,12 +106,20 @@ async def health_check(request: Request):
         "model_status": "loaded" if recommender else "limited",
         "model_source": "local" if Config.MODEL_PATH.exists() else "none",
         "data_loaded": (
-            "yes" if recommender and recommender.news_df is not None else "no"
+            "yes" if recommender and recommender.has_catalog else "no"
+        ),
+        "memory": (
+            recommender.memory_usage()
+            if recommender
+            else {"pid": os.getpid(), "rss_mb": process_rss_mb()}
         ),
+        "vocabulary": recommender.vocabulary_status() if recommender else None,
     }
 
 
-@router.get("/recommend/{user_id}", response_model=dict)
+# Endpoints do caminho crítico devolvem JSON já montado em bytes, sem
+# `response_model`, o que evita a revalidação e a reserialização da resposta
+@router.get("/recommend/{user_id}", response_class=RawJSONResponse)
 async def get_recommendations(user_id: str, request: Request, n: Optional[int] = 5):
     """Retorna recomendações personalizadas para um usuário."""
     recommender = request.app.state.recommender
@@ -52,12 +129,20 @@ async def get_recommendations(user_id: str, request: Request, n: Optional[int] =
         )
 
     try:
-        recommendations = recommender.get_user_recommendations(user_id, n)
-        return {
-            "user_id": user_id,
-            "recommendations": recommendations,
-            "status": "success",
-        }
+        recommendations = await _score(
+            request, recommender.render_user_recommendations, user_id, n
+        )
+        return RawJSONResponse(
+            render_object(
+                {
+                    "user_id": user_id,
+                    "recommendations": recommendations,
+                    "status": "success",
+                }
+            )
+        )
+    except HTTPException:
+        raise
     except ValueError as e:
         logger.error(f"Dados não carregados: {e}")
         raise HTTPException(status_code=503, detail=f"Dados não carregados: {e}")
@@ -66,7 +151,57 @@ async def get_recommendations(user_id: str, request: Request, n: Optional[int] =
         raise HTTPException(status_code=500, detail=f"Erro ao gerar recomendações: {e}")
 
 
-@router.get("/popular", response_model=dict)
+@router.post("/recommend/batch")
+async def get_batch_recommendations(
+    payload: BatchRecommendationRequest, request: Request
+):
+    """Retorna recomendações para vários usuários em NDJSON, uma linha por usuário."""
+    recommender = request.app.state.recommender
+    if not recommender:
+        raise HTTPException(
+            status_code=503, detail="Serviço indisponível. Modelo não carregado."
+        )
+
+    try:
+        block_size = recommender.batch_block_size()
+    except ValueError as e:
+        logger.error(f"Dados não carregados: {e}")
+        raise HTTPException(status_code=503, detail=f"Dados não carregados: {e}")
+
+    user_ids, n = payload.user_ids, payload.n
+    blocks = [
+        user_ids[begin : begin + block_size]
+        for begin in range(0, len(user_ids), block_size)
+    ]
+
+    async def render(block):
+        return await _score(
+            request,
+            recommender.render_batch_block,
+            block,
+            n,
+            timeout=Config.BATCH_BLOCK_TIMEOUT,
+        )
+
+    # O primeiro bloco é calculado antes de responder, para que uma recusa
+    # do executor ainda vire 503; os demais seguem pelo stream
+    first = await render(blocks[0]) if blocks else b""
+
+    async def stream():
+        yield first
+        for block in blocks[1:]:
+            try:
+                yield await render(block)
+            except HTTPException as e:
+                # O status já foi enviado: o stream termina antes do fim
+                logger.warning(f"Lote interrompido: {e.detail}")
+                return
+
+    logger.debug(f"Gerando recomendações em lote para {len(user_ids)} usuários")
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@router.get("/popular", response_class=RawJSONResponse)
 async def get_popular_news(request: Request, n: Optional[int] = 5):
     """Retorna as notícias mais populares."""
     recommender = request.app.state.recommender
@@ -76,16 +211,21 @@ async def get_popular_news(request: Request, n: Optional[int] = 5):
         )
 
     try:
-        logger.info("Obtendo notícias populares...")
-        if recommender.news_df is None or recommender.popularity_scores is None:
+        logger.debug("Obtendo notícias populares...")
+        if recommender.popularity_scores is None:
             logger.error(
                 "Dados não carregados. Execute load_data e prepare_data primeiro."
             )
             raise HTTPException(status_code=503, detail="Dados não carregados.")
 
-        popular_news = recommender.get_popular_recommendations(n)
-        logger.info(f"Notícias populares obtidas: {popular_news}")
-        return {"popular_news": popular_news, "status": "success"}
+        popular_news = await _score(
+            request, recommender.render_popular_recommendations, n
+        )
+        return RawJSONResponse(
+            render_object({"popular_news": popular_news, "status": "success"})
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Erro ao obter notícias populares: {e}")
         raise HTTPException(
@@ -93,22 +233,41 @@ async def get_popular_news(request: Request, n: Optional[int] = 5):
         )
 
 
-@router.get("/recent", response_model=dict)
-async def get_recent_news(request: Request, n: Optional[int] = 5):
-    """Retorna as notícias mais recentes."""
+@router.get("/recent", response_class=RawJSONResponse)
+async def get_recent_news(
+    request: Request,
+    n: Optional[int] = 5,
+    hours: Optional[float] = None,
+    cursor: Optional[str] = None,
+):
+    """Retorna as notícias mais recentes, paginadas pelo cursor `next_cursor`."""
     recommender = request.app.state.recommender
     if not recommender:
         raise HTTPException(
             status_code=503, detail="Serviço indisponível. Modelo não carregado."
         )
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Cursor inválido: {cursor}")
 
     try:
-        logger.info("Obtendo notícias recentes...")
-        recent_news = recommender.get_recent_news(
-            n
-        )  # Chama o método get_recent_news da classe
-        logger.info(f"Notícias recentes obtidas: {recent_news}")
-        return {"recent_news": recent_news, "status": "success"}
+        logger.debug("Obtendo notícias recentes...")
+        recent_news, next_cursor = await _score(
+            request, recommender.render_recent_page, n, hours, cursor
+        )
+        return RawJSONResponse(
+            render_object(
+                {
+                    "recent_news": recent_news,
+                    "next_cursor": next_cursor,
+                    "status": "success",
+                }
+            )
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Erro ao obter notícias recentes: {e}")
         raise HTTPException(
@@ -116,31 +275,93 @@ async def get_recent_news(request: Request, n: Optional[int] = 5):
         )
 
 
-@router.post("/train-model", response_model=dict)
-async def train_model(request: Request):
-    """Treina o modelo a partir dos dados atuais."""
-    new_recommender = NewsRecommendationSystem(data_dir=Config.DATA_DIR)
-    if not new_recommender:
+@router.post("/events", response_model=dict, status_code=202)
+async def ingest_events(payload: EventsRequest, request: Request):
+    """Registra cliques nos contadores de popularidade em tempo real."""
+    _require_single_process(request, "/events")
+    recommender = request.app.state.recommender
+    if not recommender:
         raise HTTPException(
             status_code=503, detail="Serviço indisponível. Modelo não carregado."
         )
 
+    pages = [event.page for event in payload.events]
+    timestamps = [event.timestamp for event in payload.events]
     try:
-        logger.info("Iniciando treinamento do modelo...")
-        new_recommender.train_model()  # Chama o método train_model da classe
-        logger.info("Modelo treinado e salvo com sucesso.")
-        return {"status": "success", "message": "Modelo treinado e salvo com sucesso."}
+        result = await _score(request, recommender.record_events, pages, timestamps)
+        return {"status": "accepted", **result}
+    except HTTPException:
+        raise
+    except ValueError as e:
+        logger.error(f"Dados não carregados: {e}")
+        raise HTTPException(status_code=503, detail=f"Dados não carregados: {e}")
+
+
+@router.post("/train-model", response_model=dict, status_code=202)
+async def train_model(request: Request):
+    """Agenda o treinamento do modelo em segundo plano."""
+    try:
+        job_id = request.app.state.training_jobs.submit(
+            request.app, Config.DATA_DIR, Config.MODEL_PATH
+        )
+        return {
+            "status": "accepted",
+            "job_id": job_id,
+            "message": "Treinamento iniciado em segundo plano.",
+        }
     except Exception as e:
-        logger.error(f"Erro ao treinar o modelo: {e}")
+        logger.error(f"Erro ao agendar o treinamento do modelo: {e}")
         raise HTTPException(status_code=500, detail=f"Erro ao treinar o modelo: {e}")
 
 
+@router.get("/train-model/{job_id}", response_model=dict)
+async def get_training_job(job_id: str, request: Request):
+    """Retorna o estado de um treinamento em segundo plano."""
+    job = request.app.state.training_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Treinamento não encontrado.")
+    return job
+
+
+@router.get("/cache/stats", response_model=dict)
+async def cache_stats(request: Request):
+    """Retorna os contadores dos caches de recomendação."""
+    recommender = request.app.state.recommender
+    if not recommender:
+        raise HTTPException(
+            status_code=503, detail="Serviço indisponível. Modelo não carregado."
+        )
+    return {
+        "model_version": recommender.model_version,
+        "user_cache": recommender.user_cache.stats(),
+        "response_cache": {"entries": len(recommender.response_cache)},
+    }
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics(request: Request):
+    """Retorna as métricas do processo no formato de texto do Prometheus."""
+    update_model_gauges(getattr(request.app.state, "recommender", None))
+    return PlainTextResponse(
+        registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 @router.get("/reload-model", response_model=dict)
 async def reload_model(request: Request):
     """Recarrega o modelo a partir do diretório local."""
+    # No modo multi-worker, o pai recarrega o modelo e substitui os workers
+    if request_prefork_reload(request.app):
+        logger.info("Recarga do modelo solicitada ao processo principal.")
+        return {
+            "status": "accepted",
+            "message": "Recarga solicitada. Os workers serão substituídos.",
+        }
     try:
         logger.info("Recarregando modelo...")
-        new_recommender = NewsRecommendationSystem.load_model(str(Config.MODEL_PATH))
+        new_recommender = await run_in_threadpool(
+            NewsRecommendationSystem.load_model, str(Config.MODEL_PATH)
+        )
         if new_recommender:
             request.app.state.recommender = new_recommender
             logger.info("Modelo recarregado com sucesso.")
@@ -154,8 +375,9 @@ async def reload_model(request: Request):
 
 
 @router.post("/add-news", response_model=dict)
-async def add_news(request: Request, news: List[Dict]):
+async def add_news(request: Request, news: List[Dict] = Body(..., embed=True)):
     """Adiciona novas notícias ao sistema."""
+    _require_single_process(request, "/add-news")
     recommender = request.app.state.recommender
     if not recommender:
         raise HTTPException(
@@ -164,9 +386,19 @@ async def add_news(request: Request, news: List[Dict]):
 
     try:
         logger.info("Adicionando novas notícias...")
-        recommender.add_news(news)  # Chama o método add_news da classe
+        # No executor de scoring, com o lock de escrita do modelo: as consultas
+        # em andamento terminam antes, e as novas esperam a inclusão acabar
+        result = await _score(
+            request, recommender.add_news, news, timeout=Config.ADD_NEWS_TIMEOUT
+        )
         logger.info("Notícias adicionadas com sucesso.")
-        return {"status": "success", "message": "Notícias adicionadas com sucesso."}
+        return {
+            "status": "success",
+            "message": "Notícias adicionadas com sucesso.",
+            **result,
+        }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Erro ao adicionar notícias: {e}")
         raise HTTPException(status_code=500, detail=f"Erro ao adicionar notícias: {e}")
@@ -0,0 +1,119 @@
+# src/api/executor.py
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from src.utils.config import Config
+from src.utils.metrics import SCORING_PENDING, SCORING_REJECTED
+
+
+class SaturatedError(RuntimeError):
+    """A fila de cálculo está cheia; a requisição deve ser repetida depois."""
+
+
+class DeadlineExceededError(RuntimeError):
+    """O cálculo não terminou dentro do prazo da requisição."""
+
+
+class ScoringExecutor:
+    """
+    Executa o cálculo das recomendações fora do event loop, com limites.
+
+    O cálculo roda em uma pool limitada de threads (NumPy, SciPy e BLAS
+    liberam o GIL nas operações pesadas), de modo que uma requisição lenta
+    não bloqueia as demais. Há dois limites para manter a latência de cauda
+    sob controle em rajadas:
+
+    - admissão: com `max_workers + max_pending` cálculos em andamento, novas
+      requisições são recusadas na hora com `SaturatedError`, em vez de
+      esperarem em uma fila sem fim;
+    - prazo: a requisição espera no máximo `timeout` segundos. Um cálculo
+      que sai da fila depois do prazo é descartado sem ser executado.
+
+    As threads são criadas sob demanda, então o executor pode ser criado
+    antes do `fork` dos workers.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = Config.SCORING_THREADS,
+        max_pending: int = Config.SCORING_QUEUE,
+        timeout: float = Config.SCORING_TIMEOUT,
+    ):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._executor = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="scoring"
+            )
+        return self._executor
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def run(
+        self, function: Callable[..., Any], *args, timeout: Optional[float] = None
+    ) -> Any:
+        """
+        Executa `function(*args)` na pool e aguarda o resultado.
+
+        Args:
+            function (Callable): Cálculo síncrono.
+            *args: Argumentos do cálculo.
+            timeout (float, opcional): Prazo em segundos (padrão: `self.timeout`).
+
+        Returns:
+            Any: Resultado do cálculo.
+
+        Raises:
+            SaturatedError: Se a pool e a fila estiverem cheias.
+            DeadlineExceededError: Se o cálculo não terminar dentro do prazo.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_pending:
+                SCORING_REJECTED.inc(reason="saturated")
+                raise SaturatedError("Servidor sobrecarregado. Tente novamente.")
+            self._pending += 1
+            SCORING_PENDING.set(self._pending)
+
+        deadline = time.monotonic() + timeout
+        future = self.executor.submit(self._call, deadline, function, args)
+        future.add_done_callback(self._release)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            future.cancel()
+            SCORING_REJECTED.inc(reason="deadline")
+            raise DeadlineExceededError(
+                f"Recomendações não calculadas em {timeout:.1f}s."
+            )
+
+    @staticmethod
+    def _call(deadline: float, function: Callable[..., Any], args: tuple) -> Any:
+        """Executa o cálculo, exceto se o prazo já passou enquanto ele esperava."""
+        if time.monotonic() > deadline:
+            raise DeadlineExceededError("Prazo esgotado na fila.")
+        return function(*args)
+
+    def _release(self, future: Future) -> None:
+        """Libera a vaga do cálculo concluído ou cancelado."""
+        with self._lock:
+            self._pending -= 1
+            SCORING_PENDING.set(self._pending)
+
+    def shutdown(self) -> None:
+        """Encerra a pool, cancelando os cálculos que ainda não começaram."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
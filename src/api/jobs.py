@@ -0,0 +1,171 @@
+import asyncio
+import multiprocessing
+import os
+import re
+import signal
+import uuid
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
+from src.models.recommender import NewsRecommendationSystem
+from src.utils.logger import logger
+from src.utils.serialization import dumps, loads
+
+_JOB_ID = re.compile(r"[0-9a-f]{32}")
+
+
+def request_prefork_reload(app: FastAPI) -> bool:
+    """
+    No modo multi-worker, pede ao processo pai que recarregue o modelo.
+
+    O pai recebe SIGHUP, carrega o modelo salvo e substitui todos os
+    workers (ver `src.api.serve`). Retorna False fora desse modo.
+    """
+    parent = getattr(app.state, "prefork_parent", None)
+    if not parent:
+        return False
+    os.kill(parent, signal.SIGHUP)
+    return True
+
+
+def _train(data_dir: str, model_path: str) -> str:
+    """Treina e salva um modelo novo. Executado em um processo separado."""
+    recommender = NewsRecommendationSystem(data_dir=data_dir)
+    recommender.train_model(model_path)
+    return model_path
+
+
+class TrainingJobManager:
+    """
+    Executa treinamentos em segundo plano e troca o modelo servido ao final.
+
+    O treinamento roda em uma pool de processos, fora do event loop. Quando
+    termina, o modelo salvo é carregado em uma thread e atribuído a
+    `app.state.recommender` de uma só vez: requisições em andamento continuam
+    usando o modelo anterior e as seguintes já usam o novo.
+
+    No modo multi-worker, o treinamento concluído pede ao processo pai que
+    recarregue o modelo em todos os workers (`request_prefork_reload`). Com
+    `state_dir`, o estado de cada job também é gravado em um arquivo JSON,
+    para que qualquer worker responda `GET /train-model/{job_id}`.
+    """
+
+    def __init__(
+        self,
+        executor: Optional[Executor] = None,
+        max_workers: int = 1,
+        state_dir: Optional[Path] = None,
+    ):
+        self._executor = executor
+        self._max_workers = max_workers
+        self._futures: Dict[str, Future] = {}
+        self._tasks = set()
+        self.jobs: Dict[str, Dict] = {}
+        self.state_dir = Path(state_dir) if state_dir is not None else None
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def submit(self, app: FastAPI, data_dir: str, model_path: str) -> str:
+        """Agenda um treinamento e retorna o ID do job."""
+        job_id = uuid.uuid4().hex
+        self.jobs[job_id] = {
+            "job_id": job_id,
+            "status": "queued",
+            "submitted_at": datetime.now().isoformat(),
+            "finished_at": None,
+            "error": None,
+        }
+        self._save(job_id)
+        future = self.executor.submit(_train, str(data_dir), str(model_path))
+        self._futures[job_id] = future
+
+        task = asyncio.get_running_loop().create_task(
+            self._complete(job_id, future, app)
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        logger.info(f"Treinamento {job_id} agendado.")
+        return job_id
+
+    async def _complete(self, job_id: str, future: Future, app: FastAPI) -> None:
+        """Aguarda o treinamento e troca o modelo servido."""
+        job = self.jobs[job_id]
+        reload_parent = False
+        try:
+            model_path = await asyncio.wrap_future(future)
+            reload_parent = getattr(app.state, "prefork_parent", None) is not None
+            if not reload_parent:
+                job["status"] = "loading"
+                self._save(job_id)
+                recommender = await run_in_threadpool(
+                    NewsRecommendationSystem.load_model, model_path
+                )
+                app.state.recommender = recommender
+            job["status"] = "completed"
+            logger.info(f"Treinamento {job_id} concluído.")
+        except Exception as e:
+            job["status"] = "failed"
+            job["error"] = str(e)
+            logger.error(f"Erro no treinamento {job_id}: {e}")
+        finally:
+            job["finished_at"] = datetime.now().isoformat()
+            self._save(job_id)
+            self._futures.pop(job_id, None)
+        # O estado já foi gravado: a recarga encerra este worker em seguida
+        if reload_parent:
+            request_prefork_reload(app)
+
+    def _path(self, job_id: str) -> Optional[Path]:
+        """Arquivo com o estado do job, se houver `state_dir`."""
+        if self.state_dir is None or not _JOB_ID.fullmatch(job_id):
+            return None
+        return self.state_dir / f"{job_id}.json"
+
+    def _save(self, job_id: str) -> None:
+        """Grava o estado do job em `state_dir`, de forma atômica."""
+        path = self._path(job_id)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temporary = path.with_suffix(f".{os.getpid()}.tmp")
+            temporary.write_bytes(dumps(self.jobs[job_id]))
+            os.replace(temporary, path)
+        except OSError as e:
+            logger.warning(f"Erro ao gravar o estado do treinamento {job_id}: {e}")
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Retorna o estado de um job, ou None se ele não existir."""
+        job = self.jobs.get(job_id)
+        if job is None:
+            # Job de outro worker, lido do estado compartilhado
+            path = self._path(job_id)
+            if path is None or not path.exists():
+                return None
+            return loads(path.read_bytes())
+        future = self._futures.get(job_id)
+        if job["status"] == "queued" and future is not None and future.running():
+            job["status"] = "running"
+            self._save(job_id)
+        return dict(job)
+
+    def shutdown(self) -> None:
+        """Encerra a pool de processos, marcando os jobs interrompidos."""
+        for job_id in list(self._futures):
+            self.jobs[job_id]["status"] = "failed"
+            self.jobs[job_id]["error"] = "Worker encerrado durante o treinamento."
+            self.jobs[job_id]["finished_at"] = datetime.now().isoformat()
+            self._save(job_id)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
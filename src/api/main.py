@@ -4,6 +4,11 @@ from fastapi import FastAPI
 from src.utils.logger import logger
 from src.utils.config import Config
 from src.api.endpoints import router as api_router
+from src.api.executor import ScoringExecutor
+from src.api.jobs import TrainingJobManager
+from src.api.metrics import MetricsMiddleware
+from src.api.responses import FastJSONResponse
+from src.models.artifact import convert_pickle
 from src.models.recommender import NewsRecommendationSystem
 
 # Cria a aplicação FastAPI
@@ -11,20 +16,33 @@ app = FastAPI(
     title="G1 News Recommender",
     description="API de recomendação de notícias do G1",
     version="1.0.0",
+    default_response_class=FastJSONResponse,
 )
 
 # Adiciona os endpoints
 app.include_router(api_router)
 
+# Mede a latência de cada endpoint, exportada em /metrics
+app.add_middleware(MetricsMiddleware)
+
+# Gerenciador dos treinamentos em segundo plano (com o estado em disco,
+# visível a todos os workers)
+app.state.training_jobs = TrainingJobManager(state_dir=Config.JOBS_DIR)
+
+# Pool limitada que calcula as recomendações fora do event loop
+app.state.scoring = ScoringExecutor()
+
 # Instância do recomendador
 recommender = None
 
 
-@app.on_event("startup")
-async def startup_event():
-    """Carrega o modelo na inicialização da API."""
-    global recommender
+def load_recommender() -> NewsRecommendationSystem:
+    """Carrega o modelo local ou, na falta dele, treina a partir dos dados."""
     try:
+        if not Config.MODEL_PATH.exists() and Config.LEGACY_MODEL_PATH.exists():
+            logger.info("Modelo no formato pickle encontrado. Convertendo...")
+            convert_pickle(Config.LEGACY_MODEL_PATH, Config.MODEL_PATH)
+
         if Config.MODEL_PATH.exists():
             logger.info("Carregando modelo local...")
             recommender = NewsRecommendationSystem.load_model(str(Config.MODEL_PATH))
@@ -43,10 +61,31 @@ async def startup_event():
         logger.error(f"Erro ao carregar o modelo: {e}")
         logger.warning("API iniciada em modo limitado.")
         recommender = NewsRecommendationSystem(data_dir=Config.DATA_DIR)
+    return recommender
+
+
+@app.on_event("startup")
+async def startup_event():
+    """Carrega o modelo na inicialização da API."""
+    global recommender
+    # No modo multi-worker (src.api.serve), o modelo já foi carregado pelo
+    # processo pai e é herdado pelos workers
+    if getattr(app.state, "preloaded", False):
+        recommender = app.state.recommender
+        return
+
+    recommender = load_recommender()
 
     # Armazena o recommender no estado do app
     app.state.recommender = recommender
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Encerra os treinamentos em segundo plano e a pool de cálculo."""
+    app.state.training_jobs.shutdown()
+    app.state.scoring.shutdown()
+
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=Config.PORT)
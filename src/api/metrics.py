@@ -0,0 +1,139 @@
+# src/api/metrics.py
+import functools
+import time
+from typing import Callable, List, Optional
+from urllib.parse import parse_qs
+
+from src.models.catalog import process_rss_mb
+from src.utils.config import Config
+from src.utils.logger import logger
+from src.utils.metrics import (
+    CACHE_ENTRIES,
+    CATALOG_ITEMS,
+    MODEL_INFO,
+    REQUEST_LATENCY,
+    RESIDENT_MEMORY,
+    USER_CACHE_BYTES,
+)
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que mede a latência de cada requisição por endpoint.
+
+    O endpoint é o caminho da rota (por exemplo, '/recommend/{user_id}'), e
+    não o caminho da URL, para manter a cardinalidade dos rótulos limitada.
+    Com `PROFILING_ENABLED`, uma requisição com `?profile=1` é executada sob
+    o profiler por amostragem e a resposta é substituída pelo relatório. O
+    relatório junta o event loop e as threads de scoring: o cálculo passado
+    ao executor é perfilado na própria thread (ver `profiled`).
+    """
+
+    def __init__(self, app, profiling: bool = Config.PROFILING_ENABLED):
+        self.app = app
+        self.profiling = profiling
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if self.profiling and _wants_profile(scope):
+            await self._profile(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            REQUEST_LATENCY.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                endpoint=getattr(route, "path", "unmatched"),
+                status=str(status),
+            )
+
+    async def _profile(self, scope, receive, send):
+        """Executa a requisição sob o profiler e responde com o relatório HTML."""
+        try:
+            from pyinstrument import Profiler
+            from pyinstrument.renderers import HTMLRenderer
+            from pyinstrument.session import Session
+        except ImportError:
+            logger.warning(
+                "Profiling solicitado, mas o pyinstrument não está instalado."
+            )
+            await self.app(scope, receive, send)
+            return
+
+        async def discard(message):
+            pass
+
+        # Sessões das threads de scoring, preenchidas por `profiled`
+        sessions = []
+        scope.setdefault("state", {})["profile_sessions"] = sessions
+        profiler = Profiler(interval=Config.PROFILING_INTERVAL, async_mode="enabled")
+        profiler.start()
+        await self.app(scope, receive, discard)
+        sessions.insert(0, profiler.stop())
+
+        session = functools.reduce(Session.combine, sessions)
+        body = HTMLRenderer().render(session).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"text/html; charset=utf-8"),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+def profiled(function: Callable, sessions: List) -> Callable:
+    """Envolve `function` para perfilá-la na thread que a executa."""
+    from pyinstrument import Profiler
+
+    @functools.wraps(function)
+    def run(*args, **kwargs):
+        profiler = Profiler(interval=Config.PROFILING_INTERVAL, async_mode="disabled")
+        profiler.start()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            sessions.append(profiler.stop())
+
+    return run
+
+
+def _wants_profile(scope) -> bool:
+    """Verifica se a requisição pediu profiling com `?profile=1`."""
+    query = parse_qs(scope.get("query_string", b"").decode())
+    return query.get("profile", ["0"])[-1] in ("1", "true")
+
+
+def update_model_gauges(recommender: Optional[object]) -> None:
+    """Atualiza os gauges de cache, versão e catálogo a partir do recomendador."""
+    rss_mb = process_rss_mb()
+    if rss_mb is not None:
+        RESIDENT_MEMORY.set(int(rss_mb * 1024**2))
+    if not recommender:
+        return
+    MODEL_INFO.clear()
+    MODEL_INFO.set(1, version=recommender.model_version, engine=recommender.engine)
+    CACHE_ENTRIES.set(len(recommender.response_cache), cache="response")
+    stats = recommender.user_cache.stats()
+    CACHE_ENTRIES.set(stats["entries"], cache="user")
+    USER_CACHE_BYTES.set(stats["bytes"])
+    if recommender.has_catalog:
+        CATALOG_ITEMS.set(recommender.catalog_size())
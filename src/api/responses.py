@@ -0,0 +1,19 @@
+# src/api/responses.py
+from typing import Any
+
+from starlette.responses import JSONResponse, Response
+
+from src.utils.serialization import dumps
+
+
+class FastJSONResponse(JSONResponse):
+    """Resposta JSON serializada por `dumps` (orjson, quando disponível)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class RawJSONResponse(Response):
+    """Resposta cujo conteúdo já é JSON em bytes, enviado sem reserialização."""
+
+    media_type = "application/json"
@@ -0,0 +1,176 @@
+# src/api/serve.py
+import argparse
+import gc
+import os
+import signal
+import socket
+import time
+from typing import Dict
+
+import uvicorn
+from fastapi import FastAPI
+from src.api.main import app, load_recommender
+from src.utils.config import Config
+from src.utils.logger import logger
+
+
+class PreforkServer:
+    """
+    Servidor com vários workers que compartilham o modelo carregado uma vez.
+
+    O processo pai carrega o modelo (com os arrays mapeados em memória),
+    congela os objetos com `gc.freeze` e cria os workers com `fork`. Os
+    workers herdam o modelo por copy-on-write: os arrays mapeados e as
+    páginas do heap do pai são compartilhados, e o `gc.freeze` evita que a
+    coleta de lixo dos workers escreva nessas páginas. Assim, a vazão cresce
+    com o número de workers sem que a memória cresça na mesma proporção.
+
+    Todos os workers aceitam conexões no mesmo socket, aberto pelo pai. Um
+    worker que termina inesperadamente é recriado. SIGHUP recarrega o modelo
+    no pai e substitui os workers um a um; SIGTERM e SIGINT encerram tudo.
+    Os workers enviam SIGHUP ao pai no `/reload-model` e ao fim de um
+    `/train-model`, para que a troca do modelo alcance todos eles.
+    `/add-news` e `/events` alterariam só o worker que os atendesse, então
+    ficam desativados neste modo.
+    """
+
+    def __init__(
+        self,
+        app: FastAPI,
+        host: str = "0.0.0.0",
+        port: int = Config.PORT,
+        workers: int = Config.WORKERS,
+        backlog: int = 2048,
+    ):
+        if not hasattr(os, "fork"):
+            raise RuntimeError("O modo multi-worker requer os.fork (Linux ou macOS).")
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = max(1, workers)
+        self.backlog = backlog
+        self.socket = None
+        self.children: Dict[int, int] = {}
+        self.generation = 0
+        self.stopping = False
+        self.reload_requested = False
+
+    def run(self) -> None:
+        """Carrega o modelo, cria os workers e os supervisiona até o encerramento."""
+        self.socket = self._bind()
+        self._load()
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        signal.signal(signal.SIGHUP, self._handle_reload)
+
+        logger.info(
+            f"Servindo em http://{self.host}:{self.port} com {self.workers} workers "
+            f"(pid {os.getpid()})."
+        )
+        for _ in range(self.workers):
+            self._spawn()
+        while self.children or not self.stopping:
+            self._reap()
+            if self.reload_requested and not self.stopping:
+                self._reload()
+            time.sleep(0.2)
+        self.socket.close()
+        logger.info("Servidor encerrado.")
+
+    def _bind(self) -> socket.socket:
+        """Abre o socket compartilhado pelos workers."""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(self.backlog)
+        sock.set_inheritable(True)
+        return sock
+
+    def _load(self) -> None:
+        """Carrega o modelo no pai e congela o heap antes dos forks."""
+        self.app.state.recommender = load_recommender()
+        self.app.state.preloaded = True
+        gc.collect()
+        gc.freeze()
+
+    def _spawn(self) -> None:
+        """Cria um worker da geração atual."""
+        parent = os.getpid()
+        pid = os.fork()
+        if pid == 0:
+            self.app.state.prefork_parent = parent
+            self._run_worker()
+        self.children[pid] = self.generation
+
+    def _run_worker(self) -> None:
+        """Executa o uvicorn no worker. Nunca retorna."""
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+            signal.signal(signum, signal.SIG_DFL)
+        exit_code = 0
+        try:
+            logger.info(f"Worker {os.getpid()} iniciado.")
+            server = uvicorn.Server(
+                uvicorn.Config(self.app, log_config=None, access_log=False)
+            )
+            server.run(sockets=[self.socket])
+        except Exception as e:
+            logger.error(f"Erro no worker {os.getpid()}: {e}")
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+
+    def _reap(self) -> None:
+        """Recolhe os workers encerrados e recria os da geração atual."""
+        while self.children:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                return
+            generation = self.children.pop(pid, None)
+            if generation == self.generation and not self.stopping:
+                logger.warning(
+                    f"Worker {pid} encerrado (status {status}). Recriando..."
+                )
+                self._spawn()
+
+    def _reload(self) -> None:
+        """Recarrega o modelo e substitui os workers antigos um a um."""
+        self.reload_requested = False
+        logger.info("Recarregando o modelo e substituindo os workers...")
+        gc.unfreeze()
+        self._load()
+        self.generation += 1
+        for pid in [pid for pid, gen in self.children.items() if gen < self.generation]:
+            self._spawn()
+            os.kill(pid, signal.SIGTERM)
+
+    def _handle_stop(self, signum, frame) -> None:
+        """Encerra os workers e, em seguida, o pai."""
+        if self.stopping:
+            return
+        logger.info("Encerrando os workers...")
+        self.stopping = True
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def _handle_reload(self, signum, frame) -> None:
+        """Agenda a recarga do modelo no laço de supervisão."""
+        self.reload_requested = True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Serve a API com vários workers compartilhando o modelo."
+    )
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=Config.PORT)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=Config.WORKERS,
+        help="Quantidade de processos (padrão: WORKERS ou o número de CPUs).",
+    )
+    args = parser.parse_args()
+    PreforkServer(app, args.host, args.port, args.workers).run()
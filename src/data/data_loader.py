@@ -1,14 +1,102 @@
 # src/data/data_loader.py
+import argparse
 import os
-import pandas as pd
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from glob import glob
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
 from src.utils.logger import logger
 
+# Tipos declarados das colunas dos arquivos brutos, usados na leitura paralela.
+# IDs repetidos viram colunas categóricas (dicionário) e contagens, int32.
+CATEGORICAL = pa.dictionary(pa.int32(), pa.string())
+TIMESTAMP = pa.timestamp("ms", tz="UTC")
+
+INTERACOES_SCHEMA = {
+    "userId": CATEGORICAL,
+    "userType": CATEGORICAL,
+    "historySize": pa.int32(),
+    "history": pa.string(),
+    "timestampHistory": pa.string(),
+    "numberOfClicksHistory": pa.string(),
+    "timeOnPageHistory": pa.string(),
+    "scrollPercentageHistory": pa.string(),
+    "pageVisitsCountHistory": pa.string(),
+    "timestampHistory_new": pa.string(),
+}
+
+NOTICIAS_SCHEMA = {
+    "page": CATEGORICAL,
+    "url": pa.string(),
+    "issued": TIMESTAMP,
+    "modified": TIMESTAMP,
+    "title": pa.string(),
+    "body": pa.string(),
+    "caption": pa.string(),
+}
+
+# Colunas que identificam uma linha repetida, as mesmas em todos os modos da CLI
+INTERACOES_KEYS = ["userId"]
+NOTICIAS_KEYS = ["page"]
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Retorna o pico de memória residente do processo, em MB."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss é reportado em KB no Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class BoundedHashSet:
+    """
+    Conjunto de hashes com capacidade máxima e descarte dos mais antigos.
+
+    Usado para remover duplicatas entre blocos sem manter todas as chaves em
+    memória: duplicatas mais distantes que `capacity` chaves não são detectadas.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._keys = set()
+        self._order = deque()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def filter_new(self, hashes: np.ndarray) -> np.ndarray:
+        """Retorna a máscara das linhas novas e registra as suas chaves."""
+        first_in_chunk = ~pd.Series(hashes).duplicated().to_numpy()
+        keys = self._keys
+        unseen = np.fromiter(
+            (key not in keys for key in hashes.tolist()), dtype=bool, count=len(hashes)
+        )
+        mask = first_in_chunk & unseen
+
+        new_keys = hashes[mask].tolist()
+        keys.update(new_keys)
+        self._order.extend(new_keys)
+        while len(self._order) > self.capacity:
+            keys.discard(self._order.popleft())
+        return mask
+
 
 class DataLoader:
 
     def load_data_files(
-        self, file_pattern: str, drop_duplicates: bool = True
+        self,
+        file_pattern: str,
+        drop_duplicates: bool = True,
+        key_columns: Optional[List[str]] = None,
     ) -> pd.DataFrame:
         """
         Carrega e concatena múltiplos arquivos CSV ou Parquet.
@@ -16,6 +104,8 @@ class DataLoader:
         Args:
             file_pattern (str): Padrão de nome dos arquivos.
             drop_duplicates (bool): Se True, remove duplicatas.
+            key_columns (List[str], opcional): Colunas que identificam duplicatas.
+                Por padrão, todas as colunas.
 
         Returns:
             pd.DataFrame: DataFrame concatenado.
@@ -47,7 +137,217 @@ class DataLoader:
             raise ValueError("Nenhum DataFrame válido foi carregado.")
 
         df_final = pd.concat(dataframes, ignore_index=True)
-        return df_final.drop_duplicates() if drop_duplicates else df_final
+        if not drop_duplicates:
+            return df_final
+        return df_final.drop_duplicates(subset=key_columns, ignore_index=True)
+
+    @staticmethod
+    def _iter_chunks(
+        file_path: str, chunksize: int, dtype: Optional[Dict] = None
+    ) -> Iterator[pd.DataFrame]:
+        """Lê um arquivo CSV ou Parquet em blocos de até `chunksize` linhas."""
+        if file_path.endswith(".csv"):
+            yield from pd.read_csv(file_path, chunksize=chunksize, dtype=dtype)
+        elif file_path.endswith(".parquet"):
+            for batch in pq.ParquetFile(file_path).iter_batches(batch_size=chunksize):
+                yield batch.to_pandas()
+        else:
+            raise ValueError(f"Formato não suportado: {file_path}")
+
+    def stream_to_parquet(
+        self,
+        file_pattern: str,
+        output_path: str,
+        key_columns: Optional[List[str]] = None,
+        chunksize: int = 100_000,
+        max_keys: int = 10_000_000,
+        dtype: Optional[Dict] = None,
+        compression: str = "snappy",
+    ) -> List[Dict]:
+        """
+        Converte múltiplos arquivos para um único Parquet sem carregá-los inteiros.
+
+        Cada arquivo é lido em blocos, as duplicatas são removidas com um
+        conjunto limitado de hashes das colunas-chave e cada bloco é gravado
+        como um row group no arquivo de saída.
+
+        Args:
+            file_pattern (str): Padrão de nome dos arquivos.
+            output_path (str): Caminho do arquivo Parquet de saída.
+            key_columns (List[str], opcional): Colunas que identificam duplicatas.
+                Por padrão, todas as colunas.
+            chunksize (int): Quantidade de linhas por bloco.
+            max_keys (int): Quantidade máxima de chaves lembradas para deduplicação.
+            dtype (Dict, opcional): Tipos das colunas na leitura de CSV.
+            compression (str): Tipo de compressão a ser usada (ex: 'snappy', 'gzip').
+
+        Returns:
+            List[Dict]: Estatísticas de cada arquivo (linhas, linhas/s e pico de RSS).
+        """
+        file_paths = sorted(glob(file_pattern))
+        if not file_paths:
+            raise FileNotFoundError(f"Nenhum arquivo encontrado para: {file_pattern}")
+
+        output_dir = os.path.dirname(output_path)
+        if output_dir and not os.path.exists(output_dir):
+            logger.info(f"Criando diretório: {output_dir}")
+            os.makedirs(output_dir)
+
+        seen = BoundedHashSet(max_keys)
+        writer = None
+        stats = []
+        try:
+            for file_path in file_paths:
+                logger.info(f"Processando arquivo em blocos: {file_path}")
+                start = time.perf_counter()
+                rows_read = rows_written = 0
+                for chunk in self._iter_chunks(file_path, chunksize, dtype):
+                    rows_read += len(chunk)
+                    keys = chunk[key_columns] if key_columns else chunk
+                    hashes = pd.util.hash_pandas_object(keys, index=False).to_numpy()
+                    chunk = chunk[seen.filter_new(hashes)]
+                    if chunk.empty:
+                        continue
+
+                    table = pa.Table.from_pandas(chunk, preserve_index=False)
+                    if writer is None:
+                        writer = pq.ParquetWriter(
+                            output_path, table.schema, compression=compression
+                        )
+                    else:
+                        table = table.cast(writer.schema, safe=False)
+                    writer.write_table(table)
+                    rows_written += len(chunk)
+
+                elapsed = time.perf_counter() - start
+                file_stats = {
+                    "file": file_path,
+                    "rows_read": rows_read,
+                    "rows_written": rows_written,
+                    "rows_per_second": rows_read / elapsed if elapsed > 0 else 0.0,
+                    "peak_rss_mb": _peak_rss_mb(),
+                }
+                stats.append(file_stats)
+                logger.info(
+                    f"{file_path}: {rows_read} linhas lidas, {rows_written} gravadas, "
+                    f"{file_stats['rows_per_second']:.0f} linhas/s, "
+                    f"pico de RSS {file_stats['peak_rss_mb']} MB"
+                )
+        finally:
+            if writer is not None:
+                writer.close()
+
+        if writer is None:
+            raise ValueError("Nenhum DataFrame válido foi carregado.")
+        return stats
+
+    @staticmethod
+    def _read_table(file_path: str, schema: Optional[Dict]) -> pa.Table:
+        """Lê um arquivo CSV ou Parquet com o leitor multithread do pyarrow."""
+        logger.info(f"Carregando arquivo: {file_path}")
+        if file_path.endswith(".csv"):
+            return pa_csv.read_csv(
+                file_path,
+                read_options=pa_csv.ReadOptions(use_threads=True),
+                convert_options=pa_csv.ConvertOptions(column_types=schema or {}),
+            )
+        if file_path.endswith(".parquet"):
+            return pq.read_table(file_path, use_threads=True)
+        raise ValueError(f"Formato não suportado: {file_path}")
+
+    @staticmethod
+    def _drop_duplicate_rows(
+        table: pa.Table, key_columns: Optional[List[str]] = None
+    ) -> pa.Table:
+        """
+        Mantém a primeira ocorrência de cada chave, preservando a ordem.
+
+        Só as colunas-chave são agrupadas. Sem duplicatas, a tabela é
+        devolvida como está; com elas, um filtro copia apenas as linhas
+        mantidas, bloco a bloco, sem reunir a tabela em um único bloco.
+        """
+        key_columns = key_columns or table.column_names
+        rows = table.select(key_columns).append_column(
+            "__row", pa.array(np.arange(len(table), dtype=np.int64))
+        )
+        first = rows.group_by(key_columns, use_threads=False).aggregate(
+            [("__row", "min")]
+        )
+        if first.num_rows == table.num_rows:
+            return table
+        keep = np.zeros(table.num_rows, dtype=bool)
+        keep[first["__row_min"].to_numpy()] = True
+        return table.filter(pa.array(keep))
+
+    def load_tables_parallel(
+        self,
+        file_pattern: str,
+        schema: Optional[Dict] = None,
+        max_workers: Optional[int] = None,
+        drop_duplicates: bool = True,
+        key_columns: Optional[List[str]] = None,
+    ) -> pa.Table:
+        """
+        Carrega múltiplos arquivos em paralelo como uma única tabela Arrow.
+
+        Os arquivos são lidos em uma pool de threads com o leitor CSV do
+        pyarrow (que libera o GIL e também paraleliza cada arquivo) usando os
+        tipos declarados. As tabelas são unidas sem cópia dos dados.
+
+        Args:
+            file_pattern (str): Padrão de nome dos arquivos.
+            schema (Dict, opcional): Tipos Arrow por coluna (ex: INTERACOES_SCHEMA).
+            max_workers (int, opcional): Quantidade de arquivos lidos ao mesmo tempo.
+            drop_duplicates (bool): Se True, remove duplicatas.
+            key_columns (List[str], opcional): Colunas que identificam duplicatas.
+                Por padrão, todas as colunas.
+
+        Returns:
+            pa.Table: Tabela concatenada.
+        """
+        file_paths = sorted(glob(file_pattern))
+        if not file_paths:
+            raise FileNotFoundError(f"Nenhum arquivo encontrado para: {file_pattern}")
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            tables = list(
+                executor.map(lambda path: self._read_table(path, schema), file_paths)
+            )
+        tables = [table for table in tables if table.num_rows > 0]
+        if not tables:
+            raise ValueError("Nenhum DataFrame válido foi carregado.")
+
+        table = pa.concat_tables(tables, promote_options="permissive")
+        table = table.unify_dictionaries()
+        if drop_duplicates:
+            table = self._drop_duplicate_rows(table, key_columns)
+
+        elapsed = time.perf_counter() - start
+        logger.info(
+            f"{len(file_paths)} arquivos carregados: {table.num_rows} linhas em "
+            f"{elapsed:.1f}s ({table.num_rows / max(elapsed, 1e-9):.0f} linhas/s)"
+        )
+        return table
+
+    def save_table(
+        self, table: pa.Table, output_path: str, compression: str = "snappy"
+    ) -> None:
+        """
+        Salva uma tabela Arrow no formato Parquet, sem convertê-la para pandas.
+
+        Args:
+            table (pa.Table): Tabela a ser salva.
+            output_path (str): Caminho completo do arquivo Parquet de saída.
+            compression (str): Tipo de compressão a ser usada (ex: 'snappy', 'gzip').
+        """
+        output_dir = os.path.dirname(output_path)
+        if output_dir and not os.path.exists(output_dir):
+            logger.info(f"Criando diretório: {output_dir}")
+            os.makedirs(output_dir)
+
+        pq.write_table(table, output_path, compression=compression)
+        logger.info(f"Tabela salva em: {output_path} (compressão: {compression})")
 
     def save_data(
         self, df: pd.DataFrame, output_path: str, compression: str = "snappy"
@@ -76,31 +376,86 @@ class DataLoader:
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Converte os arquivos CSV brutos em Parquet na zona raw."
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Processa os arquivos em blocos, com memória limitada.",
+    )
+    parser.add_argument(
+        "--parallel",
+        action="store_true",
+        help="Lê os arquivos em paralelo com os tipos declarados das colunas.",
+    )
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
     try:
         # Instancia o DataLoader
         data_loader = DataLoader()
 
-        # Carrega e concatena os arquivos CSV de interações
-        logger.info("Carregando e concatenando arquivos de interações...")
-        interacoes = data_loader.load_data_files(
-            "data/transient/files/treino/treino_parte*.csv"
-        )
+        if args.streaming:
+            logger.info("Convertendo arquivos de interações em blocos...")
+            data_loader.stream_to_parquet(
+                "data/transient/files/treino/treino_parte*.csv",
+                "data/raw/interacoes.parquet",
+                key_columns=INTERACOES_KEYS,
+                chunksize=args.chunksize,
+            )
+            logger.info("Convertendo arquivos de notícias em blocos...")
+            data_loader.stream_to_parquet(
+                "data/transient/itens/itens/itens-parte*.csv",
+                "data/raw/noticias.parquet",
+                key_columns=NOTICIAS_KEYS,
+                chunksize=args.chunksize,
+            )
+            logger.info("Processo concluído com sucesso!")
+        elif args.parallel:
+            logger.info("Carregando arquivos de interações em paralelo...")
+            interacoes = data_loader.load_tables_parallel(
+                "data/transient/files/treino/treino_parte*.csv",
+                schema=INTERACOES_SCHEMA,
+                max_workers=args.workers,
+                key_columns=INTERACOES_KEYS,
+            )
+            data_loader.save_table(interacoes, "data/raw/interacoes.parquet")
 
-        # Carrega e concatena os arquivos CSV de notícias
-        logger.info("Carregando e concatenando arquivos de notícias...")
-        noticias = data_loader.load_data_files(
-            "data/transient/itens/itens/itens-parte*.csv"
-        )
+            logger.info("Carregando arquivos de notícias em paralelo...")
+            noticias = data_loader.load_tables_parallel(
+                "data/transient/itens/itens/itens-parte*.csv",
+                schema=NOTICIAS_SCHEMA,
+                max_workers=args.workers,
+                key_columns=NOTICIAS_KEYS,
+            )
+            data_loader.save_table(noticias, "data/raw/noticias.parquet")
+            logger.info("Processo concluído com sucesso!")
+        else:
+            # Carrega e concatena os arquivos CSV de interações
+            logger.info("Carregando e concatenando arquivos de interações...")
+            interacoes = data_loader.load_data_files(
+                "data/transient/files/treino/treino_parte*.csv",
+                key_columns=INTERACOES_KEYS,
+            )
 
-        # Salva os DataFrames concatenados em Parquet na zona raw
-        logger.info("Salvando DataFrames em Parquet...")
-        data_loader.save_data(
-            interacoes, "data/raw/interacoes.parquet", compression="snappy"
-        )
-        data_loader.save_data(
-            noticias, "data/raw/noticias.parquet", compression="snappy"
-        )
+            # Carrega e concatena os arquivos CSV de notícias
+            logger.info("Carregando e concatenando arquivos de notícias...")
+            noticias = data_loader.load_data_files(
+                "data/transient/itens/itens/itens-parte*.csv",
+                key_columns=NOTICIAS_KEYS,
+            )
+
+            # Salva os DataFrames concatenados em Parquet na zona raw
+            logger.info("Salvando DataFrames em Parquet...")
+            data_loader.save_data(
+                interacoes, "data/raw/interacoes.parquet", compression="snappy"
+            )
+            data_loader.save_data(
+                noticias, "data/raw/noticias.parquet", compression="snappy"
+            )
 
-        logger.info("Processo concluído com sucesso!")
+            logger.info("Processo concluído com sucesso!")
     except Exception as e:
         logger.error(f"Erro durante a execução: {e}")
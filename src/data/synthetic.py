@@ -0,0 +1,196 @@
+# src/data/synthetic.py
+import argparse
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from src.utils.logger import logger
+
+# Data de referência dos dados sintéticos (fim do período de interações)
+REFERENCE_TIME = pd.Timestamp("2022-08-15", tz="UTC")
+
+
+class SyntheticDataset:
+    """
+    Gerador de notícias e interações sintéticas no formato dos arquivos brutos.
+
+    Cada notícia pertence a um tópico e o seu texto é sorteado do vocabulário
+    do tópico; cada usuário prefere um tópico e a maior parte dos seus cliques
+    cai em notícias desse tópico, escolhidas com popularidade do tipo Zipf.
+    Assim os modelos de conteúdo e de popularidade têm sinal a aprender.
+    Tudo é vetorizado em NumPy e gerado em blocos, para escalar a milhões de
+    usuários e notícias.
+    """
+
+    def __init__(
+        self,
+        n_items: int = 10_000,
+        n_users: int = 100_000,
+        n_topics: int = 50,
+        words_per_topic: int = 200,
+        mean_history: float = 10.0,
+        topic_affinity: float = 0.8,
+        days: int = 30,
+        seed: int = 42,
+    ):
+        self.n_items = n_items
+        self.n_users = n_users
+        self.n_topics = n_topics
+        self.words_per_topic = words_per_topic
+        self.mean_history = mean_history
+        self.topic_affinity = topic_affinity
+        self.days = days
+        self.seed = seed
+
+        rng = np.random.default_rng(seed)
+        self.item_topics = rng.integers(0, n_topics, n_items)
+        # Popularidade Zipf em ordem aleatória dentro do catálogo
+        weights = 1 / np.arange(1, n_items + 1) ** 1.1
+        self.item_weights = weights[rng.permutation(n_items)]
+        self.topic_items = [
+            np.flatnonzero(self.item_topics == topic) for topic in range(n_topics)
+        ]
+        self.topic_cdfs = [
+            np.cumsum(self.item_weights[items]) / self.item_weights[items].sum()
+            for items in self.topic_items
+        ]
+        self.global_cdf = np.cumsum(self.item_weights) / self.item_weights.sum()
+        self.pages = self.page_ids(np.arange(n_items)).astype(object)
+
+    @staticmethod
+    def page_ids(positions: np.ndarray) -> np.ndarray:
+        """Converte posições do catálogo em IDs de página."""
+        return np.char.add("page-", positions.astype(str))
+
+    def _texts(self, rng, topics: np.ndarray, n_words: int) -> np.ndarray:
+        """Sorteia textos com palavras do vocabulário de cada tópico."""
+        words = rng.integers(0, self.words_per_topic, (topics.shape[0], n_words))
+        tokens = np.char.add(
+            np.char.add("t", topics.astype(str)[:, None]),
+            np.char.add("w", words.astype(str)),
+        )
+        return np.array([" ".join(row) for row in tokens], dtype=object)
+
+    def news(self, chunk_size: int = 100_000) -> Iterator[pd.DataFrame]:
+        """Gera as notícias em blocos, com as colunas de `noticias.parquet`."""
+        rng = np.random.default_rng(self.seed + 1)
+        start_ms = (REFERENCE_TIME - pd.Timedelta(days=self.days)).value // 10**6
+        for begin in range(0, self.n_items, chunk_size):
+            positions = np.arange(begin, min(begin + chunk_size, self.n_items))
+            topics = self.item_topics[positions]
+            pages = self.pages[positions]
+            period_ms = self.days * 86_400_000
+            issued = start_ms + rng.integers(0, period_ms, len(positions))
+            yield pd.DataFrame(
+                {
+                    "page": pages,
+                    "url": "https://g1.globo.com/" + pages,
+                    "issued": pd.to_datetime(issued, unit="ms", utc=True),
+                    "modified": pd.to_datetime(issued, unit="ms", utc=True),
+                    "title": self._texts(rng, topics, 8),
+                    "body": self._texts(rng, topics, 40),
+                    "caption": self._texts(rng, topics, 12),
+                }
+            )
+
+    def _sample_items(self, rng, topics: np.ndarray) -> np.ndarray:
+        """Sorteia a notícia de cada clique, do tópico preferido ou do catálogo."""
+        items = np.searchsorted(self.global_cdf, rng.random(topics.shape[0]))
+        in_topic = rng.random(topics.shape[0]) < self.topic_affinity
+        for topic in np.unique(topics[in_topic]):
+            clicks = np.flatnonzero(in_topic & (topics == topic))
+            if self.topic_items[topic].shape[0] == 0:
+                continue
+            choice = np.searchsorted(self.topic_cdfs[topic], rng.random(len(clicks)))
+            items[clicks] = self.topic_items[topic][
+                np.minimum(choice, self.topic_items[topic].shape[0] - 1)
+            ]
+        return np.minimum(items, self.n_items - 1)
+
+    def interactions(self, chunk_size: int = 100_000) -> Iterator[pd.DataFrame]:
+        """Gera as interações em blocos, com as colunas de `interacoes.parquet`."""
+        rng = np.random.default_rng(self.seed + 2)
+        end_ms = REFERENCE_TIME.value // 10**6
+        for begin in range(0, self.n_users, chunk_size):
+            n_users = min(chunk_size, self.n_users - begin)
+            sizes = rng.geometric(1 / self.mean_history, n_users).astype(np.int32)
+            users = np.repeat(np.arange(n_users), sizes)
+            topics = rng.integers(0, self.n_topics, n_users)[users]
+            items = self._sample_items(rng, topics)
+
+            # Timestamps crescentes dentro do histórico de cada usuário
+            ages = rng.integers(0, self.days * 86_400_000, users.shape[0])
+            order = np.lexsort((-ages, users))
+            timestamps = (end_ms - ages[order]).astype(str)
+            pages = self.pages[items[order]]
+
+            bounds = np.cumsum(sizes)[:-1]
+            user_ids = np.char.add(
+                "user-", np.arange(begin, begin + n_users).astype(str)
+            )
+            yield pd.DataFrame(
+                {
+                    "userId": user_ids,
+                    "userType": np.where(
+                        rng.random(n_users) < 0.4, "Logged", "Non-Logged"
+                    ),
+                    "historySize": sizes,
+                    "history": [",".join(p) for p in np.split(pages, bounds)],
+                    "timestampHistory": [
+                        ",".join(t) for t in np.split(timestamps, bounds)
+                    ],
+                }
+            )
+
+    def write(self, data_dir: Path, chunk_size: int = 100_000) -> None:
+        """
+        Grava `raw/noticias.parquet` e `raw/interacoes.parquet` em `data_dir`.
+
+        Args:
+            data_dir (Path): Diretório de dados (o mesmo layout de `Config.DATA_DIR`).
+            chunk_size (int): Linhas geradas e gravadas por bloco.
+        """
+        raw_dir = Path(data_dir) / "raw"
+        raw_dir.mkdir(parents=True, exist_ok=True)
+        for name, chunks in [
+            ("noticias", self.news(chunk_size)),
+            ("interacoes", self.interactions(chunk_size)),
+        ]:
+            writer: Optional[pq.ParquetWriter] = None
+            try:
+                for chunk in chunks:
+                    table = pa.Table.from_pandas(chunk, preserve_index=False)
+                    if writer is None:
+                        writer = pq.ParquetWriter(
+                            raw_dir / f"{name}.parquet", table.schema
+                        )
+                    writer.write_table(table)
+            finally:
+                if writer is not None:
+                    writer.close()
+            logger.info(f"Arquivo {raw_dir / name}.parquet gerado.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Gera dados sintéticos no formato dos arquivos do datathon."
+    )
+    parser.add_argument("data_dir", type=Path)
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--topics", type=int, default=50)
+    parser.add_argument("--mean-history", type=float, default=10.0)
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    SyntheticDataset(
+        n_items=args.items,
+        n_users=args.users,
+        n_topics=args.topics,
+        mean_history=args.mean_history,
+        seed=args.seed,
+    ).write(args.data_dir, args.chunksize)
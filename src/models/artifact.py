@@ -0,0 +1,180 @@
+import argparse
+import hashlib
+import json
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from src.utils.logger import logger
+
+SCHEMA_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+# Arquivos maiores que isto têm só o tamanho conferido na leitura: calcular o
+# checksum leria o arquivo inteiro e anularia o mapeamento em memória
+VERIFY_MAX_BYTES = 64 * 1024**2
+
+
+def _sha256(path: Path, chunk_size: int = 1024**2) -> str:
+    """Calcula o SHA-256 de um arquivo lendo-o em blocos."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_artifact(
+    directory: Path,
+    arrays: Dict[str, np.ndarray],
+    tables: Dict[str, pd.DataFrame],
+    metadata: Dict[str, Any],
+) -> None:
+    """
+    Grava um artefato de modelo em diretório.
+
+    Arrays são gravados como arquivos .npy (mapeáveis em memória), tabelas
+    como Parquet e o manifesto guarda a versão do esquema, os metadados e o
+    checksum de cada arquivo. Os arquivos são gravados em um diretório
+    temporário exclusivo, ao lado do final, que só o substitui por rename
+    depois que todos foram gravados.
+
+    Args:
+        directory (Path): Diretório do artefato.
+        arrays (Dict[str, np.ndarray]): Arrays NumPy por nome.
+        tables (Dict[str, pd.DataFrame]): Tabelas por nome.
+        metadata (Dict[str, Any]): Metadados serializáveis em JSON.
+    """
+    directory = Path(directory)
+    directory.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=f".{directory.name}.", dir=directory.parent))
+    try:
+        files = _write_files(staging, arrays, tables, metadata)
+        _replace_directory(staging, directory)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    logger.info(f"Artefato gravado em {directory} ({len(files)} arquivos).")
+
+
+def _write_files(
+    staging: Path,
+    arrays: Dict[str, np.ndarray],
+    tables: Dict[str, pd.DataFrame],
+    metadata: Dict[str, Any],
+) -> Dict[str, str]:
+    """Grava arrays, tabelas e o manifesto em `staging`."""
+    files = {}
+    for name, array in arrays.items():
+        np.save(staging / f"{name}.npy", np.ascontiguousarray(array))
+        files[f"{name}.npy"] = "array"
+    for name, table in tables.items():
+        table.to_parquet(staging / f"{name}.parquet", index=False)
+        files[f"{name}.parquet"] = "table"
+
+    manifest = {
+        "schema_version": SCHEMA_VERSION,
+        "created_at": datetime.now().isoformat(),
+        "metadata": metadata,
+        "files": {
+            file_name: {
+                "kind": kind,
+                "sha256": _sha256(staging / file_name),
+                "bytes": (staging / file_name).stat().st_size,
+            }
+            for file_name, kind in files.items()
+        },
+    }
+    with open(staging / MANIFEST_FILE, "w") as f:
+        json.dump(manifest, f, indent=2)
+    return files
+
+
+def _replace_directory(staging: Path, directory: Path) -> None:
+    """Move `staging` para `directory`, substituindo o artefato anterior."""
+    if not directory.exists():
+        staging.rename(directory)
+        return
+    # O anterior sai para um nome exclusivo, para que gravações simultâneas
+    # não disputem o mesmo diretório; quem já o mapeou continua lendo
+    previous = Path(
+        tempfile.mkdtemp(prefix=f".{directory.name}.old.", dir=directory.parent)
+    )
+    directory.replace(previous)
+    staging.rename(directory)
+    shutil.rmtree(previous, ignore_errors=True)
+
+
+def read_artifact(
+    directory: Path,
+    mmap_mode: Optional[str] = "r",
+    verify: bool = True,
+    verify_max_bytes: Optional[int] = VERIFY_MAX_BYTES,
+) -> Tuple[Dict[str, np.ndarray], Dict[str, pd.DataFrame], Dict[str, Any]]:
+    """
+    Lê um artefato de modelo gravado por `write_artifact`.
+
+    Args:
+        directory (Path): Diretório do artefato.
+        mmap_mode (str, opcional): Modo de mapeamento dos arrays (None lê em memória).
+        verify (bool): Se True, confere os arquivos antes de carregar.
+        verify_max_bytes (int, opcional): Acima deste tamanho, confere só o
+            tamanho do arquivo, e não o checksum (None confere todos).
+
+    Returns:
+        Tuple: Arrays, tabelas e metadados do artefato.
+    """
+    directory = Path(directory)
+    with open(directory / MANIFEST_FILE) as f:
+        manifest = json.load(f)
+
+    version = manifest.get("schema_version")
+    if version != SCHEMA_VERSION:
+        raise ValueError(
+            f"Versão de esquema {version} não suportada (esperada: {SCHEMA_VERSION})."
+        )
+
+    arrays, tables = {}, {}
+    for file_name, entry in manifest["files"].items():
+        path = directory / file_name
+        if verify:
+            _verify_file(path, entry, verify_max_bytes)
+        name = Path(file_name).stem
+        if entry["kind"] == "array":
+            arrays[name] = np.load(path, mmap_mode=mmap_mode)
+        else:
+            tables[name] = pd.read_parquet(path)
+    return arrays, tables, manifest["metadata"]
+
+
+def _verify_file(path: Path, entry: Dict[str, Any], max_bytes: Optional[int]) -> None:
+    """Confere o tamanho e, se couber no limite, o checksum de um arquivo."""
+    size = path.stat().st_size
+    if size != entry["bytes"]:
+        raise ValueError(
+            f"Tamanho inválido para {path}: {size} bytes (esperado: {entry['bytes']})."
+        )
+    if (max_bytes is None or size <= max_bytes) and _sha256(path) != entry["sha256"]:
+        raise ValueError(f"Checksum inválido para {path}.")
+
+
+def convert_pickle(pickle_path: Path, directory: Path) -> None:
+    """Converte um modelo salvo no formato pickle antigo para o formato em diretório."""
+    from src.models.recommender import NewsRecommendationSystem
+
+    logger.info(f"Convertendo {pickle_path} para {directory}...")
+    recommender = NewsRecommendationSystem.load_model(str(pickle_path))
+    recommender.save_model(directory)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Converte um modelo .pkl para o formato em diretório."
+    )
+    parser.add_argument("pickle_path", type=Path)
+    parser.add_argument("directory", type=Path)
+    args = parser.parse_args()
+    convert_pickle(args.pickle_path, args.directory)
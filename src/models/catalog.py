@@ -0,0 +1,231 @@
+import math
+import os
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from src.models.incremental import AppendableArray
+from src.models.popularity import _explode
+from src.utils.serialization import dumps
+
+# Colunas de texto servidas pela API, guardadas como strings Arrow contíguas
+STRING_COLUMNS = ["page", "title", "url"]
+
+
+def compact_news(news_df: pd.DataFrame, columns: Sequence[str]) -> pd.DataFrame:
+    """
+    Reduz o DataFrame de notícias às colunas servidas, em tipos compactos.
+
+    Textos viram strings Arrow (sem um objeto Python por valor), datas viram
+    datetime64 e scores, float32. O índice passa a ser a posição da notícia.
+
+    Args:
+        news_df (pd.DataFrame): Notícias, possivelmente com o texto completo.
+        columns (Sequence[str]): Colunas mantidas.
+
+    Returns:
+        pd.DataFrame: Catálogo compacto, na mesma ordem de `news_df`.
+    """
+    catalog = news_df[[c for c in columns if c in news_df.columns]].reset_index(
+        drop=True
+    )
+    for column in STRING_COLUMNS:
+        if column in catalog.columns:
+            catalog[column] = catalog[column].astype("string[pyarrow]")
+    if "date" in catalog.columns:
+        catalog["date"] = pd.to_datetime(catalog["date"])
+    if "popularity_score" in catalog.columns:
+        catalog["popularity_score"] = catalog["popularity_score"].astype(np.float32)
+    return catalog
+
+
+class UserHistories:
+    """
+    Históricos dos usuários como posições de notícias no formato CSR.
+
+    As leituras do usuário na linha `i` são `positions[indptr[i]:indptr[i + 1]]`
+    (int32, na ordem do histórico), o que substitui as strings separadas por
+    vírgula e as listas Python por usuário. Páginas fora do catálogo são
+    descartadas.
+    """
+
+    def __init__(self, user_ids: pd.Index, indptr: np.ndarray, positions: np.ndarray):
+        self.user_ids = user_ids
+        self.indptr = indptr
+        self.positions = positions
+
+    def __len__(self) -> int:
+        return self.indptr.shape[0] - 1
+
+    @property
+    def nbytes(self) -> int:
+        return self.indptr.nbytes + self.positions.nbytes + self.user_ids.nbytes
+
+    @classmethod
+    def from_strings(
+        cls, user_ids: Sequence[str], history: pd.Series, page_index: Mapping[str, int]
+    ) -> "UserHistories":
+        """
+        Converte os históricos separados por vírgula em arrays CSR.
+
+        Args:
+            user_ids (Sequence[str]): ID de cada usuário, na ordem de `history`.
+            history (pd.Series): Históricos de páginas separadas por vírgula.
+            page_index (Mapping[str, int]): Posição de cada página no catálogo.
+
+        Returns:
+            UserHistories: Históricos com as posições das páginas conhecidas.
+        """
+        history = history.fillna("").reset_index(drop=True)
+        lengths = (history.str.count(",") + 1).to_numpy()
+        users = np.repeat(np.arange(len(history)), lengths)
+        positions = _explode(history).map(page_index).to_numpy(dtype=np.float64)
+        known = ~np.isnan(positions)
+
+        counts = np.bincount(users[known], minlength=len(history))
+        indptr = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        return cls(
+            pd.Index(np.asarray(user_ids, dtype=object)),
+            indptr,
+            positions[known].astype(np.int32),
+        )
+
+    def row(self, user_id: str) -> Optional[int]:
+        """Retorna a linha do usuário, ou None se ele não existir."""
+        row = self.user_ids.get_indexer([user_id])[0]
+        return None if row < 0 else int(row)
+
+    def rows(self, user_ids: List[str]) -> np.ndarray:
+        """Retorna as linhas dos usuários, com -1 para os desconhecidos."""
+        return self.user_ids.get_indexer(user_ids)
+
+    def history(self, row: int) -> np.ndarray:
+        """Retorna as posições lidas pelo usuário, na ordem do histórico."""
+        return self.positions[self.indptr[row] : self.indptr[row + 1]]
+
+    def get_arrays(self) -> Dict[str, np.ndarray]:
+        """Retorna os arrays que devem ser salvos junto com o modelo."""
+        return {"indptr": self.indptr, "positions": self.positions}
+
+    @classmethod
+    def from_arrays(
+        cls, user_ids: Sequence[str], arrays: Dict[str, np.ndarray]
+    ) -> "UserHistories":
+        """Recria os históricos a partir dos arrays salvos."""
+        return cls(
+            pd.Index(np.asarray(user_ids, dtype=object)),
+            arrays["indptr"],
+            arrays["positions"],
+        )
+
+
+class ItemFragments:
+    """
+    Fragmentos JSON pré-renderizados das notícias servidas.
+
+    O objeto `{"page": ..., "title": ..., "url": ...}` de cada notícia é
+    serializado uma única vez, sem a chave de fechamento, em um único buffer
+    de bytes com `offsets` (int64) marcando o início de cada notícia. As
+    respostas são montadas concatenando fragmentos e, opcionalmente, o score,
+    sem criar dicionários por notícia nem serializá-las de novo. Buffer e
+    offsets crescem com folga, então `append` custa O(notícias novas).
+    """
+
+    def __init__(self, buffer: bytes, offsets: np.ndarray):
+        self._buffer = AppendableArray(np.frombuffer(buffer, dtype=np.uint8))
+        self._offsets = AppendableArray(np.asarray(offsets, dtype=np.int64))
+        # Buffer e offsets trocados juntos, para leituras consistentes sem lock
+        self._data = (self._buffer.array, self._offsets.array)
+
+    @staticmethod
+    def _render_rows(news_df: pd.DataFrame) -> List[bytes]:
+        """Serializa as notícias, sem o '}' final."""
+        rows = news_df.reindex(columns=STRING_COLUMNS).astype(object)
+        rows = rows.where(rows.notna(), None)
+        return [
+            dumps({"page": page, "title": title, "url": url})[:-1]
+            for page, title, url in rows.itertuples(index=False, name=None)
+        ]
+
+    @classmethod
+    def from_frame(cls, news_df: pd.DataFrame) -> "ItemFragments":
+        """Renderiza os fragmentos de todas as notícias do catálogo."""
+        fragments = cls._render_rows(news_df)
+        offsets = np.zeros(len(fragments) + 1, dtype=np.int64)
+        np.cumsum([len(fragment) for fragment in fragments], out=offsets[1:])
+        return cls(b"".join(fragments), offsets)
+
+    def __len__(self) -> int:
+        return self._data[1].shape[0] - 1
+
+    @property
+    def nbytes(self) -> int:
+        buffer, offsets = self._data
+        return buffer.nbytes + offsets.nbytes
+
+    def append(self, news_df: pd.DataFrame) -> None:
+        """Renderiza as notícias adicionadas ao final do catálogo."""
+        fragments = self._render_rows(news_df)
+        lengths = np.cumsum([len(fragment) for fragment in fragments], dtype=np.int64)
+        # Os bytes novos são escritos depois da parte já visível aos leitores
+        end = self._offsets.array[-1]
+        buffer = self._buffer.append(
+            np.frombuffer(b"".join(fragments), dtype=np.uint8)
+        )
+        offsets = self._offsets.append(end + lengths)
+        self._data = (buffer, offsets)
+
+    def render(
+        self,
+        positions: np.ndarray,
+        scores: Optional[np.ndarray] = None,
+        score_key: str = "score",
+    ) -> bytes:
+        """
+        Monta a lista JSON das notícias em `positions`.
+
+        Args:
+            positions (np.ndarray): Posições das notícias, na ordem da resposta.
+            scores (np.ndarray, opcional): Score de cada notícia, incluído na
+                chave `score_key`. Scores NaN ou infinitos, que o JSON não
+                representa, viram `null` (como no orjson).
+            score_key (str): Nome da chave do score.
+
+        Returns:
+            bytes: Lista JSON de objetos.
+        """
+        buffer, offsets = self._data
+        view = memoryview(buffer)
+        positions = np.asarray(positions, dtype=np.int64)
+        starts = offsets[positions].tolist()
+        ends = offsets[positions + 1].tolist()
+        if scores is None:
+            items = [view[start:end] for start, end in zip(starts, ends)]
+            return b"[" + b"},".join(items) + b"}]" if items else b"[]"
+
+        key = b',"' + score_key.encode() + b'":'
+        parts = []
+        for start, end, score in zip(starts, ends, np.asarray(scores).tolist()):
+            value = repr(float(score)).encode() if math.isfinite(score) else b"null"
+            parts += (view[start:end], key, value, b"},")
+        if not parts:
+            return b"[]"
+        parts[-1] = b"}"
+        return b"[" + b"".join(parts) + b"]"
+
+
+def frame_mb(df: Optional[pd.DataFrame]) -> float:
+    """Retorna a memória ocupada por um DataFrame, em MB."""
+    if df is None:
+        return 0.0
+    return float(df.memory_usage(deep=True).sum()) / 1024**2
+
+
+def process_rss_mb() -> Optional[float]:
+    """Retorna a memória residente atual do processo, em MB."""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / 1024**2
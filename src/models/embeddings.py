@@ -0,0 +1,60 @@
+from typing import Any, Dict
+
+import numpy as np
+from sklearn.decomposition import TruncatedSVD
+from sklearn.preprocessing import normalize
+from src.utils.logger import logger
+
+
+class SVDEmbedding:
+    """
+    Projeção da matriz TF-IDF em um espaço denso de baixa dimensão.
+
+    Usa TruncatedSVD randomizado (LSA): termos que co-ocorrem ficam próximos,
+    o que aproxima sinônimos, e a similaridade passa a ser um produto denso
+    (GEMV/GEMM) sobre uma matriz pequena. Os vetores são float32, contíguos
+    e normalizados (norma L2), então o produto interno é o cosseno.
+    """
+
+    def __init__(self, n_components: int = 128, random_state: int = 42):
+        self.n_components = n_components
+        self.random_state = random_state
+        self.components = None
+
+    @property
+    def dim(self) -> int:
+        return self.components.shape[0]
+
+    def fit(self, matrix) -> "SVDEmbedding":
+        """Ajusta a projeção sobre a matriz TF-IDF das notícias."""
+        n_items, n_features = matrix.shape
+        n_components = max(1, min(self.n_components, n_features - 1, n_items - 1))
+        logger.info(f"Ajustando embeddings SVD com {n_components} dimensões...")
+        svd = TruncatedSVD(
+            n_components=n_components,
+            algorithm="randomized",
+            random_state=self.random_state,
+        )
+        svd.fit(matrix)
+        self.components = np.ascontiguousarray(svd.components_, dtype=np.float32)
+        return self
+
+    def transform(self, matrix) -> np.ndarray:
+        """Projeta as linhas da matriz TF-IDF e normaliza os vetores."""
+        vectors = np.asarray(matrix @ self.components.T, dtype=np.float32)
+        return np.ascontiguousarray(normalize(vectors))
+
+    def get_params(self) -> Dict[str, Any]:
+        """Retorna os parâmetros escalares necessários para recriar a projeção."""
+        return {"n_components": self.n_components, "random_state": self.random_state}
+
+    def get_arrays(self) -> Dict[str, np.ndarray]:
+        """Retorna os arrays que devem ser salvos junto com o modelo."""
+        return {"components": self.components}
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], **params) -> "SVDEmbedding":
+        """Recria a projeção a partir dos arrays salvos."""
+        embedding = cls(**params)
+        embedding.components = arrays["components"]
+        return embedding
@@ -0,0 +1,335 @@
+import argparse
+import json
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from src.utils.cache import UserRecommendationCache
+from src.utils.config import Config
+from src.utils.logger import logger
+
+# Resultados finais em cache por endpoint, descartados antes de cada medição
+_RESULT_ENDPOINTS = frozenset({"popular", "new_user"})
+
+
+def time_split(
+    user_df: pd.DataFrame, holdout: int = 1, min_history: int = 2
+) -> Tuple[pd.DataFrame, Dict[str, List[str]]]:
+    """
+    Separa os últimos cliques de cada usuário para avaliação.
+
+    O histórico está em ordem cronológica, então o treino fica com as
+    interações mais antigas e a avaliação com as `holdout` mais recentes.
+    Usuários com menos de `min_history` interações ficam inteiros no treino.
+
+    Args:
+        user_df (pd.DataFrame): Interações com 'userId', 'history' e,
+            opcionalmente, 'timestampHistory' e 'historySize'.
+        holdout (int): Quantidade de cliques reservados por usuário.
+        min_history (int): Tamanho mínimo do histórico para entrar na avaliação.
+
+    Returns:
+        Tuple: Interações de treino e as páginas reservadas por usuário.
+    """
+    train_df = user_df.copy()
+    history = train_df["history"].fillna("")
+    sizes = history.str.count(",") + (history != "")
+    evaluated = (sizes >= max(min_history, holdout + 1)).to_numpy()
+
+    parts = history[evaluated].str.rsplit(",", n=holdout)
+    train_df.loc[evaluated, "history"] = parts.str[0]
+    if "timestampHistory" in train_df.columns:
+        timestamps = train_df.loc[evaluated, "timestampHistory"].fillna("")
+        train_df.loc[evaluated, "timestampHistory"] = timestamps.str.rsplit(
+            ",", n=holdout
+        ).str[0]
+    if "historySize" in train_df.columns:
+        train_df.loc[evaluated, "historySize"] = (sizes[evaluated] - holdout).astype(
+            train_df["historySize"].dtype
+        )
+
+    held_out = dict(
+        zip(
+            train_df.loc[evaluated, "userId"],
+            parts.map(lambda p: [page.strip() for page in p[1:]]),
+        )
+    )
+    return train_df, held_out
+
+
+def ranking_metrics(
+    recommended: Sequence[Sequence[str]], relevant: Sequence[Sequence[str]], k: int
+) -> Dict[str, float]:
+    """
+    Calcula HR@k, NDCG@k e MRR@k com relevância binária.
+
+    Args:
+        recommended (Sequence[Sequence[str]]): Páginas recomendadas, em ordem.
+        relevant (Sequence[Sequence[str]]): Páginas relevantes de cada usuário.
+        k (int): Corte do ranking.
+
+    Returns:
+        Dict[str, float]: Médias das métricas sobre os usuários.
+    """
+    discounts = 1 / np.log2(np.arange(2, k + 2))
+    hits, ndcg, mrr = [], [], []
+    for pages, expected in zip(recommended, relevant):
+        expected = set(expected)
+        found = np.array([page in expected for page in list(pages)[:k]], dtype=bool)
+        ideal = discounts[: min(len(expected), k)].sum()
+        hits.append(found.any())
+        ndcg.append(discounts[: found.shape[0]][found].sum() / ideal if ideal else 0.0)
+        mrr.append(1 / (np.argmax(found) + 1) if found.any() else 0.0)
+    return {
+        f"hr@{k}": float(np.mean(hits)) if hits else 0.0,
+        f"ndcg@{k}": float(np.mean(ndcg)) if ndcg else 0.0,
+        f"mrr@{k}": float(np.mean(mrr)) if mrr else 0.0,
+        "users": len(hits),
+    }
+
+
+def evaluate(recommender, held_out: Dict[str, List[str]], k: int = 10) -> Dict:
+    """
+    Mede a qualidade de cada caminho de recomendação nos cliques reservados.
+
+    Args:
+        recommender (NewsRecommendationSystem): Modelo treinado sem os
+            cliques reservados.
+        held_out (Dict[str, List[str]]): Páginas reservadas por usuário.
+        k (int): Corte do ranking.
+
+    Returns:
+        Dict: Métricas por caminho: 'hybrid' (o ranking servido, calculado em
+        lote), 'content' (só o perfil de conteúdo), 'popular' e 'cold_start'.
+    """
+    user_ids = list(held_out)
+    relevant = [held_out[user_id] for user_id in user_ids]
+    hybrid = {
+        result["user_id"]: [rec["page"] for rec in result["recommendations"]]
+        for result in recommender.get_batch_recommendations(user_ids, k)
+    }
+    content = [
+        [rec["page"] for rec in recommender._get_profile_recommendations(user_id, k)]
+        for user_id in user_ids
+    ]
+    popular = [rec["page"] for rec in recommender.get_popular_recommendations(k)]
+    cold_start = [
+        rec["page"] for rec in recommender.get_recommendations_for_new_user(k)
+    ]
+    return {
+        "hybrid": ranking_metrics(
+            [hybrid[user_id] for user_id in user_ids], relevant, k
+        ),
+        "content": ranking_metrics(content, relevant, k),
+        "popular": ranking_metrics([popular] * len(user_ids), relevant, k),
+        "cold_start": ranking_metrics([cold_start] * len(user_ids), relevant, k),
+    }
+
+
+def _summarize(latencies: List[float], items: int) -> Dict[str, float]:
+    """Resume as latências (em segundos) em percentis e vazão."""
+    latencies_ms = np.array(latencies) * 1000
+    total = float(np.sum(latencies))
+    return {
+        "p50_ms": float(np.percentile(latencies_ms, 50)),
+        "p95_ms": float(np.percentile(latencies_ms, 95)),
+        "p99_ms": float(np.percentile(latencies_ms, 99)),
+        "throughput": items / total if total else float("inf"),
+        "calls": len(latencies),
+    }
+
+
+def _time_calls(
+    function: Callable,
+    arguments: Sequence[tuple],
+    setup: Optional[Callable[[], None]] = None,
+) -> List[float]:
+    """
+    Chama a função com cada tupla de argumentos e retorna as durações (s).
+
+    `setup`, se dado, é chamado antes de cada chamada, fora da medição.
+    """
+    latencies = []
+    for args in arguments:
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        function(*args)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def benchmark_paths(
+    recommender,
+    user_ids: Sequence[str],
+    n: int = 10,
+    n_requests: int = 200,
+    n_batches: int = 5,
+    batch_size: int = 1000,
+    random_state: int = 42,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Mede latência (p50/p95/p99) e vazão de cada caminho de recomendação.
+
+    Os caminhos são medidos pela API pública usada pelos endpoints
+    (`render_*` e `get_batch_recommendations`), incluindo serialização,
+    mas sem os caches de resultado, para refletir o custo de cálculo; só os
+    candidatos populares e recentes, comuns a todos os usuários, continuam
+    em cache, como no serviço. 'hybrid' é o caminho de `/recommend/{user_id}`.
+    A vazão é em requisições por segundo, exceto no lote, em que é em
+    usuários por segundo.
+
+    Args:
+        recommender (NewsRecommendationSystem): Modelo treinado.
+        user_ids (Sequence[str]): Usuários sorteados para as consultas.
+        n (int): Quantidade de recomendações por consulta.
+        n_requests (int): Quantidade de consultas por caminho.
+        n_batches (int): Quantidade de chamadas do caminho em lote.
+        batch_size (int): Usuários por chamada do caminho em lote.
+        random_state (int): Semente para sortear os usuários.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Estatísticas por caminho.
+    """
+    rng = np.random.default_rng(random_state)
+    user_ids = np.asarray(user_ids)
+    sampled = rng.choice(user_ids, n_requests)
+    batches = [list(rng.choice(user_ids, batch_size)) for _ in range(n_batches)]
+
+    def drop_results() -> None:
+        recommender.response_cache.discard(lambda key: key[1] in _RESULT_ENDPOINTS)
+
+    # Um cache sem espaço descarta cada resultado assim que o guarda
+    user_cache = recommender.user_cache
+    recommender.user_cache = UserRecommendationCache(max_bytes=0)
+    try:
+        return {
+            "cold_start": _summarize(
+                _time_calls(
+                    recommender.render_recommendations_for_new_user,
+                    [(n,)] * n_requests,
+                    setup=drop_results,
+                ),
+                n_requests,
+            ),
+            "hybrid": _summarize(
+                _time_calls(
+                    recommender.render_user_recommendations,
+                    [(user_id, n) for user_id in sampled],
+                    setup=drop_results,
+                ),
+                n_requests,
+            ),
+            "popular": _summarize(
+                _time_calls(
+                    recommender.render_popular_recommendations,
+                    [(n,)] * n_requests,
+                    setup=drop_results,
+                ),
+                n_requests,
+            ),
+            "batch": _summarize(
+                _time_calls(
+                    lambda batch: list(recommender.get_batch_recommendations(batch, n)),
+                    [(batch,) for batch in batches],
+                ),
+                n_batches * batch_size,
+            ),
+        }
+    finally:
+        recommender.user_cache = user_cache
+
+
+def run_evaluation(
+    recommender,
+    k: int = 10,
+    holdout: int = 1,
+    max_users: int = 10_000,
+    n_requests: int = 200,
+    random_state: int = 42,
+) -> Dict:
+    """
+    Treina o modelo sem os últimos cliques e mede qualidade e desempenho.
+
+    Args:
+        recommender (NewsRecommendationSystem): Modelo com os dados já carregados.
+        k (int): Corte do ranking e quantidade de recomendações.
+        holdout (int): Cliques reservados por usuário.
+        max_users (int): Máximo de usuários avaliados.
+        n_requests (int): Consultas por caminho no teste de latência.
+        random_state (int): Semente para sortear os usuários.
+
+    Returns:
+        Dict: Tempo de treino, métricas de qualidade e de latência.
+    """
+    recommender.user_df, held_out = time_split(recommender.user_df, holdout)
+    if len(held_out) > max_users:
+        rng = np.random.default_rng(random_state)
+        sampled = rng.choice(np.array(list(held_out)), max_users, replace=False)
+        held_out = {user_id: held_out[user_id] for user_id in sampled}
+
+    start = time.perf_counter()
+    recommender.prepare_data()
+    train_seconds = time.perf_counter() - start
+    logger.info(f"Modelo treinado em {train_seconds:.1f}s. Avaliando...")
+
+    return {
+        "items": len(recommender.news_df),
+        "users": len(recommender.user_df),
+        "train_seconds": train_seconds,
+        "quality": evaluate(recommender, held_out, k),
+        "latency": benchmark_paths(
+            recommender,
+            list(held_out),
+            n=k,
+            n_requests=n_requests,
+            random_state=random_state,
+        ),
+    }
+
+
+if __name__ == "__main__":
+    from src.data.synthetic import SyntheticDataset
+    from src.models.recommender import NewsRecommendationSystem
+
+    parser = argparse.ArgumentParser(
+        description="Avalia a qualidade e o desempenho do recomendador."
+    )
+    parser.add_argument("--data-dir", default=Config.DATA_DIR)
+    parser.add_argument(
+        "--synthetic",
+        action="store_true",
+        help="Usa dados sintéticos em vez dos arquivos em --data-dir.",
+    )
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--engine", choices=["tfidf", "svd"], default="tfidf")
+    parser.add_argument("--embedding-dim", type=int, default=128)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--holdout", type=int, default=1)
+    parser.add_argument("--max-users", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as synthetic_dir:
+        data_dir = args.data_dir
+        if args.synthetic:
+            SyntheticDataset(n_items=args.items, n_users=args.users).write(
+                synthetic_dir
+            )
+            data_dir = synthetic_dir
+
+        recommender = NewsRecommendationSystem(
+            data_dir=data_dir, engine=args.engine, embedding_dim=args.embedding_dim
+        )
+        recommender.load_data()
+        report = run_evaluation(
+            recommender,
+            k=args.k,
+            holdout=args.holdout,
+            max_users=args.max_users,
+            n_requests=args.requests,
+        )
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,272 @@
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import (
+    CountVectorizer,
+    HashingVectorizer,
+    TfidfTransformer,
+    TfidfVectorizer,
+)
+from src.utils.logger import logger
+
+# Separador de documentos ao processar um bloco inteiro como uma única string
+_SEPARATOR = "\x1e"
+
+
+def _fold(text: str) -> str:
+    """Remove os acentos de um texto já em minúsculas."""
+    return "".join(
+        char
+        for char in unicodedata.normalize("NFKD", text)
+        if not unicodedata.combining(char)
+    )
+
+
+# Tabela de tradução dos caracteres latinos acentuados para a forma sem acento
+_ACCENT_TABLE = str.maketrans(
+    {
+        chr(code): _fold(chr(code))
+        for code in range(0x00C0, 0x0250)
+        if _fold(chr(code)) != chr(code)
+    }
+)
+
+_PORTUGUESE_STOPWORDS = """
+a à ao aos aquela aquelas aquele aqueles aquilo as às até com como da das de dela
+delas dele deles depois do dos e é ela elas ele eles em entre era eram essa essas
+esse esses esta está estão estas este estes eu foi foram há isso isto já lhe lhes
+mais mas me mesmo meu meus minha minhas muito na nas não nem no nos nós nossa
+nossas nosso nossos num numa o os ou para pela pelas pelo pelos por qual quando
+que quem se sem ser será seu seus só sua suas também te tem têm teu tu tua um uma
+umas uns você vocês vos ter sobre após ainda onde porque pode podem disse diz
+segundo outro outra outros outras cada ano anos dia dias vai vão ser sido sendo
+estava estavam seria seriam tinha tinham havia apenas todo toda todos todas
+"""
+
+# Stopwords em português, já em minúsculas e sem acentos, como os tokens dobrados
+PORTUGUESE_STOPWORDS = sorted(
+    {word for word in _PORTUGUESE_STOPWORDS.split()}
+    | {word.translate(_ACCENT_TABLE) for word in _PORTUGUESE_STOPWORDS.split()}
+)
+
+
+def fold_accents(documents: Sequence[str], chunk_size: int = 10_000) -> List[str]:
+    """
+    Converte os documentos para minúsculas e remove os acentos, bloco a bloco.
+
+    Cada bloco é unido em uma única string, convertido com uma chamada de
+    `lower` e uma de `translate` e separado de novo, evitando o custo de
+    Python por documento.
+    """
+    documents = list(documents)
+    folded = []
+    for begin in range(0, len(documents), chunk_size):
+        chunk = documents[begin : begin + chunk_size]
+        parts = _SEPARATOR.join(chunk).lower().translate(_ACCENT_TABLE).split(
+            _SEPARATOR
+        )
+        if len(parts) != len(chunk):
+            # Algum documento contém o separador; trata o bloco um a um
+            parts = [text.lower().translate(_ACCENT_TABLE) for text in chunk]
+        folded.extend(parts)
+    return folded
+
+
+def build_content(news_df: pd.DataFrame, fold: bool = False) -> pd.Series:
+    """
+    Combina título, corpo e legenda de cada notícia em um único texto.
+
+    A concatenação é feita coluna a coluna (vetorizada), sem `apply` por linha.
+
+    Args:
+        news_df (pd.DataFrame): Notícias com 'title', 'body' e 'caption'.
+        fold (bool): Se True, converte para minúsculas e remove acentos.
+
+    Returns:
+        pd.Series: Texto de cada notícia, com o mesmo índice de `news_df`.
+    """
+    columns = [
+        (
+            news_df[column].fillna("").astype(str)
+            if column in news_df.columns
+            else pd.Series("", index=news_df.index)
+        )
+        for column in ["title", "body", "caption"]
+    ]
+    content = columns[0] + " " + columns[1] + " " + columns[2]
+    if fold:
+        content = pd.Series(fold_accents(content), index=news_df.index)
+    return content
+
+
+class HashingTfidfVectorizer:
+    """
+    TF-IDF sobre `HashingVectorizer`, sem vocabulário a ajustar.
+
+    A tokenização é sem estado, então blocos de documentos podem ser
+    vetorizados em processos separados; apenas o IDF é ajustado sobre as
+    contagens empilhadas. Não há termos fora do vocabulário.
+    """
+
+    def __init__(self, n_features: int = 2**18, stop_words: Optional[list] = None):
+        self.n_features = n_features
+        self.stop_words = stop_words
+        self.hasher = HashingVectorizer(
+            n_features=n_features,
+            stop_words=stop_words,
+            alternate_sign=False,
+            norm=None,
+        )
+        self.transformer = TfidfTransformer()
+
+    @property
+    def idf_(self) -> np.ndarray:
+        return self.transformer.idf_
+
+    @idf_.setter
+    def idf_(self, value: np.ndarray) -> None:
+        self.transformer.idf_ = value
+
+    def build_analyzer(self):
+        return self.hasher.build_analyzer()
+
+    def fit_transform(self, documents) -> sp.csr_matrix:
+        """Ajusta o IDF e retorna a matriz TF-IDF dos documentos."""
+        return self.transformer.fit_transform(self.hasher.transform(documents))
+
+    def transform(self, documents) -> sp.csr_matrix:
+        """Retorna a matriz TF-IDF dos documentos com o IDF já ajustado."""
+        return self.transformer.transform(self.hasher.transform(documents))
+
+
+def make_vectorizer(
+    kind: str = "tfidf",
+    max_features: int = 5000,
+    stop_words: Optional[str] = None,
+    n_features: int = 2**18,
+):
+    """
+    Cria o vetorizador do conteúdo das notícias.
+
+    Args:
+        kind (str): 'tfidf' (vocabulário ajustado) ou 'hashing' (sem vocabulário).
+        max_features (int): Tamanho máximo do vocabulário ('tfidf').
+        stop_words (str, opcional): 'portuguese' para remover stopwords.
+        n_features (int): Dimensão do espaço de hashing ('hashing').
+
+    Returns:
+        TfidfVectorizer ou HashingTfidfVectorizer: Vetorizador não ajustado.
+    """
+    if stop_words not in (None, "portuguese"):
+        raise ValueError(f"Lista de stopwords desconhecida: {stop_words}")
+    words = PORTUGUESE_STOPWORDS if stop_words == "portuguese" else None
+    if kind == "tfidf":
+        return TfidfVectorizer(max_features=max_features, stop_words=words)
+    if kind == "hashing":
+        return HashingTfidfVectorizer(n_features=n_features, stop_words=words)
+    raise ValueError(f"Tipo de vetorizador desconhecido: {kind}")
+
+
+def _count_chunk(
+    vectorizer: CountVectorizer, documents: List[str]
+) -> Tuple[np.ndarray, sp.csr_matrix]:
+    """Conta os termos de um bloco. Executado nos processos da pool."""
+    counts = vectorizer.fit_transform(documents)
+    return vectorizer.get_feature_names_out(), counts
+
+
+def _hash_chunk(vectorizer: HashingVectorizer, documents: List[str]) -> sp.csr_matrix:
+    """Conta os termos de um bloco por hashing. Executado nos processos da pool."""
+    return vectorizer.transform(documents)
+
+
+def _merge_vocabularies(
+    chunks: List[Tuple[np.ndarray, sp.csr_matrix]], max_features: Optional[int]
+) -> Tuple[np.ndarray, sp.csr_matrix]:
+    """Une as contagens dos blocos em um vocabulário global ordenado."""
+    terms = np.unique(np.concatenate([names for names, _ in chunks]))
+    blocks = []
+    for names, counts in chunks:
+        mapping = np.searchsorted(terms, names).astype(counts.indices.dtype)
+        blocks.append(
+            sp.csr_matrix(
+                (counts.data, mapping[counts.indices], counts.indptr),
+                shape=(counts.shape[0], terms.shape[0]),
+            )
+        )
+    counts = sp.vstack(blocks, format="csr")
+    counts.sort_indices()
+
+    # Mesmo critério do CountVectorizer: os termos mais frequentes no corpus
+    if max_features is not None and terms.shape[0] > max_features:
+        frequencies = np.asarray(counts.sum(axis=0)).ravel()
+        keep = np.sort((-frequencies).argsort()[:max_features])
+        terms, counts = terms[keep], counts[:, keep]
+    return terms, counts
+
+
+def fit_transform_parallel(
+    vectorizer, documents: Sequence[str], n_jobs: int = 1, chunk_size: int = 10_000
+) -> sp.csr_matrix:
+    """
+    Ajusta o vetorizador e calcula a matriz TF-IDF, tokenizando em paralelo.
+
+    Os documentos são divididos em blocos de `chunk_size`, tokenizados em uma
+    pool de `n_jobs` processos e empilhados em uma matriz CSR. O IDF é
+    ajustado uma vez sobre as contagens empilhadas. Para o 'tfidf', os
+    vocabulários dos blocos são unidos e limitados a `max_features`, com o
+    mesmo resultado de `TfidfVectorizer.fit_transform`.
+
+    Args:
+        vectorizer: Vetorizador criado por `make_vectorizer`.
+        documents (Sequence[str]): Conteúdo das notícias.
+        n_jobs (int): Quantidade de processos.
+        chunk_size (int): Documentos por bloco.
+
+    Returns:
+        sp.csr_matrix: Matriz TF-IDF, uma linha por documento.
+    """
+    documents = list(documents)
+    chunks = [
+        documents[begin : begin + chunk_size]
+        for begin in range(0, len(documents), chunk_size)
+    ]
+    if n_jobs <= 1 or len(chunks) <= 1:
+        return vectorizer.fit_transform(documents)
+
+    logger.info(f"Tokenizando {len(chunks)} blocos em {n_jobs} processos...")
+    hashing = isinstance(vectorizer, HashingTfidfVectorizer)
+    if hashing:
+        worker, tokenizer = _hash_chunk, vectorizer.hasher
+    else:
+        worker = _count_chunk
+        tokenizer = CountVectorizer(
+            **{
+                name: value
+                for name, value in vectorizer.get_params().items()
+                if name in CountVectorizer().get_params()
+                and name not in ("max_features", "vocabulary")
+            }
+        )
+    with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+        results = list(pool.map(worker, [tokenizer] * len(chunks), chunks))
+
+    if hashing:
+        return vectorizer.transformer.fit_transform(sp.vstack(results, format="csr"))
+
+    terms, counts = _merge_vocabularies(results, vectorizer.max_features)
+    transformer = TfidfTransformer(
+        norm=vectorizer.norm,
+        use_idf=vectorizer.use_idf,
+        smooth_idf=vectorizer.smooth_idf,
+        sublinear_tf=vectorizer.sublinear_tf,
+    ).fit(counts)
+    vectorizer.set_params(
+        vocabulary={term: column for column, term in enumerate(terms)}
+    )
+    vectorizer.idf_ = transformer.idf_
+    return transformer.transform(counts)
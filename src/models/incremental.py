@@ -0,0 +1,163 @@
+from typing import Callable, Dict, Iterable
+
+import numpy as np
+import scipy.sparse as sp
+
+
+class AppendableCSR:
+    """
+    Matriz CSR que cresce por linhas em tempo amortizado O(linhas novas).
+
+    Os arrays `data`, `indices` e `indptr` são alocados com folga e dobram de
+    capacidade quando necessário; `matrix` expõe apenas a parte ocupada, sem
+    copiar. A matriz inicial (possivelmente mapeada em memória) só é copiada
+    para os buffers no primeiro `append`.
+    """
+
+    def __init__(self, matrix: sp.csr_matrix):
+        self._matrix = matrix.tocsr()
+        self._data = None
+        self._indices = None
+        self._indptr = None
+        self.n_rows, self.n_cols = self._matrix.shape
+        self.nnz = self._matrix.nnz
+
+    @property
+    def matrix(self) -> sp.csr_matrix:
+        """Retorna a matriz com as linhas ocupadas."""
+        return self._matrix
+
+    @staticmethod
+    def _grow(array: np.ndarray, used: int, needed: int, dtype=None) -> np.ndarray:
+        """Garante capacidade para `needed` elementos, dobrando o buffer."""
+        dtype = dtype or array.dtype
+        if array.shape[0] >= needed and array.dtype == dtype:
+            return array
+        grown = np.empty(max(needed, 2 * array.shape[0]), dtype=dtype)
+        grown[:used] = array[:used]
+        return grown
+
+    def _ensure_buffers(self) -> None:
+        """Copia a matriz inicial para buffers com folga."""
+        if self._data is not None:
+            return
+        self._data = np.array(self._matrix.data)
+        self._indices = np.array(self._matrix.indices)
+        self._indptr = np.array(self._matrix.indptr)
+
+    def append(self, rows: sp.csr_matrix) -> sp.csr_matrix:
+        """Adiciona as linhas ao final da matriz e retorna a matriz atualizada."""
+        rows = rows.tocsr()
+        if rows.shape[1] != self.n_cols:
+            raise ValueError(
+                f"Número de colunas incompatível: {rows.shape[1]} != {self.n_cols}"
+            )
+        self._ensure_buffers()
+
+        new_nnz = self.nnz + rows.nnz
+        new_rows = self.n_rows + rows.shape[0]
+        # indices e indptr precisam do mesmo tipo para o scipy não copiá-los
+        index_dtype = np.int32 if new_nnz < np.iinfo(np.int32).max else np.int64
+        self._data = self._grow(self._data, self.nnz, new_nnz)
+        self._indices = self._grow(self._indices, self.nnz, new_nnz, index_dtype)
+        self._indptr = self._grow(
+            self._indptr, self.n_rows + 1, new_rows + 1, index_dtype
+        )
+
+        self._data[self.nnz : new_nnz] = rows.data
+        self._indices[self.nnz : new_nnz] = rows.indices
+        self._indptr[self.n_rows + 1 : new_rows + 1] = rows.indptr[1:] + self.nnz
+
+        self.nnz, self.n_rows = new_nnz, new_rows
+        self._matrix = sp.csr_matrix(
+            (
+                self._data[:new_nnz],
+                self._indices[:new_nnz],
+                self._indptr[: new_rows + 1],
+            ),
+            shape=(new_rows, self.n_cols),
+            copy=False,
+        )
+        return self._matrix
+
+
+class VocabularyDriftTracker:
+    """
+    Acompanha a fração de tokens fora do vocabulário nos documentos novos.
+
+    Quando a fração acumulada desde o último ajuste ultrapassa `threshold`
+    (e há ao menos `min_tokens` tokens observados), o vocabulário é
+    considerado defasado e um novo ajuste completo é recomendado.
+    """
+
+    def __init__(self, threshold: float = 0.2, min_tokens: int = 1000):
+        self.threshold = threshold
+        self.min_tokens = min_tokens
+        self.reset()
+
+    def reset(self) -> None:
+        """Zera as contagens após um novo ajuste do vocabulário."""
+        self.total_tokens = 0
+        self.unknown_tokens = 0
+
+    @property
+    def drift(self) -> float:
+        """Fração acumulada de tokens fora do vocabulário."""
+        return self.unknown_tokens / self.total_tokens if self.total_tokens else 0.0
+
+    @property
+    def exceeded(self) -> bool:
+        """Indica se a deriva ultrapassou o limite."""
+        return self.total_tokens >= self.min_tokens and self.drift > self.threshold
+
+    def update(
+        self,
+        documents: Iterable[str],
+        analyzer: Callable[[str], list],
+        vocabulary: Dict[str, int],
+    ) -> float:
+        """Contabiliza os tokens dos documentos e retorna a deriva acumulada."""
+        for document in documents:
+            tokens = analyzer(document)
+            self.total_tokens += len(tokens)
+            self.unknown_tokens += sum(token not in vocabulary for token in tokens)
+        return self.drift
+
+
+class AppendableArray:
+    """
+    Array denso que cresce por linhas em tempo amortizado O(linhas novas).
+
+    As linhas ficam em um buffer C-contíguo com folga, que dobra de capacidade
+    quando necessário; `array` expõe as linhas ocupadas como uma view também
+    contígua. O array inicial só é copiado no primeiro `append`.
+    """
+
+    def __init__(self, array: np.ndarray):
+        self._array = array
+        self._buffer = None
+        self.n_rows = array.shape[0]
+
+    @property
+    def array(self) -> np.ndarray:
+        """Retorna o array com as linhas ocupadas."""
+        return self._array
+
+    def append(self, rows: np.ndarray) -> np.ndarray:
+        """Adiciona as linhas ao final do array e retorna o array atualizado."""
+        rows = np.asarray(rows, dtype=self._array.dtype)
+        if rows.shape[1:] != self._array.shape[1:]:
+            raise ValueError(
+                f"Formato incompatível: {rows.shape[1:]} != {self._array.shape[1:]}"
+            )
+        new_rows = self.n_rows + rows.shape[0]
+        if self._buffer is None or self._buffer.shape[0] < new_rows:
+            capacity = max(new_rows, 2 * self.n_rows)
+            buffer = np.empty((capacity,) + self._array.shape[1:], self._array.dtype)
+            buffer[: self.n_rows] = self._array
+            self._buffer = buffer
+
+        self._buffer[self.n_rows : new_rows] = rows
+        self.n_rows = new_rows
+        self._array = self._buffer[:new_rows]
+        return self._array
@@ -0,0 +1,174 @@
+from typing import Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from src.models.incremental import AppendableArray
+from src.models.similarity_index import top_k_rows
+from src.utils.logger import logger
+
+
+def _dense_block(values) -> np.ndarray:
+    """Converte um bloco de similaridades em um array denso float32."""
+    if sp.issparse(values):
+        values = values.toarray()
+    return np.asarray(values, dtype=np.float32)
+
+
+class NeighborTable:
+    """
+    Tabela pré-calculada com os k vizinhos mais similares de cada item.
+
+    Os vizinhos ficam em arrays paralelos `indices` (int32) e `scores`
+    (float32) de formato (n_itens, k), que podem ser mapeados em memória.
+    Posições sem vizinho são preenchidas com -1.
+    """
+
+    def __init__(self, indices: np.ndarray, scores: np.ndarray):
+        self.indices = indices
+        self.scores = scores
+        self._buffers = None
+
+    @property
+    def k(self) -> int:
+        return self.indices.shape[1]
+
+    def __len__(self) -> int:
+        return self.indices.shape[0]
+
+    @staticmethod
+    def _block_rows(n_items: int, max_block_bytes: int) -> int:
+        """Calcula quantas linhas cabem em um bloco denso de similaridades."""
+        return max(1, max_block_bytes // max(n_items * 4, 1))
+
+    @staticmethod
+    def _compute_rows(
+        rows, matrix, start: int, k: int, max_block_bytes: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Calcula os vizinhos das linhas `rows`, que começam na posição `start`."""
+        n_rows, n_items = rows.shape[0], matrix.shape[0]
+        indices = np.full((n_rows, k), -1, dtype=np.int32)
+        scores = np.zeros((n_rows, k), dtype=np.float32)
+        block_rows = NeighborTable._block_rows(n_items, max_block_bytes)
+
+        for begin in range(0, n_rows, block_rows):
+            end = min(begin + block_rows, n_rows)
+            similarities = _dense_block(rows[begin:end] @ matrix.T)
+            own = np.arange(begin, end)
+            similarities[own - begin, start + own] = -np.inf
+
+            block_indices, block_scores = top_k_rows(similarities, k)
+            valid = np.isfinite(block_scores)
+            width = block_indices.shape[1]
+            indices[begin:end, :width] = np.where(valid, block_indices, -1)
+            scores[begin:end, :width] = np.where(valid, block_scores, 0.0)
+        return indices, scores
+
+    @classmethod
+    def build(
+        cls, matrix, k: int = 50, max_block_bytes: int = 256 * 1024**2
+    ) -> "NeighborTable":
+        """
+        Calcula a tabela de vizinhos em blocos de produtos de matrizes esparsas.
+
+        Args:
+            matrix: Matriz de itens com linhas normalizadas (norma L2).
+            k (int): Quantidade de vizinhos por item.
+            max_block_bytes (int): Limite de memória de cada bloco denso.
+
+        Returns:
+            NeighborTable: Tabela com os vizinhos de todos os itens.
+        """
+        logger.info(f"Calculando tabela de {k} vizinhos por notícia...")
+        indices, scores = cls._compute_rows(matrix, matrix, 0, k, max_block_bytes)
+        return cls(indices, scores)
+
+    def append(self, matrix, max_block_bytes: int = 256 * 1024**2) -> None:
+        """
+        Inclui na tabela os itens adicionados ao final da matriz.
+
+        Calcula apenas as linhas dos itens novos e atualiza as linhas antigas
+        cujos vizinhos passaram a incluir algum dos itens novos. As linhas
+        ficam em buffers com folga, atualizados no lugar; a tabela inicial
+        (possivelmente mapeada em memória) só é copiada no primeiro `append`.
+        """
+        start = len(self)
+        new_rows = matrix[start:]
+        if new_rows.shape[0] == 0:
+            return
+
+        new_indices, new_scores = self._compute_rows(
+            new_rows, matrix, start, self.k, max_block_bytes
+        )
+        if self._buffers is None or self._buffers[0].array is not self.indices:
+            self._buffers = (
+                AppendableArray(self.indices),
+                AppendableArray(self.scores),
+            )
+        indices = self._buffers[0].append(new_indices)
+        scores = self._buffers[1].append(new_scores)
+
+        block_rows = self._block_rows(new_rows.shape[0], max_block_bytes)
+        for begin in range(0, start, block_rows):
+            end = min(begin + block_rows, start)
+            similarities = _dense_block(matrix[begin:end] @ new_rows.T)
+            # Só o último vizinho de cada linha decide se ela muda
+            last = np.where(
+                indices[begin:end, -1] >= 0, scores[begin:end, -1], -np.inf
+            )
+            changed = similarities.max(axis=1) > last
+            if not changed.any():
+                continue
+
+            rows = np.flatnonzero(changed) + begin
+            current = np.where(indices[rows] >= 0, scores[rows], -np.inf)
+            merged_indices = np.hstack(
+                [
+                    indices[rows],
+                    np.broadcast_to(
+                        np.arange(start, matrix.shape[0], dtype=np.int32),
+                        (rows.shape[0], new_rows.shape[0]),
+                    ),
+                ]
+            )
+            merged_scores = np.hstack([current, similarities[changed]])
+            top_indices, top_scores = top_k_rows(merged_scores, self.k)
+            valid = np.isfinite(top_scores)
+            indices[rows] = np.where(
+                valid, np.take_along_axis(merged_indices, top_indices, axis=1), -1
+            )
+            scores[rows] = np.where(valid, top_scores, 0.0)
+
+        self.indices, self.scores = indices, scores
+
+    def neighbors(self, position: int, n: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Retorna as posições e scores dos n vizinhos mais similares do item."""
+        indices = self.indices[position, :n]
+        valid = indices >= 0
+        return indices[valid], self.scores[position, :n][valid]
+
+    def aggregate(
+        self, positions: np.ndarray, weights: np.ndarray, n: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Soma os vizinhos de vários itens, cada um com o seu peso.
+
+        Args:
+            positions (np.ndarray): Itens de origem.
+            weights (np.ndarray): Peso de cada item de origem.
+            n (int): Quantidade de resultados.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: As `n` posições com as maiores somas
+            e as somas, em ordem decrescente.
+        """
+        indices = np.asarray(self.indices[positions])
+        scores = np.asarray(self.scores[positions]) * weights[:, None]
+        valid = indices >= 0
+        unique, inverse = np.unique(indices[valid], return_inverse=True)
+        summed = np.bincount(inverse, weights=scores[valid]).astype(np.float32)
+        n = min(n, unique.shape[0])
+        if n <= 0:
+            return unique[:0].astype(np.int64), summed[:0]
+        top = np.argpartition(-summed, n - 1)[:n]
+        top = top[np.argsort(-summed[top], kind="stable")]
+        return unique[top].astype(np.int64), summed[top]
@@ -0,0 +1,91 @@
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_WINDOWS = ("1h", "24h", "7d")
+
+
+def _to_ms(value) -> float:
+    """Converte um Timedelta ou Timestamp em milissegundos."""
+    return value.value / 1e6
+
+
+def _window_ms(window: str) -> float:
+    """Converte uma janela como '24h' ou '7d' em milissegundos."""
+    return _to_ms(pd.Timedelta(window.replace("d", "D")))
+
+
+def _explode(series: pd.Series) -> pd.Series:
+    """Separa as listas de valores separados por vírgula, um valor por linha."""
+    return series.fillna("").str.split(",").explode().str.strip()
+
+
+def compute_popularity(
+    history: pd.Series,
+    timestamps: Optional[pd.Series] = None,
+    decay_factor: float = 0.1,
+    windows: Sequence[str] = DEFAULT_WINDOWS,
+    reference_time: Optional[pd.Timestamp] = None,
+) -> pd.DataFrame:
+    """
+    Calcula a popularidade das páginas a partir do histórico de interações.
+
+    Cada entrada do histórico é pareada com o seu timestamp (em ms desde a
+    época, como em `timestampHistory`) e recebe o peso
+    `1 / (1 + decay_factor * idade_em_dias)`. As contagens por janela são
+    calculadas na mesma passada. Entradas sem timestamp válido são tratadas
+    como ocorridas no instante de referência.
+
+    Args:
+        history (pd.Series): Históricos de páginas separadas por vírgula.
+        timestamps (pd.Series, opcional): Timestamps correspondentes a cada página.
+        decay_factor (float): Fator de decaimento diário.
+        windows (Sequence[str]): Janelas de contagem (ex: '1h', '24h', '7d').
+        reference_time (pd.Timestamp, opcional): Instante de referência. Por
+            padrão, a interação mais recente.
+
+    Returns:
+        pd.DataFrame: Indexado por página, com a coluna 'score' normalizada
+        em [0, 1] e uma coluna 'views_<janela>' por janela.
+    """
+    pages = _explode(history)
+    # Linhas sem timestamps, ou com quantidade diferente do histórico, ficam sem data
+    history = history.fillna("")
+    undated = history.str.replace(r"[^,]", "", regex=True)
+    if timestamps is None:
+        timestamps = undated
+    else:
+        timestamps = timestamps.fillna("")
+        aligned = history.str.count(",") == timestamps.str.count(",")
+        timestamps = timestamps.where(aligned, undated)
+    epoch_ms = pd.to_numeric(_explode(timestamps), errors="coerce").to_numpy(
+        dtype=np.float64
+    )
+
+    valid = (pages != "").to_numpy()
+    pages, epoch_ms = pages[valid], epoch_ms[valid]
+
+    if reference_time is not None:
+        reference_ms = _to_ms(pd.Timestamp(reference_time))
+    elif np.isfinite(epoch_ms).any():
+        reference_ms = np.nanmax(epoch_ms)
+    else:
+        reference_ms = _to_ms(pd.Timestamp.now())
+    age_ms = np.clip(np.nan_to_num(reference_ms - epoch_ms, nan=0.0), 0, None)
+
+    codes, uniques = pd.factorize(pages)
+    weights = 1 / (1 + decay_factor * age_ms / _window_ms("1d"))
+    popularity = pd.DataFrame(
+        {"score": np.bincount(codes, weights=weights, minlength=len(uniques))},
+        index=pd.Index(uniques, name="page"),
+    )
+    for window in windows:
+        in_window = age_ms <= _window_ms(window)
+        popularity[f"views_{window}"] = np.bincount(
+            codes, weights=in_window, minlength=len(uniques)
+        ).astype(np.int64)
+
+    if len(popularity) and popularity["score"].max() > 0:
+        popularity["score"] /= popularity["score"].max()
+    return popularity.sort_values("score", ascending=False)
@@ -0,0 +1,164 @@
+from typing import Dict, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+from src.models.popularity import _explode, _window_ms
+from src.utils.logger import logger
+
+
+class UserProfiles:
+    """
+    Perfis de conteúdo dos usuários, um vetor por linha de `user_df`.
+
+    Cada perfil é o centroide das linhas TF-IDF das últimas leituras do
+    usuário, ponderadas pelo tempo, com linhas normalizadas e em float32: uma
+    matriz CSR para itens TF-IDF ou um array denso contíguo para embeddings
+    densos. As páginas já lidas ficam em arrays no formato CSR
+    (`read_indptr`, `read_positions`), ordenados por usuário, para que a
+    exclusão seja feita sem montar conjuntos Python.
+    """
+
+    def __init__(
+        self,
+        vectors,
+        read_indptr: np.ndarray,
+        read_positions: np.ndarray,
+    ):
+        self.vectors = vectors
+        self.read_indptr = read_indptr
+        self.read_positions = read_positions
+
+    def __len__(self) -> int:
+        return self.vectors.shape[0]
+
+    @classmethod
+    def build(
+        cls,
+        history: pd.Series,
+        page_index: Mapping[str, int],
+        matrix,
+        timestamps: Optional[pd.Series] = None,
+        last_n: int = 20,
+        decay_factor: float = 0.1,
+    ) -> "UserProfiles":
+        """
+        Calcula os perfis de todos os usuários com um único produto esparso.
+
+        Cada uma das `last_n` leituras mais recentes recebe o peso
+        `1 / (1 + decay_factor * idade_em_dias)`, com a idade medida a partir
+        da leitura mais recente do próprio usuário. Sem timestamps válidos,
+        cada posição anterior no histórico conta como um dia.
+
+        Args:
+            history (pd.Series): Históricos de páginas separadas por vírgula.
+            page_index (Mapping[str, int]): Posição de cada página na matriz.
+            matrix: Matriz de itens das notícias (TF-IDF ou embeddings densos).
+            timestamps (pd.Series, opcional): Timestamps correspondentes a cada página.
+            last_n (int): Quantidade de leituras recentes consideradas no perfil.
+            decay_factor (float): Fator de decaimento diário.
+
+        Returns:
+            UserProfiles: Perfis e páginas lidas de cada usuário.
+        """
+        logger.info(f"Calculando perfis de {len(history)} usuários...")
+        n_users, n_items = len(history), matrix.shape[0]
+        history = history.fillna("").reset_index(drop=True)
+        lengths = history.str.count(",").to_numpy() + 1
+        users = np.repeat(np.arange(n_users), lengths)
+        # Distância de cada leitura até a mais recente do mesmo usuário
+        starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        steps_back = np.repeat(lengths, lengths) - 1 - (np.arange(len(users)) - starts)
+
+        pages = _explode(history)
+        if timestamps is not None:
+            # Timestamps com quantidade diferente do histórico são descartados
+            timestamps = timestamps.fillna("").reset_index(drop=True)
+            aligned = history.str.count(",") == timestamps.str.count(",")
+            undated = history.str.replace(r"[^,]", "", regex=True)
+            timestamps = timestamps.where(aligned, undated)
+            epoch_ms = pd.to_numeric(_explode(timestamps), errors="coerce").to_numpy(
+                dtype=np.float64
+            )
+        else:
+            epoch_ms = np.full(users.shape[0], np.nan)
+
+        positions = pages.map(page_index).to_numpy(dtype=np.float64)
+        known = ~np.isnan(positions)
+        users, steps_back, epoch_ms = users[known], steps_back[known], epoch_ms[known]
+        positions = positions[known].astype(np.int32)
+
+        latest = np.full(n_users, -np.inf)
+        np.fmax.at(latest, users, epoch_ms)
+        age_days = (latest[users] - epoch_ms) / _window_ms("1d")
+        age_days = np.where(np.isfinite(age_days), age_days, steps_back)
+
+        recent = steps_back < last_n
+        weights = sp.csr_matrix(
+            (
+                1 / (1 + decay_factor * np.clip(age_days[recent], 0, None)),
+                (users[recent], positions[recent]),
+            ),
+            shape=(n_users, n_items),
+            dtype=np.float32,
+        )
+        vectors = normalize(weights @ matrix).astype(np.float32)
+        vectors = (
+            vectors.tocsr() if sp.issparse(vectors) else np.ascontiguousarray(vectors)
+        )
+
+        # A conversão para CSR soma duplicatas e ordena as posições de cada linha
+        read = sp.csr_matrix(
+            (np.ones(users.shape[0], dtype=np.int8), (users, positions)),
+            shape=(n_users, n_items),
+        )
+        return cls(
+            vectors,
+            read.indptr.astype(np.int64),
+            read.indices.astype(np.int32),
+        )
+
+    def vector(self, row: int):
+        """Retorna o perfil do usuário na linha `row`."""
+        return self.vectors[row]
+
+    def has_profile(self, rows) -> np.ndarray:
+        """Indica quais linhas têm perfil, isto é, ao menos uma leitura conhecida."""
+        if sp.issparse(self.vectors):
+            return np.diff(self.vectors.indptr)[rows] > 0
+        return np.any(self.vectors[rows] != 0, axis=-1)
+
+    def read(self, row: int) -> np.ndarray:
+        """Retorna as posições já lidas pelo usuário, em ordem crescente."""
+        return self.read_positions[self.read_indptr[row] : self.read_indptr[row + 1]]
+
+    def get_arrays(self) -> Dict[str, np.ndarray]:
+        """Retorna os arrays que devem ser salvos junto com o modelo."""
+        arrays = {
+            "read_indptr": self.read_indptr,
+            "read_positions": self.read_positions,
+        }
+        if sp.issparse(self.vectors):
+            arrays.update(
+                data=self.vectors.data,
+                indices=self.vectors.indices,
+                indptr=self.vectors.indptr,
+            )
+        else:
+            arrays["vectors"] = self.vectors
+        return arrays
+
+    @classmethod
+    def from_arrays(
+        cls, arrays: Dict[str, np.ndarray], n_features: int
+    ) -> "UserProfiles":
+        """Recria os perfis a partir dos arrays salvos."""
+        if "vectors" in arrays:
+            vectors = arrays["vectors"]
+        else:
+            vectors = sp.csr_matrix(
+                (arrays["data"], arrays["indices"], arrays["indptr"]),
+                shape=(arrays["indptr"].shape[0] - 1, n_features),
+            )
+        return cls(vectors, arrays["read_indptr"], arrays["read_positions"])
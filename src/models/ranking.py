@@ -0,0 +1,118 @@
+import time
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.utils.config import Config
+
+# Candidatos de um retriever: posições no catálogo e scores, em arrays paralelos
+Candidates = Tuple[np.ndarray, np.ndarray]
+
+
+def default_weights() -> Dict[str, float]:
+    """Retorna os pesos configurados de cada retriever."""
+    return {
+        "content": Config.RANK_CONTENT_WEIGHT,
+        "similar": Config.RANK_SIMILAR_WEIGHT,
+        "covisit": Config.RANK_COVISIT_WEIGHT,
+        "popular": Config.RANK_POPULAR_WEIGHT,
+        "recent": Config.RANK_RECENT_WEIGHT,
+    }
+
+
+class HybridRanker:
+    """
+    Funde os candidatos de vários retrievers em um único ranking.
+
+    Cada retriever (conteúdo, vizinhos, co-visitação, populares...) entrega
+    posições e scores. Os scores de cada retriever são normalizados pelo seu
+    máximo e somados com o peso do retriever, de modo que uma notícia
+    encontrada por mais de um retriever acumula os scores. O total é então
+    multiplicado por um fator de frescor, que decai de 1 até `freshness_floor`
+    com a idade da notícia (meia-vida `half_life_hours`). Notícias já lidas
+    são excluídas e só as `n` melhores são ordenadas. Tudo em NumPy, sem
+    objetos por candidato.
+
+    Args:
+        weights (Dict[str, float], opcional): Peso de cada retriever; retrievers
+            sem peso são ignorados. Por padrão, os pesos da configuração.
+        half_life_hours (float): Meia-vida do frescor.
+        freshness_floor (float): Fator mínimo de frescor, para notícias antigas
+            ou sem data.
+    """
+
+    def __init__(
+        self,
+        weights: Optional[Dict[str, float]] = None,
+        half_life_hours: float = Config.RANK_HALF_LIFE_HOURS,
+        freshness_floor: float = Config.RANK_FRESHNESS_FLOOR,
+    ):
+        self.weights = default_weights() if weights is None else dict(weights)
+        self.half_life_ms = half_life_hours * 3600 * 1000
+        self.freshness_floor = freshness_floor
+
+    def decay(self, published: np.ndarray, now_ms: float) -> np.ndarray:
+        """Retorna `2^(-idade / meia-vida)` das datas `published` (ms)."""
+        age = np.maximum(now_ms - published.astype(np.float64), 0.0)
+        return np.exp2(-age / self.half_life_ms)
+
+    def freshness(self, published: np.ndarray, now_ms: float) -> np.ndarray:
+        """Retorna o fator de frescor, entre `freshness_floor` e 1."""
+        decay = self.decay(published, now_ms)
+        return self.freshness_floor + (1.0 - self.freshness_floor) * decay
+
+    def rank(
+        self,
+        candidates: Dict[str, Candidates],
+        n: int,
+        exclude: Optional[Sequence[int]] = None,
+        published: Optional[np.ndarray] = None,
+        now_ms: Optional[float] = None,
+    ) -> Candidates:
+        """
+        Ordena os candidatos pelo score fundido.
+
+        Args:
+            candidates (Dict[str, Candidates]): Posições e scores por retriever.
+            n (int): Quantidade de resultados.
+            exclude (Sequence[int], opcional): Posições que não podem ser
+                recomendadas (ex: notícias já lidas).
+            published (np.ndarray, opcional): Data de publicação de cada notícia
+                do catálogo, em ms desde a época. Sem ela, não há fator de frescor.
+            now_ms (float, opcional): Instante de referência (padrão: agora).
+
+        Returns:
+            Candidates: As `n` melhores posições e seus scores, em ordem
+            decrescente.
+        """
+        positions, scores = [], []
+        for name, (retrieved, retrieved_scores) in candidates.items():
+            weight = self.weights.get(name, 0.0)
+            if not weight or not len(retrieved):
+                continue
+            retrieved_scores = np.asarray(retrieved_scores, dtype=np.float64)
+            top = retrieved_scores.max()
+            if top <= 0:
+                continue
+            positions.append(np.asarray(retrieved, dtype=np.int64))
+            scores.append(retrieved_scores * (weight / top))
+        if not positions or n <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        # Deduplica somando os scores de cada notícia entre os retrievers
+        unique, inverse = np.unique(np.concatenate(positions), return_inverse=True)
+        fused = np.bincount(inverse, weights=np.concatenate(scores))
+        if published is not None:
+            now_ms = time.time() * 1000 if now_ms is None else now_ms
+            fused *= self.freshness(published[unique], now_ms)
+        if exclude is not None and len(exclude):
+            # `unique` está ordenado: busca binária em vez de np.isin
+            excluded = np.asarray(exclude, dtype=np.int64)
+            slots = np.minimum(np.searchsorted(unique, excluded), unique.shape[0] - 1)
+            fused[slots[unique[slots] == excluded]] = -np.inf
+
+        k = min(n, unique.shape[0])
+        top = np.argpartition(-fused, k - 1)[:k]
+        top = top[np.argsort(-fused[top], kind="stable")]
+        top = top[np.isfinite(fused[top])]
+        return unique[top], fused[top].astype(np.float32)
@@ -0,0 +1,174 @@
+import threading
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from src.models.incremental import AppendableArray
+
+# Notícias sem data válida ficam antes de todas as outras
+_MISSING = np.iinfo(np.int64).min
+
+
+def to_epoch_ms(dates) -> np.ndarray:
+    """
+    Converte datas em milissegundos desde a época (UTC).
+
+    Datas sem fuso são tratadas como UTC; datas inválidas ou ausentes viram
+    o menor inteiro possível, de modo que nunca caem em uma janela.
+    """
+    dates = pd.to_datetime(pd.Series(dates), errors="coerce", utc=True)
+    nanoseconds = dates.to_numpy(dtype="datetime64[ns]").view(np.int64)
+    return np.where(dates.isna().to_numpy(), _MISSING, nanoseconds // 1_000_000)
+
+
+class RecencyIndex:
+    """
+    Posições do catálogo ordenadas pela data de publicação.
+
+    Consultas por recência viram uma busca binária e uma fatia, em vez de
+    uma varredura do catálogo inteiro. Empates na data são ordenados pela
+    posição, então o par (data, posição) identifica cada notícia e serve
+    de cursor para paginar das mais novas para as mais antigas.
+
+    Os arrays crescem com folga: notícias que chegam em ordem de publicação
+    (o caso comum) são anexadas em O(notícias novas); só as que chegam fora
+    de ordem exigem inserção no meio dos arrays.
+
+    Args:
+        timestamps (np.ndarray): Data de cada notícia, em ms desde a época,
+            na ordem do catálogo (mantida em `published`).
+    """
+
+    def __init__(self, timestamps: np.ndarray):
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        order = np.argsort(timestamps, kind="stable").astype(np.int64)
+        self._published = AppendableArray(timestamps)
+        self._order = AppendableArray(order)
+        self._timestamps = AppendableArray(timestamps[order])
+        self._lock = threading.Lock()
+
+    @property
+    def published(self) -> np.ndarray:
+        """Data de cada notícia, na ordem do catálogo."""
+        return self._published.array
+
+    @property
+    def order(self) -> np.ndarray:
+        """Posições do catálogo, da notícia mais antiga à mais nova."""
+        return self._order.array
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Datas de `order`, em ordem crescente."""
+        return self._timestamps.array
+
+    @classmethod
+    def from_dates(cls, dates) -> "RecencyIndex":
+        """Constrói o índice a partir de uma coluna de datas."""
+        return cls(to_epoch_ms(dates))
+
+    def __len__(self) -> int:
+        return self.order.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        return self.order.nbytes + self.timestamps.nbytes + self.published.nbytes
+
+    def append(self, timestamps: np.ndarray) -> None:
+        """
+        Insere notícias adicionadas ao final do catálogo, mantendo a ordem.
+
+        As posições novas são maiores que todas as existentes, então inseri-las
+        depois dos empates preserva a ordem por (data, posição).
+        """
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        if not timestamps.shape[0]:
+            return
+        with self._lock:
+            positions = len(self) + np.argsort(timestamps, kind="stable")
+            new_timestamps = timestamps[positions - len(self)]
+            if not len(self) or new_timestamps[0] >= self.timestamps[-1]:
+                self._order.append(positions)
+                self._timestamps.append(new_timestamps)
+            else:
+                slots = np.searchsorted(self.timestamps, new_timestamps, side="right")
+                self._order = AppendableArray(np.insert(self.order, slots, positions))
+                self._timestamps = AppendableArray(
+                    np.insert(self.timestamps, slots, new_timestamps)
+                )
+            self._published.append(timestamps)
+
+    def _end(self, before: Optional[Tuple[int, int]]) -> int:
+        """Retorna o fim da fatia das notícias anteriores ao cursor."""
+        if before is None:
+            return len(self)
+        timestamp, position = before
+        start = np.searchsorted(self.timestamps, timestamp, side="left")
+        stop = np.searchsorted(self.timestamps, timestamp, side="right")
+        return int(start + np.searchsorted(self.order[start:stop], position))
+
+    def window(self, since: int, until: Optional[int] = None) -> np.ndarray:
+        """
+        Retorna as posições publicadas em [since, until), das mais novas às
+        mais antigas.
+
+        Args:
+            since (int): Início da janela, em ms desde a época.
+            until (int, opcional): Fim da janela (exclusivo). Sem limite por padrão.
+
+        Returns:
+            np.ndarray: Posições no catálogo.
+        """
+        with self._lock:
+            start = np.searchsorted(self.timestamps, since, side="left")
+            stop = (
+                len(self)
+                if until is None
+                else np.searchsorted(self.timestamps, until, side="left")
+            )
+            return self.order[start:stop][::-1]
+
+    def newest(
+        self,
+        n: int,
+        since: Optional[int] = None,
+        before: Optional[Tuple[int, int]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Retorna as `n` notícias mais novas, opcionalmente a partir de um cursor.
+
+        Args:
+            n (int): Quantidade de notícias.
+            since (int, opcional): Data mínima, em ms desde a época.
+            before (Tuple[int, int], opcional): Cursor (data, posição) da última
+                notícia da página anterior; só notícias mais antigas retornam.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Posições e datas, das mais novas às
+            mais antigas.
+        """
+        with self._lock:
+            stop = self._end(before)
+            floor = _MISSING + 1 if since is None else since
+            first = np.searchsorted(self.timestamps, floor, side="left")
+            start = max(first, stop - max(n, 0))
+            positions = self.order[start:stop][::-1]
+            return positions, self.timestamps[start:stop][::-1]
+
+
+def encode_cursor(timestamp: int, position: int) -> str:
+    """Codifica o cursor (data, posição) de paginação como texto."""
+    return f"{int(timestamp)}_{int(position)}"
+
+
+def decode_cursor(cursor: str) -> Tuple[int, int]:
+    """
+    Decodifica um cursor gerado por `encode_cursor`.
+
+    Raises:
+        ValueError: Se o cursor não estiver no formato esperado.
+    """
+    timestamp, separator, position = cursor.partition("_")
+    if not separator:
+        raise ValueError(f"Cursor inválido: {cursor}")
+    return int(timestamp), int(position)
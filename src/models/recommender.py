@@ -1,32 +1,201 @@
 # src/models/recommender.py
+import functools
+import gc
+import os
 import pickle
-from datetime import datetime, timedelta
-from typing import Tuple, List, Dict
+import threading
+import time
+import uuid
+from typing import Any, Callable, Tuple, List, Dict, Iterator, Optional
 
 from pathlib import Path
 import pandas as pd
+from pandas.api.types import is_datetime64_dtype
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import scipy.sparse as sp
+from src.models.artifact import read_artifact, write_artifact
+from src.models.catalog import (
+    ItemFragments,
+    UserHistories,
+    compact_news,
+    frame_mb,
+    process_rss_mb,
+)
+from src.models.covisitation import build_covisitation
+from src.models.embeddings import SVDEmbedding
+from src.models.featurization import (
+    build_content,
+    fit_transform_parallel,
+    make_vectorizer,
+)
+from src.models.incremental import (
+    AppendableArray,
+    AppendableCSR,
+    VocabularyDriftTracker,
+)
+from src.models.neighbors import NeighborTable
+from src.models.popularity import DEFAULT_WINDOWS, compute_popularity
+from src.models.profiles import UserProfiles
+from src.models.ranking import Candidates, HybridRanker
+from src.models.recency import (
+    RecencyIndex,
+    decode_cursor,
+    encode_cursor,
+    to_epoch_ms,
+)
+from src.models.streaming import StreamingPopularity
+from src.models.similarity_index import (
+    build_similarity_index,
+    load_similarity_index,
+    top_k_rows,
+)
+from src.utils.cache import TTLCache, build_user_cache
 from src.utils.logger import logger
 from src.utils.config import Config
+from src.utils.metrics import CACHE_REQUESTS, EVENTS_INGESTED, stage_timer
+from src.utils.locks import ReadWriteLock
+from src.utils.serialization import loads, render_object
+
+# Respostas em cache calculadas a partir da popularidade (ver `_cached`)
+_POPULARITY_ENDPOINTS = frozenset({"popular", "popular_candidates", "new_user"})
+
+
+def _reads_state(method):
+    """Executa o método com o lock de leitura do estado do modelo."""
+
+    @functools.wraps(method)
+    def locked(self, *args, **kwargs):
+        with self.state_lock.read():
+            return method(self, *args, **kwargs)
+
+    return locked
+
+
+def _writes_state(method):
+    """Executa o método com o lock de escrita, exclusivo, do estado do modelo."""
+
+    @functools.wraps(method)
+    def locked(self, *args, **kwargs):
+        with self.state_lock.write():
+            return method(self, *args, **kwargs)
+
+    return locked
 
 
 class NewsRecommendationSystem:
+    # Colunas de notícias mantidas no artefato do modelo para servir a API
+    SERVING_COLUMNS = ["page", "title", "url", "date"]
+    # Espaços de itens para a similaridade: TF-IDF esparso ou embeddings SVD densos
+    ENGINES = ("tfidf", "svd")
+
     def __init__(
         self,
         data_dir: str = Config.DATA_DIR,
         max_features: int = 5000,
         decay_factor: float = 0.1,
+        index_type: str = "exact",
+        index_params: Optional[Dict] = None,
+        neighbors_k: int = 0,
+        covisit_k: int = 20,
+        covisit_window: int = 3,
+        popularity_windows: Tuple[str, ...] = DEFAULT_WINDOWS,
+        refit_threshold: float = 0.2,
+        profile_size: int = 20,
+        engine: str = "tfidf",
+        embedding_dim: int = 128,
+        vectorizer_type: str = "tfidf",
+        stop_words: Optional[str] = None,
+        fold_accents: bool = False,
+        n_jobs: int = Config.TRAINING_JOBS,
     ):
+        if engine not in self.ENGINES:
+            raise ValueError(f"Engine de similaridade desconhecido: {engine}")
         self.data_dir = Path(data_dir)
         self.max_features = max_features
         self.decay_factor = decay_factor
-        self.vectorizer = TfidfVectorizer(max_features=self.max_features)
+        self.index_type = index_type
+        self.index_params = index_params or {}
+        self.neighbors_k = neighbors_k
+        self.covisit_k = covisit_k
+        self.covisit_window = covisit_window
+        self.popularity_windows = popularity_windows
+        self.profile_size = profile_size
+        self.engine = engine
+        self.embedding_dim = embedding_dim
+        self.vectorizer_type = vectorizer_type
+        self.stop_words = stop_words
+        self.fold_accents = fold_accents
+        self.n_jobs = n_jobs
+        self.vectorizer = self._new_vectorizer()
         self.news_df = None
         self.user_df = None
         self.tfidf_matrix = None
+        self.embedding = None
+        self.item_vectors = None
         self.popularity_scores = None
+        self.popularity = None
+        self.live_popularity = None
+        self.similarity_index = None
+        self.neighbor_table = None
+        self.covisitation = None
+        self.page_index = None
+        self.recency_index = None
+        self.user_histories = None
+        self.item_fragments = None
+        self.user_profiles = None
+        self.tfidf_buffer = None
+        self.vectors_buffer = None
+        self.drift_tracker = VocabularyDriftTracker(threshold=refit_threshold)
+        self.needs_refit = False
+        self.serving = False
+        self.ranker = HybridRanker()
+        # Consultas leem o estado do modelo em paralelo; add_news o altera sozinho
+        self.state_lock = ReadWriteLock()
+        self._news_lock = threading.Lock()
+        self.model_version = self._new_model_version()
+        self.response_cache = TTLCache(
+            max_entries=Config.CACHE_MAX_ENTRIES, ttl_seconds=Config.CACHE_TTL_SECONDS
+        )
+        self.user_cache = build_user_cache()
+
+    @property
+    def news_df(self) -> Optional[pd.DataFrame]:
+        """Catálogo de notícias, incluindo as adicionadas por `add_news`."""
+        # As notícias novas são concatenadas só na leitura, e não a cada
+        # `add_news`, que assim não copia o catálogo inteiro. Várias leituras
+        # correm em paralelo sob o lock de leitura, então a junção tem o seu
+        # próprio lock
+        with self._news_lock:
+            if self._news_chunks:
+                self._news_df = pd.concat(
+                    [self._news_df, *self._news_chunks], ignore_index=True
+                )
+                self._news_chunks = []
+            return self._news_df
+
+    @news_df.setter
+    def news_df(self, news_df: Optional[pd.DataFrame]) -> None:
+        self._news_df = news_df
+        self._news_chunks = []
+        self._frame_sizes = None
+
+    @property
+    def has_catalog(self) -> bool:
+        """Indica se há um catálogo de notícias carregado."""
+        return self._news_df is not None
+
+    def _news_frames(self) -> List[pd.DataFrame]:
+        """Catálogo e notícias pendentes, sem concatená-los."""
+        # Não depende do `state_lock`: pode ser lido no event loop mesmo com
+        # um `add_news` em andamento
+        with self._news_lock:
+            if self._news_df is None:
+                return []
+            return [self._news_df, *self._news_chunks]
+
+    def catalog_size(self) -> int:
+        """Quantidade de notícias no catálogo, sem concatenar as pendentes."""
+        return sum(len(frame) for frame in self._news_frames())
 
     def load_data(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """Carrega os dados de notícias e usuários."""
@@ -38,12 +207,20 @@ class NewsRecommendationSystem:
         self.user_df = pd.read_parquet(user_path).drop_duplicates(subset=["userId"])
 
         self._handle_missing_data()
-        self.news_df["date"] = pd.to_datetime(
-            self.news_df.get("date", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-        )
+        self.news_df["date"] = self._news_dates(self.news_df)
         logger.info("Dados carregados e validados com sucesso.")
         return self.news_df, self.user_df
 
+    @staticmethod
+    def _news_dates(news_df: pd.DataFrame) -> pd.Series:
+        """Retorna a data de publicação ('date' ou 'issued'), ou agora se ausente."""
+        # Sempre em UTC: misturar datas com e sem fuso deixa a coluna como
+        # `object`, que não é compactada nem salva
+        for column in ("date", "issued"):
+            if column in news_df.columns:
+                return pd.to_datetime(news_df[column], utc=True)
+        return pd.Series(pd.Timestamp.now(tz="UTC"), index=news_df.index)
+
     def _handle_missing_data(self) -> None:
         """Trata dados ausentes nas colunas críticas."""
         logger.info("Tratando dados ausentes...")
@@ -57,139 +234,831 @@ class NewsRecommendationSystem:
         logger.info("Preparando dados...")
         self._create_content_column()
         self._compute_tfidf_matrix()
+        self._compute_item_vectors()
+        self._compute_neighbor_table()
+        self._build_similarity_index()
         self._calculate_popularity_scores()
+        self._build_indexes()
+        self._compute_covisitation()
+        self._build_recency_index()
+        self._build_user_profiles()
+        self._attach_popularity_scores()
+        self._build_live_popularity()
+        self.item_fragments = ItemFragments.from_frame(self.news_df)
+        self._invalidate_cache()
         logger.info("Dados preparados com sucesso.")
 
     def _create_content_column(self) -> None:
         """Cria a coluna 'content' combinando título, corpo e legenda."""
-        self.news_df["content"] = self.news_df.apply(
-            lambda x: f"{x['title']} {x['body']} {x.get('caption', '')}", axis=1
+        self.news_df["content"] = build_content(self.news_df, fold=self.fold_accents)
+
+    def _new_vectorizer(self):
+        """Cria um vetorizador não ajustado com a configuração do modelo."""
+        return make_vectorizer(
+            self.vectorizer_type, self.max_features, stop_words=self.stop_words
         )
 
     def _compute_tfidf_matrix(self) -> None:
         """Calcula a matriz TF-IDF para o conteúdo das notícias."""
         logger.info("Calculando matriz TF-IDF...")
-        self.tfidf_matrix = self.vectorizer.fit_transform(self.news_df["content"])
+        self.vectorizer = self._new_vectorizer()
+        self.tfidf_matrix = fit_transform_parallel(
+            self.vectorizer, self.news_df["content"], n_jobs=self.n_jobs
+        )
+        self.tfidf_buffer = None
+        self.drift_tracker.reset()
+        self.needs_refit = False
+
+    def _compute_item_vectors(self) -> None:
+        """Define os vetores de itens usados na similaridade, conforme o engine."""
+        self.vectors_buffer = None
+        if self.engine == "svd":
+            self.embedding = SVDEmbedding(self.embedding_dim).fit(self.tfidf_matrix)
+            self.item_vectors = self.embedding.transform(self.tfidf_matrix)
+        else:
+            self.item_vectors = self.tfidf_matrix
+
+    def _compute_neighbor_table(self) -> None:
+        """
+        Materializa a tabela com os k vizinhos mais similares de cada notícia.
+
+        A tabela é opcional (`neighbors_k > 0`): o cálculo compara todas as
+        notícias entre si, O(n²), e por isso não é feito com o índice 'ivf',
+        escolhido justamente para catálogos grandes.
+        """
+        self.neighbor_table = None
+        if self.neighbors_k <= 0:
+            return
+        if self.index_type != "exact":
+            logger.info(
+                f"Tabela de vizinhos ignorada com o índice '{self.index_type}'."
+            )
+            return
+        self.neighbor_table = NeighborTable.build(self.item_vectors, self.neighbors_k)
+
+    def _build_similarity_index(self) -> None:
+        """Constrói o índice de similaridade sobre os vetores de itens."""
+        logger.info(f"Construindo índice de similaridade '{self.index_type}'...")
+        self.similarity_index = build_similarity_index(
+            self.index_type, self.item_vectors, **self.index_params
+        )
+
+    def _build_indexes(self) -> None:
+        """Constrói os índices de busca por página e por usuário."""
+        logger.info("Construindo índices de páginas e usuários...")
+        self._build_page_index()
+        self.user_histories = UserHistories.from_strings(
+            self.user_df["userId"], self.user_df["history"], self.page_index
+        )
+
+    def _build_page_index(self) -> None:
+        """Constrói o índice da posição de cada página no catálogo."""
+        self.page_index = {
+            page: position for position, page in enumerate(self.news_df["page"])
+        }
+
+    def _build_recency_index(self) -> None:
+        """Constrói o índice das notícias ordenadas por data de publicação."""
+        if "date" not in self.news_df.columns:
+            self.news_df["date"] = self._news_dates(self.news_df)
+        self.recency_index = RecencyIndex.from_dates(self.news_df["date"])
+
+    def _compute_covisitation(self, n_jobs: Optional[int] = None) -> None:
+        """Calcula a tabela de co-visitação a partir dos históricos de leitura."""
+        self.covisitation = build_covisitation(
+            self.user_histories.indptr,
+            self.user_histories.positions,
+            len(self.news_df),
+            k=self.covisit_k,
+            window=self.covisit_window,
+            n_jobs=self.n_jobs if n_jobs is None else n_jobs,
+        )
+
+    def _get_item_fragments(self) -> ItemFragments:
+        """Retorna os fragmentos JSON das notícias, renderizando-os se necessário."""
+        if self.item_fragments is None:
+            self.item_fragments = ItemFragments.from_frame(self.news_df)
+        return self.item_fragments
+
+    def _get_recency_index(self) -> RecencyIndex:
+        """Retorna o índice de recência, construindo-o se necessário."""
+        if self.recency_index is None:
+            self._build_recency_index()
+        return self.recency_index
+
+    def _build_user_profiles(self) -> None:
+        """Calcula o perfil de conteúdo de cada usuário a partir das últimas leituras."""
+        self.user_profiles = UserProfiles.build(
+            self.user_df["history"],
+            self.page_index,
+            self.item_vectors,
+            self.user_df.get("timestampHistory"),
+            last_n=self.profile_size,
+            decay_factor=self.decay_factor,
+        )
 
     def _calculate_popularity_scores(self) -> None:
-        """Calcula os scores de popularidade das notícias."""
+        """Calcula os scores de popularidade com decaimento temporal por interação."""
         logger.info("Calculando scores de popularidade...")
-        history = self.user_df["history"].str.split(",").explode().str.strip()
-        view_counts = history.value_counts()
-        self.popularity_scores = view_counts.apply(
-            lambda x: x * self._calculate_time_decay(x)
+        self.popularity = compute_popularity(
+            self.user_df["history"],
+            self.user_df.get("timestampHistory"),
+            decay_factor=self.decay_factor,
+            windows=self.popularity_windows,
+        )
+        self.popularity_scores = self.popularity["score"]
+
+    def _attach_popularity_scores(self) -> None:
+        """Adiciona a coluna 'popularity_score' ao DataFrame de notícias."""
+        if self.popularity_scores is None:
+            self.news_df["popularity_score"] = 0.0
+            return
+        self.news_df["popularity_score"] = (
+            self.news_df["page"].map(self.popularity_scores).fillna(0)
         )
-        self.popularity_scores /= self.popularity_scores.max()
+
+    def _build_live_popularity(self) -> None:
+        """Cria os contadores de popularidade em tempo real, iniciados pelo treino."""
+        self.live_popularity = StreamingPopularity(
+            len(self.news_df),
+            half_life_hours=Config.STREAM_HALF_LIFE_HOURS,
+            bucket_seconds=Config.STREAM_BUCKET_SECONDS,
+            n_buckets=Config.STREAM_BUCKETS,
+            sketch_width=Config.STREAM_SKETCH_WIDTH,
+        )
+        # A maior janela de visualizações do treino serve de contagem inicial
+        columns = self.popularity.columns if self.popularity is not None else []
+        views = [column for column in columns if column.startswith("views_")]
+        if views:
+            seed = self.popularity[views[-1]]
+        elif self.popularity_scores is not None:
+            seed = self.popularity_scores
+        else:
+            return
+        self.live_popularity.seed(
+            self.news_df["page"].map(seed).fillna(0).to_numpy(dtype=np.float64)
+        )
+
+    @_reads_state
+    def record_events(
+        self, pages: List[str], timestamps: Optional[List[Optional[float]]] = None
+    ) -> Dict[str, int]:
+        """
+        Registra cliques nos contadores de popularidade em tempo real.
+
+        Args:
+            pages (List[str]): Página de cada clique.
+            timestamps (List[float], opcional): Instante de cada clique, em ms
+                desde a época (como em `timestampHistory`). Por padrão, agora.
+
+        Returns:
+            Dict[str, int]: Cliques em notícias do catálogo e fora dele.
+        """
+        if self.live_popularity is None:
+            raise ValueError(
+                "Popularidade não inicializada. Execute prepare_data primeiro."
+            )
+        positions = np.fromiter(
+            (self.page_index.get(page, -1) for page in pages),
+            dtype=np.int64,
+            count=len(pages),
+        )
+        seconds = (
+            np.array(timestamps, dtype=np.float64) / 1000
+            if timestamps is not None
+            else np.full(len(pages), np.nan)
+        )
+        known = positions >= 0
+        unknown = np.flatnonzero(~known)
+        self.live_popularity.add(
+            positions[known],
+            seconds[known],
+            unknown=[pages[i] for i in unknown],
+            unknown_timestamps=seconds[unknown],
+        )
+        EVENTS_INGESTED.inc(int(known.sum()), catalog="yes")
+        EVENTS_INGESTED.inc(len(unknown), catalog="no")
+        # Os cliques mudam as populares: descarta só as respostas que dependem delas
+        if known.any():
+            self.response_cache.discard(lambda key: key[1] in _POPULARITY_ENDPOINTS)
+        return {"accepted": int(known.sum()), "unknown": len(unknown)}
+
+    def _popularity_array(self) -> np.ndarray:
+        """Retorna o score de popularidade (0 a 1) de cada notícia do catálogo."""
+        if self.live_popularity is not None:
+            # Os contadores são contagens com decaimento; normaliza pelo máximo,
+            # na mesma escala do score do treino
+            scores = self.live_popularity.scores()
+            top = scores.max(initial=0.0)
+            return scores / top if top > 0 else scores
+        if "popularity_score" not in self.news_df.columns:
+            self._attach_popularity_scores()
+        return self.news_df["popularity_score"].to_numpy(dtype=np.float64)
 
     @staticmethod
-    def _calculate_time_decay(date_series: pd.Series) -> pd.Series:
-        """Aplica decaimento temporal aos scores de popularidade."""
-        days_since = (datetime.now() - pd.to_datetime(date_series)).days
-        return 1 / (1 + 0.1 * max(days_since, 0))
+    def _top_positions(scores: np.ndarray, candidates: np.ndarray, k: int):
+        """Retorna as `k` posições de `candidates` com os maiores scores."""
+        k = min(k, candidates.shape[0])
+        if k <= 0:
+            return candidates[:0]
+        top = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        return top[np.argsort(-scores[top], kind="stable")]
+
+    @staticmethod
+    def _new_model_version() -> str:
+        """Gera um identificador para uma versão do modelo."""
+        return uuid.uuid4().hex[:12]
+
+    def _invalidate_cache(self) -> None:
+        """Muda a versão do modelo e descarta os resultados em cache."""
+        self.model_version = self._new_model_version()
+        self.response_cache.clear()
+        self.user_cache.clear()
+
+    def _cached(self, endpoint: str, n: int, compute: Callable[[], Any]) -> Any:
+        """Retorna o resultado em cache para (versão, endpoint, n) ou o calcula."""
+        key = (self.model_version, endpoint, n)
+        result = self.response_cache.get(key)
+        if result is None:
+            CACHE_REQUESTS.inc(cache="response", result="miss")
+            result = compute()
+            self.response_cache.set(key, result)
+        else:
+            CACHE_REQUESTS.inc(cache="response", result="hit")
+        return result
 
     def get_recommendations_for_new_user(self, n: int = 5) -> List[Dict]:
         """Recomenda notícias para novos usuários."""
-        self.news_df["popularity_score"] = (
-            self.news_df["page"].map(self.popularity_scores).fillna(0)
-        )
+        return loads(self.render_recommendations_for_new_user(n))
 
-        # Notícias recentes e populares
-        recent_cutoff = datetime.now() - timedelta(days=2)
-        recent_news = self.news_df[self.news_df["date"] >= recent_cutoff].nlargest(
-            n // 2, "popularity_score"
+    @_reads_state
+    def render_recommendations_for_new_user(self, n: int = 5) -> bytes:
+        """Retorna as recomendações para novos usuários como lista JSON."""
+        return self._cached(
+            "new_user", n, lambda: self._compute_recommendations_for_new_user(n)
         )
-        all_time_news = self.news_df.nlargest(n // 2, "popularity_score")
 
-        recommended_news = (
-            pd.concat([recent_news, all_time_news]).drop_duplicates().head(n)
+    def _compute_recommendations_for_new_user(self, n: int) -> bytes:
+        """Calcula as recomendações de notícias recentes e populares."""
+        scores = self._popularity_array()
+
+        # Notícias recentes e populares: top-k só sobre a janela recente
+        recent = self._get_recency_index().window(self._recent_since())
+        positions = np.concatenate(
+            [
+                self._top_positions(scores, recent, n // 2),
+                self._top_positions(scores, np.arange(scores.shape[0]), n // 2),
+            ]
         )
-        return recommended_news.to_dict(orient="records")
+        positions = pd.unique(positions)[:n]
+
+        with stage_timer("serialization"):
+            return self._get_item_fragments().render(
+                positions, scores[positions], score_key="popularity_score"
+            )
 
     def get_user_recommendations(self, user_id: str, n: int = 5) -> List[Dict]:
         """Recomenda notícias personalizadas para um usuário."""
-        if self.news_df is None or self.user_df is None:
+        return loads(self.render_user_recommendations(user_id, n))
+
+    @_reads_state
+    def render_user_recommendations(self, user_id: str, n: int = 5) -> bytes:
+        """Retorna as recomendações personalizadas do usuário como lista JSON."""
+        if self._news_df is None or self.user_df is None:
             raise ValueError(
                 "Dados não carregados. Execute o método load_data primeiro."
             )
 
-        user = self.user_df[self.user_df["userId"] == user_id]
-        if user.empty or user.iloc[0]["historySize"] == 0:
-            return self.get_recommendations_for_new_user(n)
+        with stage_timer("lookup"):
+            row = self.user_histories.row(user_id)
+            history = self.user_histories.history(row) if row is not None else []
+        if not len(history):
+            return self.render_recommendations_for_new_user(n)
+
+        # A chave muda quando o usuário lê algo novo ou quando o modelo é trocado
+        cache_key = f"{self.model_version}:{user_id}:{n}:{len(history)}-{history[-1]}"
+        cached = self.user_cache.get_payload(cache_key)
+        if cached is not None:
+            CACHE_REQUESTS.inc(cache="user", result="hit")
+            return cached
+        CACHE_REQUESTS.inc(cache="user", result="miss")
+
+        payload = self._rank_user(row, history, n)
+        self.user_cache.set_payload(cache_key, payload)
+        return payload
+
+    def _rank_user(
+        self,
+        row: int,
+        history: np.ndarray,
+        n: int,
+        content: Optional[Candidates] = None,
+    ) -> bytes:
+        """
+        Funde os candidatos dos retrievers e renderiza as `n` melhores notícias.
+
+        Args:
+            row (int): Linha do usuário.
+            history (np.ndarray): Posições já lidas, excluídas do ranking.
+            n (int): Quantidade de recomendações.
+            content (Candidates, opcional): Candidatos de conteúdo já
+                calculados (no lote, com um produto de matrizes por bloco).
+        """
+        # Os retrievers buscam candidatos extras para compensar os já lidos
+        k = max(Config.RANK_CANDIDATES, n)
+        with stage_timer("retrieval"):
+            candidates = {
+                "content": (
+                    self._retrieve_content(row, k) if content is None else content
+                ),
+                "similar": self._retrieve_similar(history, k),
+                "covisit": self._retrieve_covisited(history, k),
+                "popular": self._retrieve_popular(k + len(history)),
+                "recent": self._retrieve_recent(k + len(history)),
+            }
+        with stage_timer("ranking"):
+            positions, scores = self.ranker.rank(
+                candidates,
+                n,
+                exclude=history,
+                published=self._get_recency_index().published,
+            )
+        with stage_timer("serialization"):
+            return self._get_item_fragments().render(positions, scores)
+
+    def _retrieve_content(self, row: int, k: int) -> Candidates:
+        """Candidatos similares ao perfil do usuário, exceto os já lidos."""
+        if self.user_profiles is None or not self.user_profiles.has_profile(row):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        vector, read = self.user_profiles.vector(row), self.user_profiles.read(row)
+        return self.similarity_index.query(vector, k, exclude=read)
+
+    def _retrieve_similar(self, history: np.ndarray, k: int) -> Candidates:
+        """Candidatos vizinhos de conteúdo das últimas leituras do usuário."""
+        return self._aggregate_recent(self.neighbor_table, history, k)
 
-        history = user.iloc[0]["history"].split(",")
-        last_article = history[-1]
-        content_recs = self._get_content_based_recommendations(last_article, n)
-        popular_recs = self._get_popular_recommendations(n)
-        return sorted(
-            content_recs + popular_recs, key=lambda x: x["score"], reverse=True
-        )[:n]
+    def _retrieve_covisited(self, history: np.ndarray, k: int) -> Candidates:
+        """Candidatos lidos junto com as últimas leituras do usuário."""
+        return self._aggregate_recent(self.covisitation, history, k)
 
-    def _get_content_based_recommendations(
-        self, article_id: str, n: int = 5
+    def _aggregate_recent(
+        self, table: Optional[NeighborTable], history: np.ndarray, k: int
+    ) -> Candidates:
+        """Soma os vizinhos, na tabela, das últimas leituras do usuário."""
+        if table is None:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        # Notícias adicionadas depois da tabela ainda não têm vizinhos nela
+        recent = history[-self.profile_size :]
+        recent = recent[recent < len(table)]
+        # A leitura mais recente pesa 1, a anterior 1/2, e assim por diante
+        weights = 1.0 / np.arange(recent.shape[0], 0, -1)
+        return table.aggregate(recent, weights, k + len(history))
+
+    def _retrieve_popular(self, k: int) -> Candidates:
+        """Candidatos mais populares, pelos contadores em tempo real."""
+
+        def compute() -> Candidates:
+            scores = self._popularity_array()
+            positions = self._top_positions(scores, np.arange(scores.shape[0]), k)
+            return positions, scores[positions]
+
+        return self._cached("popular_candidates", k, compute)
+
+    def _retrieve_recent(self, k: int) -> Candidates:
+        """Candidatos mais recentes da janela, pontuados pelo decaimento da idade."""
+
+        def compute() -> Candidates:
+            now_ms = time.time() * 1000
+            positions, published = self._get_recency_index().newest(
+                k, since=self._recent_since()
+            )
+            return positions, self.ranker.decay(published, now_ms)
+
+        return self._cached("recent_candidates", k, compute)
+
+    def _news_records(
+        self, positions: np.ndarray, scores: Optional[np.ndarray] = None
     ) -> List[Dict]:
-        """Recomenda notícias baseadas em similaridade de conteúdo."""
-        try:
-            idx = self.news_df[self.news_df["page"] == article_id].index[0]
-            similarities = cosine_similarity(
-                self.tfidf_matrix[idx], self.tfidf_matrix
-            ).flatten()
-            similar_indices = similarities.argsort()[-n - 1 : -1][::-1]
-            return self.news_df.iloc[similar_indices][["page", "title", "url"]].to_dict(
-                orient="records"
-            )
-        except Exception as e:
-            logger.error(f"Erro ao buscar recomendações baseadas em conteúdo: {e}")
-            return []
+        """Monta os dicionários de resposta apenas para as notícias selecionadas."""
+        news = self.news_df[["page", "title", "url"]].take(positions)
+        if scores is not None:
+            news = news.assign(score=np.asarray(scores, dtype=float))
+        return news.to_dict(orient="records")
+
+    def batch_block_size(self, max_block_bytes: int = 256 * 1024**2) -> int:
+        """Retorna quantos usuários cabem em um bloco do cálculo em lote."""
+        if self._news_df is None or self.user_df is None:
+            raise ValueError(
+                "Dados não carregados. Execute o método load_data primeiro."
+            )
+        return max(1, max_block_bytes // max(self.item_vectors.shape[0] * 4, 1))
+
+    def get_batch_recommendations(
+        self, user_ids: List[str], n: int = 5, max_block_bytes: int = 256 * 1024**2
+    ) -> Iterator[Dict]:
+        """
+        Recomenda notícias para vários usuários, um bloco por vez.
+
+        O ranking é o mesmo de `get_user_recommendations` (candidatos dos
+        retrievers fundidos pelo `HybridRanker`); só os candidatos de conteúdo
+        de um bloco inteiro são calculados juntos, com um único produto de
+        matrizes esparsas seguido de um top-k por linha. Os resultados são
+        gerados sob demanda, de modo que o lote inteiro nunca fica em memória.
+
+        Args:
+            user_ids (List[str]): IDs dos usuários.
+            n (int): Número de recomendações por usuário.
+            max_block_bytes (int): Limite de memória da matriz de scores de um bloco.
+
+        Returns:
+            Iterator[Dict]: Um dicionário com 'user_id' e 'recommendations'
+            por usuário.
+        """
+        block_size = self.batch_block_size(max_block_bytes)
+        return (
+            result
+            for begin in range(0, len(user_ids), block_size)
+            for result in self.recommend_block(user_ids[begin : begin + block_size], n)
+        )
+
+    def recommend_block(self, user_ids: List[str], n: int = 5) -> List[Dict]:
+        """Recomenda notícias para um bloco de usuários (ver `batch_block_size`)."""
+        return [
+            {"user_id": user_id, "recommendations": loads(payload)}
+            for user_id, payload in zip(user_ids, self._rank_block(user_ids, n))
+        ]
+
+    def render_batch_block(self, user_ids: List[str], n: int = 5) -> bytes:
+        """Retorna as recomendações de um bloco de usuários em NDJSON."""
+        return b"".join(
+            render_object({"user_id": user_id, "recommendations": payload}) + b"\n"
+            for user_id, payload in zip(user_ids, self._rank_block(user_ids, n))
+        )
+
+    @_reads_state
+    def _rank_block(self, user_ids: List[str], n: int) -> List[bytes]:
+        """Retorna a lista JSON de recomendações de cada usuário do bloco."""
+        with stage_timer("lookup"):
+            rows = self.user_histories.rows(user_ids)
+        content = self._retrieve_content_block(rows, max(Config.RANK_CANDIDATES, n))
+
+        payloads = []
+        for row, candidates in zip(rows, content):
+            history = self.user_histories.history(row) if row >= 0 else []
+            if not len(history):
+                payloads.append(self.render_recommendations_for_new_user(n))
+            else:
+                payloads.append(self._rank_user(row, history, n, candidates))
+        return payloads
+
+    def _retrieve_content_block(self, rows: np.ndarray, k: int) -> List[Candidates]:
+        """Candidatos de conteúdo de vários usuários, com um produto de matrizes."""
+        empty = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        content = [empty] * len(rows)
+        profiles = self.user_profiles
+        if profiles is None:
+            return content
+        has_profile = rows >= 0
+        has_profile[has_profile] = profiles.has_profile(rows[has_profile])
+        known = np.flatnonzero(has_profile)
+        if not known.size:
+            return content
+
+        with stage_timer("similarity"):
+            scores = profiles.vectors[rows[known]] @ self.item_vectors.T
+            scores = np.asarray(
+                scores.toarray() if sp.issparse(scores) else scores, dtype=np.float32
+            )
+            read = [profiles.read(row) for row in rows[known]]
+            read_rows = np.repeat(np.arange(known.size), [len(r) for r in read])
+            scores[read_rows, np.concatenate(read)] = -np.inf
+            top_positions, top_scores = top_k_rows(scores, k)
+        valid = np.isfinite(top_scores)
+        for i, position in enumerate(known):
+            content[position] = top_positions[i, valid[i]], top_scores[i, valid[i]]
+        return content
+
+    @_reads_state
+    def _get_profile_recommendations(self, user_id: str, n: int = 5) -> List[Dict]:
+        """Recomenda notícias similares ao perfil do usuário, exceto as já lidas."""
+        with stage_timer("lookup"):
+            row = self.user_histories.row(user_id)
+            if row is None or not self.user_profiles.has_profile(row):
+                return []
+            vector, read = self.user_profiles.vector(row), self.user_profiles.read(row)
+        with stage_timer("similarity"):
+            positions, scores = self.similarity_index.query(vector, n, exclude=read)
+        with stage_timer("serialization"):
+            return self._news_records(positions, scores)
 
     def get_popular_recommendations(self, n: int = 5) -> List[Dict]:
         """Recomenda notícias populares."""
+        return loads(self.render_popular_recommendations(n))
+
+    @_reads_state
+    def render_popular_recommendations(self, n: int = 5) -> bytes:
+        """Retorna as notícias populares como lista JSON."""
         if self.popularity_scores is None:
             raise ValueError(
                 "Scores de popularidade não calculados. Execute prepare_data primeiro."
             )
 
-        # Adiciona a coluna 'popularity_score' ao DataFrame, se ainda não existir
-        if "popularity_score" not in self.news_df.columns:
-            self.news_df["popularity_score"] = (
-                self.news_df["page"].map(self.popularity_scores).fillna(0)
+        return self._cached("popular", n, lambda: self._compute_popular(n))
+
+    def _compute_popular(self, n: int) -> bytes:
+        """Calcula as n notícias mais populares."""
+        with stage_timer("ranking"):
+            if self.live_popularity is not None:
+                positions, _ = self.live_popularity.top(n)
+            else:
+                scores = self._popularity_array()
+                positions = self._top_positions(scores, np.arange(scores.shape[0]), n)
+        with stage_timer("serialization"):
+            return self._get_item_fragments().render(positions)
+
+    @_reads_state
+    def save_model(self, path: Optional[Path] = None) -> None:
+        """Salva o modelo no formato em diretório (arrays .npy, Parquet e manifesto)."""
+        model_path = (
+            Path(path) if path else self.data_dir / "models/recommendation_model"
+        )
+        logger.info(f"Salvando modelo em {model_path}...")
+
+        arrays = {
+            "tfidf_data": self.tfidf_matrix.data,
+            "tfidf_indices": self.tfidf_matrix.indices,
+            "tfidf_indptr": self.tfidf_matrix.indptr,
+        }
+        if self.neighbor_table is not None:
+            arrays["neighbor_indices"] = self.neighbor_table.indices
+            arrays["neighbor_scores"] = self.neighbor_table.scores
+        if self.covisitation is not None:
+            arrays["covisit_indices"] = self.covisitation.indices
+            arrays["covisit_scores"] = self.covisitation.scores
+        arrays.update(
+            (f"index_{name}", array)
+            for name, array in self.similarity_index.get_arrays().items()
+        )
+        if self.engine == "svd":
+            arrays["item_vectors"] = self.item_vectors
+            arrays.update(
+                (f"embedding_{name}", array)
+                for name, array in self.embedding.get_arrays().items()
             )
+        if self.user_profiles is not None:
+            arrays.update(
+                (f"profile_{name}", array)
+                for name, array in self.user_profiles.get_arrays().items()
+            )
+        arrays.update(
+            (f"history_{name}", array)
+            for name, array in self.user_histories.get_arrays().items()
+        )
 
-        # Retorna as n notícias mais populares
-        return self.news_df.nlargest(n, "popularity_score")[
-            ["page", "title", "url"]
-        ].to_dict(orient="records")
+        news_columns = [c for c in self.SERVING_COLUMNS if c in self.news_df.columns]
+        tables = {
+            "news": self.news_df[news_columns],
+            "users": self.user_df[["userId"]],
+            "popularity": self._popularity_table(),
+        }
+        if hasattr(self.vectorizer, "vocabulary_"):
+            vocabulary = self.vectorizer.vocabulary_
+            tables["vocabulary"] = pd.DataFrame(
+                {"term": list(vocabulary), "column": list(vocabulary.values())}
+            )
+        if hasattr(self.vectorizer, "idf_"):
+            arrays["idf"] = self.vectorizer.idf_
 
-    def save_model(self) -> None:
-        """Salva o modelo no caminho especificado."""
-        model_path = self.data_dir / "models/recommendation_model.pkl"
-        model_path.parent.mkdir(parents=True, exist_ok=True)
+        metadata = {
+            "max_features": self.max_features,
+            "decay_factor": self.decay_factor,
+            "neighbors_k": self.neighbors_k,
+            "covisit_k": self.covisit_k,
+            "covisit_window": self.covisit_window,
+            "profile_size": self.profile_size,
+            "engine": self.engine,
+            "featurization": {
+                "vectorizer_type": self.vectorizer_type,
+                "stop_words": self.stop_words,
+                "fold_accents": self.fold_accents,
+            },
+            "model_version": self.model_version,
+            "tfidf_shape": list(self.tfidf_matrix.shape),
+            "similarity_index": self.similarity_index.get_params(),
+        }
+        if self.embedding is not None:
+            metadata["embedding"] = self.embedding.get_params()
+        write_artifact(model_path, arrays, tables, metadata)
+        logger.info("Modelo salvo com sucesso.")
 
-        logger.info(f"Salvando modelo em {model_path}...")
-        with open(model_path, "wb") as f:
-            pickle.dump(
+    def _popularity_table(self) -> pd.DataFrame:
+        """Retorna a popularidade como tabela com a coluna 'page'."""
+        popularity = self.popularity
+        if popularity is None:
+            popularity = self.popularity_scores.rename("score").to_frame()
+        popularity = popularity.reset_index(names="page")
+        popularity["page"] = popularity["page"].astype(str)
+        return popularity
+
+    @classmethod
+    def load_model(cls, path: str, mmap_mode: Optional[str] = "r"):
+        """Carrega o modelo salvo, mapeando os arrays em memória."""
+        if not Path(path).is_dir():
+            return cls._load_pickle_model(path)
+
+        arrays, tables, metadata = read_artifact(Path(path), mmap_mode=mmap_mode)
+        instance = cls(
+            data_dir="",
+            max_features=metadata["max_features"],
+            decay_factor=metadata["decay_factor"],
+            index_type=metadata["similarity_index"]["kind"],
+            neighbors_k=metadata["neighbors_k"],
+            covisit_k=metadata.get("covisit_k", 20),
+            covisit_window=metadata.get("covisit_window", 3),
+            profile_size=metadata.get("profile_size", 20),
+            engine=metadata.get("engine", "tfidf"),
+            **metadata.get("featurization", {}),
+        )
+        instance.news_df = tables["news"]
+        instance.user_df = tables["users"]
+        instance.popularity = tables["popularity"].set_index("page")
+        instance.popularity_scores = instance.popularity["score"]
+        instance.model_version = metadata.get("model_version", instance.model_version)
+        instance.tfidf_matrix = sp.csr_matrix(
+            (arrays["tfidf_data"], arrays["tfidf_indices"], arrays["tfidf_indptr"]),
+            shape=tuple(metadata["tfidf_shape"]),
+        )
+        if instance.engine == "svd":
+            instance.embedding = SVDEmbedding.from_arrays(
                 {
-                    "news_df": self.news_df,
-                    "user_df": self.user_df,
-                    "tfidf_matrix": self.tfidf_matrix,
-                    "popularity_scores": self.popularity_scores,
+                    name[len("embedding_") :]: array
+                    for name, array in arrays.items()
+                    if name.startswith("embedding_")
                 },
-                f,
+                **metadata["embedding"],
             )
-        logger.info("Modelo salvo com sucesso.")
+            instance.embedding_dim = instance.embedding.n_components
+            instance.item_vectors = arrays["item_vectors"]
+        else:
+            instance.item_vectors = instance.tfidf_matrix
+        if "vocabulary" in tables:
+            vocabulary = tables["vocabulary"]
+            instance.vectorizer.set_params(
+                vocabulary=dict(zip(vocabulary["term"], vocabulary["column"]))
+            )
+        if "idf" in arrays:
+            instance.vectorizer.idf_ = np.asarray(arrays["idf"])
+        if "neighbor_indices" in arrays:
+            instance.neighbor_table = NeighborTable(
+                arrays["neighbor_indices"], arrays["neighbor_scores"]
+            )
+        if "covisit_indices" in arrays:
+            instance.covisitation = NeighborTable(
+                arrays["covisit_indices"], arrays["covisit_scores"]
+            )
+        instance.similarity_index = load_similarity_index(
+            metadata["similarity_index"],
+            {
+                name[len("index_") :]: array
+                for name, array in arrays.items()
+                if name.startswith("index_")
+            },
+            instance.item_vectors,
+        )
+        if "history_indptr" in arrays:
+            instance._build_page_index()
+            instance.user_histories = UserHistories.from_arrays(
+                instance.user_df["userId"],
+                {
+                    name[len("history_") :]: array
+                    for name, array in arrays.items()
+                    if name.startswith("history_")
+                },
+            )
+        else:
+            # Artefatos antigos guardam os históricos como strings
+            instance._build_indexes()
+        profile_arrays = {
+            name[len("profile_") :]: array
+            for name, array in arrays.items()
+            if name.startswith("profile_")
+        }
+        if profile_arrays:
+            instance.user_profiles = UserProfiles.from_arrays(
+                profile_arrays, instance.item_vectors.shape[1]
+            )
+        else:
+            instance._build_user_profiles()
+        instance._build_recency_index()
+        instance._attach_popularity_scores()
+        instance._build_live_popularity()
+        instance.compact()
+        return instance
 
     @classmethod
-    def load_model(cls, path: str):
-        """Carrega o modelo salvo."""
+    def _load_pickle_model(cls, path: str):
+        """Carrega um modelo salvo no formato pickle antigo."""
         with open(path, "rb") as f:
             data = pickle.load(f)
             instance = cls(data_dir="")
             instance.news_df = data["news_df"]
             instance.user_df = data["user_df"]
             instance.tfidf_matrix = data["tfidf_matrix"]
+            instance.item_vectors = instance.tfidf_matrix
             instance.popularity_scores = data["popularity_scores"]
+            if "vectorizer" in data:
+                instance.vectorizer = data["vectorizer"]
+            if "neighbor_table" in data:
+                instance.neighbor_table = NeighborTable(
+                    data["neighbor_table"]["indices"], data["neighbor_table"]["scores"]
+                )
+                instance.neighbors_k = instance.neighbor_table.k
+            if "similarity_index" in data:
+                instance.index_type = data["similarity_index"]["params"]["kind"]
+                instance.similarity_index = load_similarity_index(
+                    data["similarity_index"]["params"],
+                    data["similarity_index"]["arrays"],
+                    instance.item_vectors,
+                )
+            else:
+                instance._build_similarity_index()
+            instance._build_indexes()
+            # Carregado no processo que serve a API: sem criar processos
+            instance._compute_covisitation(n_jobs=1)
+            instance._build_user_profiles()
+            instance._build_recency_index()
+            instance._attach_popularity_scores()
+            instance._build_live_popularity()
+            instance.compact()
             return instance
 
-    def train_model(self) -> None:
+    def compact(self) -> Dict[str, Dict[str, float]]:
+        """
+        Reduz os dados em memória ao necessário para servir recomendações.
+
+        Mantém apenas as colunas servidas das notícias, em tipos compactos, e
+        descarta o texto completo e os históricos em string dos usuários, já
+        representados por `user_histories` e `user_profiles`. Depois disso o
+        vocabulário não pode mais ser reajustado em memória.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Uso de memória antes e depois.
+        """
+        before = self.memory_usage()
+        self.news_df = compact_news(
+            self.news_df, self.SERVING_COLUMNS + ["popularity_score"]
+        )
+        self.user_df = self.user_df[["userId"]].astype({"userId": "string[pyarrow]"})
+        self.item_fragments = ItemFragments.from_frame(self.news_df)
+        self.serving = True
+        gc.collect()
+        # O catálogo servido só muda por `add_news`, que soma as notícias
+        # novas: o `/health` não precisa medir os DataFrames a cada chamada
+        self._frame_sizes = self._measure_frames()
+        after = self.memory_usage()
+        logger.info(
+            f"Catálogo compactado no processo {after['pid']}: "
+            f"{before['catalog_mb']:.1f} MB -> {after['catalog_mb']:.1f} MB "
+            f"(RSS {after['rss_mb'] or 0:.1f} MB)"
+        )
+        return {"before": before, "after": after}
+
+    def _measure_frames(self) -> Dict[str, float]:
+        """Mede a memória dos DataFrames de notícias e usuários, em MB."""
+        return {
+            "news_mb": sum(frame_mb(frame) for frame in self._news_frames()),
+            "users_mb": frame_mb(self.user_df),
+        }
+
+    def memory_usage(self) -> Dict[str, float]:
+        """
+        Retorna a memória ocupada pelo catálogo e pelo processo, em MB.
+
+        Lê uma cópia das referências em vez de tomar o `state_lock`, pois é
+        chamado pelo `/health` no event loop, que não pode esperar um
+        `add_news` em andamento. Depois de `compact` os tamanhos dos
+        DataFrames vêm do cache e só a memória residente é medida.
+        """
+        frame_sizes = self._frame_sizes or self._measure_frames()
+        user_histories, item_fragments = self.user_histories, self.item_fragments
+        news_mb, users_mb = frame_sizes["news_mb"], frame_sizes["users_mb"]
+        histories_mb = (
+            user_histories.nbytes / 1024**2 if user_histories is not None else 0.0
+        )
+        fragments_mb = (
+            item_fragments.nbytes / 1024**2 if item_fragments is not None else 0.0
+        )
+        return {
+            "pid": os.getpid(),
+            "news_mb": news_mb,
+            "users_mb": users_mb,
+            "histories_mb": histories_mb,
+            "fragments_mb": fragments_mb,
+            "catalog_mb": news_mb + users_mb + histories_mb + fragments_mb,
+            "rss_mb": process_rss_mb(),
+        }
+
+    def train_model(self, path: Optional[Path] = None) -> None:
         """Treina o modelo a partir dos dados atuais."""
 
         logger.info("Inicializando o sistema de recomendação...")
@@ -199,17 +1068,213 @@ class NewsRecommendationSystem:
         self.prepare_data()
 
         logger.info("Salvando o modelo...")
-        self.save_model()
+        self.save_model(path)
+
+    @_writes_state
+    def add_news(self, news: List[Dict]) -> Dict:
+        """
+        Adiciona novas notícias ao sistema, tornando-as recomendáveis imediatamente.
+
+        As notícias são vetorizadas com o vocabulário já ajustado e anexadas à
+        matriz TF-IDF, ao índice de similaridade e, se houver, à tabela de
+        vizinhos. O vocabulário só é reajustado quando a fração de termos
+        desconhecidos nas notícias novas ultrapassa o limite configurado.
+        Páginas já presentes no catálogo são ignoradas, de modo que reenviar
+        o mesmo lote não duplica notícias.
+
+        Args:
+            news (List[Dict]): Notícias com 'page', 'title', 'body', 'caption',
+                'url' e, opcionalmente, 'date'.
+
+        Returns:
+            Dict: Quantidades adicionada e ignorada, se houve reajuste do
+            vocabulário, sua deriva e se o modelo precisa ser retreinado.
+        """
+        new_news_df = pd.DataFrame(news).drop_duplicates("page")
+        new_news_df = new_news_df[~self._known_pages(new_news_df["page"])]
+        new_news_df = new_news_df.reset_index(drop=True)
+        skipped = len(news) - len(new_news_df)
+        if new_news_df.empty:
+            return {
+                "added": 0,
+                "skipped": skipped,
+                "refit": False,
+                **self.vocabulary_status(),
+            }
+
+        dates = self._news_dates(new_news_df)
+        columns = self._news_df.columns
+        if "date" in columns and is_datetime64_dtype(self._news_df["date"]):
+            # Catálogo salvo com datas sem fuso (em UTC): mantém o mesmo tipo
+            dates = dates.dt.tz_convert(None)
+        new_news_df["date"] = dates
+        content = build_content(new_news_df, fold=self.fold_accents)
+        if "content" in columns:
+            new_news_df["content"] = content
+        if "popularity_score" in columns:
+            new_news_df["popularity_score"] = (
+                new_news_df["page"].map(self.popularity_scores).fillna(0)
+            )
+
+        if self.serving:
+            new_news_df = compact_news(new_news_df, columns)
+
+        offset = self.catalog_size()
+        self._news_chunks.append(new_news_df)
+        if self.page_index is not None:
+            self.page_index.update(
+                (page, offset + position)
+                for position, page in enumerate(new_news_df["page"])
+            )
+        if self.recency_index is not None:
+            self.recency_index.append(to_epoch_ms(new_news_df["date"]))
+        if self.item_fragments is not None:
+            self.item_fragments.append(new_news_df)
+        if self.live_popularity is not None:
+            self.live_popularity.resize(offset + len(new_news_df))
+        if self._frame_sizes is not None:
+            self._frame_sizes = {
+                **self._frame_sizes,
+                "news_mb": self._frame_sizes["news_mb"] + frame_mb(new_news_df),
+            }
+
+        refit = False
+        if self.tfidf_matrix is not None and hasattr(self.vectorizer, "idf_"):
+            refit = self._index_new_news(content)
+        self._invalidate_cache()
+        return {
+            "added": len(new_news_df),
+            "skipped": skipped,
+            "refit": refit,
+            **self.vocabulary_status(),
+        }
 
-    def add_news(self, news: List[Dict]) -> None:
-        """Adiciona novas notícias ao sistema."""
-        new_news_df = pd.DataFrame(news)
-        self.news_df = pd.concat([self.news_df, new_news_df], ignore_index=True)
+    def _known_pages(self, pages: pd.Series) -> np.ndarray:
+        """Indica quais páginas já estão no catálogo."""
+        if self.page_index is not None:
+            return pages.map(self.page_index.__contains__).to_numpy(dtype=bool)
+        catalog = [frame["page"] for frame in self._news_frames()]
+        return pages.isin(pd.concat(catalog) if catalog else []).to_numpy()
+
+    def vocabulary_status(self) -> Dict[str, Any]:
+        """
+        Retorna a deriva do vocabulário e se o modelo precisa ser retreinado.
+
+        `needs_refit` indica que a deriva passou do limite em um modelo
+        compactado, sem o texto completo para reajustar o TF-IDF em memória.
+        """
+        return {
+            "vocabulary_drift": self.drift_tracker.drift,
+            "needs_refit": self.needs_refit,
+        }
+
+    def _index_new_news(self, content: pd.Series) -> bool:
+        """Vetoriza as notícias novas e atualiza índice e tabela de vizinhos."""
+        new_rows = self.vectorizer.transform(content)
+        if self.tfidf_buffer is None:
+            self.tfidf_buffer = AppendableCSR(self.tfidf_matrix)
+        self.tfidf_matrix = self.tfidf_buffer.append(new_rows)
+        if self.engine == "svd":
+            if self.vectors_buffer is None:
+                self.vectors_buffer = AppendableArray(self.item_vectors)
+            self.item_vectors = self.vectors_buffer.append(
+                self.embedding.transform(new_rows)
+            )
+        else:
+            self.item_vectors = self.tfidf_matrix
+        if self.similarity_index is not None:
+            self.similarity_index.add(self.item_vectors)
+        if self.neighbor_table is not None:
+            self.neighbor_table.append(self.item_vectors)
+
+        # Com hashing não há vocabulário fixo, então não há deriva a acompanhar
+        if not hasattr(self.vectorizer, "vocabulary_"):
+            return False
+        self.drift_tracker.update(
+            content, self.vectorizer.build_analyzer(), self.vectorizer.vocabulary_
+        )
+        if self.drift_tracker.exceeded:
+            return self._refit_vocabulary()
+        return False
+
+    def _refit_vocabulary(self) -> bool:
+        """Reajusta o TF-IDF e as estruturas derivadas sobre o corpus completo."""
+        logger.info(
+            f"Deriva de vocabulário em {self.drift_tracker.drift:.1%}. "
+            "Reajustando TF-IDF..."
+        )
+        if "content" not in self.news_df.columns:
+            logger.warning(
+                "Texto completo das notícias indisponível. Retreine o modelo."
+            )
+            self.needs_refit = True
+            return False
+
+        self._compute_tfidf_matrix()
+        self._compute_item_vectors()
+        if self.neighbor_table is not None:
+            self._compute_neighbor_table()
+        self._build_similarity_index()
+        if self.user_profiles is not None:
+            self._build_user_profiles()
+        return True
 
     def get_recent_news(self, n: int = 5) -> List[Dict]:
         """Retorna as notícias mais recentes."""
-        recent_cutoff = datetime.now() - timedelta(
-            days=2
-        )  # Notícias dos últimos 2 dias
-        recent_news = self.news_df[self.news_df["date"] >= recent_cutoff].head(n)
-        return recent_news[["page", "title", "url"]].to_dict(orient="records")
+        return self.get_recent_page(n)["news"]
+
+    def get_recent_page(
+        self, n: int = 5, hours: Optional[float] = None, cursor: Optional[str] = None
+    ) -> Dict:
+        """Retorna uma página das notícias recentes e o cursor da próxima."""
+        payload, next_cursor = self.render_recent_page(n, hours, cursor)
+        return {"news": loads(payload), "next_cursor": next_cursor}
+
+    @_reads_state
+    def render_recent_page(
+        self, n: int = 5, hours: Optional[float] = None, cursor: Optional[str] = None
+    ) -> Tuple[bytes, Optional[str]]:
+        """
+        Retorna uma página das notícias recentes, das mais novas às mais antigas.
+
+        Args:
+            n (int): Tamanho da página.
+            hours (float, opcional): Janela, em horas, das notícias consideradas
+                (padrão: `Config.RECENT_WINDOW_HOURS`).
+            cursor (str, opcional): `next_cursor` da página anterior.
+
+        Returns:
+            Tuple[bytes, Optional[str]]: Notícias da página como lista JSON e o
+            cursor da próxima, ou None se não houver mais notícias.
+
+        Raises:
+            ValueError: Se o cursor for inválido.
+        """
+        before = decode_cursor(cursor) if cursor else None
+        return self._cached(
+            f"recent:{hours}:{cursor}",
+            n,
+            lambda: self._compute_recent_page(n, hours, before),
+        )
+
+    def _recent_since(self, hours: Optional[float] = None) -> int:
+        """Retorna o início da janela de notícias recentes, em ms desde a época."""
+        hours = Config.RECENT_WINDOW_HOURS if hours is None else hours
+        return int((time.time() - hours * 3600) * 1000)
+
+    def _compute_recent_page(
+        self, n: int, hours: Optional[float], before: Optional[Tuple[int, int]]
+    ) -> Tuple[bytes, Optional[str]]:
+        """Busca as notícias da janela no índice de recência."""
+        with stage_timer("lookup"):
+            # Uma notícia a mais indica se há próxima página
+            positions, timestamps = self._get_recency_index().newest(
+                n + 1, since=self._recent_since(hours), before=before
+            )
+        next_cursor = None
+        if n > 0 and len(positions) > n:
+            positions, timestamps = positions[:n], timestamps[:n]
+            next_cursor = encode_cursor(timestamps[-1], positions[-1])
+        with stage_timer("serialization"):
+            payload = self._get_item_fragments().render(positions[:n])
+        return payload, next_cursor
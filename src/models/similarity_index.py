@@ -0,0 +1,443 @@
+import argparse
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.decomposition import TruncatedSVD
+from sklearn.preprocessing import normalize
+from src.models.incremental import AppendableArray
+from src.utils.logger import logger
+
+
+def _to_dense(values) -> np.ndarray:
+    """Converte um resultado esparso ou denso em um vetor 1-D."""
+    if sp.issparse(values):
+        values = values.toarray()
+    return np.asarray(values).ravel()
+
+
+def _row_norms(matrix) -> np.ndarray:
+    """Calcula a norma L2 de cada linha da matriz."""
+    if sp.issparse(matrix):
+        squared = np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel()
+    else:
+        squared = np.einsum("ij,ij->i", matrix, matrix)
+    return np.sqrt(squared).astype(np.float32)
+
+
+def top_k(
+    scores: np.ndarray, k: int, exclude: Optional[Iterable[int]] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Seleciona os k maiores scores com argpartition, sem ordenar o vetor inteiro.
+
+    Args:
+        scores (np.ndarray): Scores de todos os candidatos.
+        k (int): Quantidade de resultados.
+        exclude (Iterable[int], opcional): Posições que não podem ser retornadas.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Posições e scores em ordem decrescente.
+    """
+    scores = np.asarray(scores, dtype=np.float32)
+    if exclude is not None:
+        scores = scores.copy()
+        scores[np.fromiter(exclude, dtype=np.int64)] = -np.inf
+    k = min(k, scores.shape[0])
+    if k <= 0:
+        return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    order = np.argsort(-scores[candidates], kind="stable")
+    positions = candidates[order]
+    positions = positions[np.isfinite(scores[positions])]
+    return positions.astype(np.int32), scores[positions]
+
+
+def top_k_rows(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Seleciona os k maiores scores de cada linha, em ordem decrescente."""
+    k = min(k, scores.shape[1])
+    candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    order = np.argsort(-candidate_scores, axis=1, kind="stable")
+    return (
+        np.take_along_axis(candidates, order, axis=1),
+        np.take_along_axis(candidate_scores, order, axis=1),
+    )
+
+
+class SimilarityIndex:
+    """Interface comum dos índices de similaridade entre notícias."""
+
+    kind = None
+
+    def __init__(self):
+        self.matrix = None
+        self.norms = None
+        self._norms_buffer = None
+
+    def fit(self, matrix) -> "SimilarityIndex":
+        """Indexa as linhas da matriz de itens."""
+        raise NotImplementedError
+
+    def add(self, matrix) -> None:
+        """Atualiza o índice para uma matriz com novas linhas ao final."""
+        raise NotImplementedError
+
+    def query(
+        self, vector, k: int, exclude: Optional[Iterable[int]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Retorna as posições e similaridades de cosseno dos k vizinhos."""
+        raise NotImplementedError
+
+    def get_params(self) -> Dict[str, Any]:
+        """Retorna os parâmetros escalares necessários para recriar o índice."""
+        return {"kind": self.kind}
+
+    def get_arrays(self) -> Dict[str, np.ndarray]:
+        """Retorna os arrays que devem ser salvos junto com o modelo."""
+        return {}
+
+    @classmethod
+    def from_arrays(
+        cls, matrix, arrays: Dict[str, np.ndarray], **params
+    ) -> "SimilarityIndex":
+        """Recria o índice a partir dos arrays salvos."""
+        raise NotImplementedError
+
+    def _append_norms(self, rows) -> np.ndarray:
+        """Anexa as normas das linhas novas em O(linhas novas) amortizado."""
+        if self._norms_buffer is None or self._norms_buffer.array is not self.norms:
+            self._norms_buffer = AppendableArray(self.norms)
+        return self._norms_buffer.append(_row_norms(rows))
+
+    def _cosine(self, vector, positions: Optional[np.ndarray] = None) -> np.ndarray:
+        """Calcula a similaridade de cosseno do vetor com as linhas indicadas."""
+        matrix = self.matrix if positions is None else self.matrix[positions]
+        norms = self.norms if positions is None else self.norms[positions]
+        if not sp.issparse(vector):
+            vector = np.asarray(vector, dtype=np.float32).reshape(1, -1)
+        query_norm = float(_row_norms(vector)[0])
+        dots = _to_dense(matrix @ vector.T)
+        denominator = norms * query_norm
+        denominator[denominator == 0] = 1.0
+        return dots / denominator
+
+
+class ExactIndex(SimilarityIndex):
+    """Busca exata por força bruta com seleção top-k via argpartition."""
+
+    kind = "exact"
+
+    def fit(self, matrix) -> "ExactIndex":
+        """Indexa as linhas da matriz de itens."""
+        self.matrix = matrix
+        self.norms = _row_norms(matrix)
+        return self
+
+    def add(self, matrix) -> None:
+        """Atualiza o índice para uma matriz com novas linhas ao final."""
+        start = self.norms.shape[0]
+        self.matrix = matrix
+        self.norms = self._append_norms(matrix[start:])
+
+    def query(
+        self, vector, k: int, exclude: Optional[Iterable[int]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Retorna as posições e similaridades de cosseno dos k vizinhos."""
+        return top_k(self._cosine(vector), k, exclude)
+
+    @classmethod
+    def from_arrays(
+        cls, matrix, arrays: Dict[str, np.ndarray], **params
+    ) -> "ExactIndex":
+        """Recria o índice a partir dos arrays salvos."""
+        return cls().fit(matrix)
+
+
+class IVFIndex(SimilarityIndex):
+    """
+    Índice aproximado do tipo IVF sobre vetores TF-IDF reduzidos por SVD.
+
+    Os itens são agrupados por k-means no espaço reduzido e a consulta visita
+    apenas as `n_probe` listas mais próximas, reordenando os candidatos pela
+    similaridade exata. `n_probe` é o controle de recall/latência.
+
+    Itens adicionados depois do ajuste ficam em uma lista de pendentes,
+    consultada junto com as listas visitadas, e só são incorporados às
+    listas invertidas quando passam de `1 / merge_fraction` do índice. Assim,
+    `add` custa O(itens novos) amortizado.
+    """
+
+    kind = "ivf"
+
+    def __init__(
+        self,
+        n_components: int = 128,
+        n_lists: Optional[int] = None,
+        n_probe: int = 8,
+        random_state: int = 42,
+        merge_fraction: int = 16,
+    ):
+        super().__init__()
+        self.n_components = n_components
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.random_state = random_state
+        self.merge_fraction = merge_fraction
+        self.components = None
+        self.centroids = None
+        self.list_offsets = None
+        self.list_items = None
+        self.pending_items = None
+        self.pending_labels = None
+
+    def _reduce(self, matrix) -> np.ndarray:
+        """Projeta as linhas no espaço reduzido e normaliza."""
+        if not sp.issparse(matrix):
+            # Um vetor denso (ex: perfil do usuário no engine svd) vira uma linha
+            matrix = np.atleast_2d(np.asarray(matrix, dtype=np.float32))
+        if self.components is None:
+            reduced = matrix.toarray() if sp.issparse(matrix) else matrix
+        else:
+            reduced = matrix @ self.components.T
+        return normalize(np.asarray(reduced, dtype=np.float32))
+
+    def fit(self, matrix) -> "IVFIndex":
+        """Agrupa os itens e monta as listas invertidas."""
+        n_items, n_features = matrix.shape
+        self.matrix = matrix
+        self.norms = _row_norms(matrix)
+
+        n_components = min(self.n_components, n_features - 1, n_items - 1)
+        if sp.issparse(matrix) and n_components > 0:
+            svd = TruncatedSVD(
+                n_components=n_components,
+                algorithm="randomized",
+                random_state=self.random_state,
+            )
+            svd.fit(matrix)
+            self.components = svd.components_.astype(np.float32)
+        reduced = self._reduce(matrix)
+
+        n_lists = self.n_lists or int(np.sqrt(n_items))
+        n_lists = int(np.clip(n_lists, 1, n_items))
+        kmeans = MiniBatchKMeans(
+            n_clusters=n_lists, random_state=self.random_state, n_init=3
+        )
+        labels = kmeans.fit_predict(reduced)
+        self.centroids = normalize(kmeans.cluster_centers_.astype(np.float32))
+        self._build_lists(labels)
+        return self
+
+    def _build_lists(
+        self, labels: np.ndarray, items: Optional[np.ndarray] = None
+    ) -> None:
+        """Agrupa as posições dos itens (por padrão, 0..n-1) por lista invertida."""
+        order = np.argsort(labels, kind="stable")
+        self.list_items = (order if items is None else items[order]).astype(np.int32)
+        counts = np.bincount(labels, minlength=self.centroids.shape[0])
+        self.list_offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        self.pending_items = None
+        self.pending_labels = None
+
+    def _assign(self, matrix) -> np.ndarray:
+        """Retorna a lista invertida mais próxima de cada linha."""
+        return np.argmax(self._reduce(matrix) @ self.centroids.T, axis=1)
+
+    def add(self, matrix) -> None:
+        """Atribui as novas linhas às listas invertidas existentes."""
+        start = self.norms.shape[0]
+        new_rows = matrix[start:]
+        if new_rows.shape[0] == 0:
+            return
+        self.matrix = matrix
+        self.norms = self._append_norms(new_rows)
+
+        if self.pending_items is None:
+            self.pending_items = AppendableArray(np.empty(0, dtype=np.int32))
+            self.pending_labels = AppendableArray(np.empty(0, dtype=np.int64))
+        items = self.pending_items.append(
+            np.arange(start, matrix.shape[0], dtype=np.int32)
+        )
+        self.pending_labels.append(self._assign(new_rows))
+        if items.shape[0] * self.merge_fraction > self.list_items.shape[0]:
+            self._merge_pending()
+
+    def _merge_pending(self) -> None:
+        """Incorpora os itens pendentes às listas invertidas."""
+        if self.pending_items is None:
+            return
+        sizes = np.diff(self.list_offsets)
+        labels = np.concatenate(
+            [np.repeat(np.arange(sizes.shape[0]), sizes), self.pending_labels.array]
+        )
+        self._build_lists(
+            labels, np.concatenate([self.list_items, self.pending_items.array])
+        )
+
+    def query(
+        self, vector, k: int, exclude: Optional[Iterable[int]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Retorna as posições e similaridades aproximadas dos k vizinhos."""
+        centroid_scores = _to_dense(self.centroids @ self._reduce(vector).T)
+        n_probe = min(self.n_probe, centroid_scores.shape[0])
+        probes, _ = top_k(centroid_scores, n_probe)
+
+        lists = [
+            self.list_items[self.list_offsets[p] : self.list_offsets[p + 1]]
+            for p in probes
+        ]
+        if self.pending_items is not None:
+            pending = np.isin(self.pending_labels.array, probes)
+            lists.append(self.pending_items.array[pending])
+        candidates = np.concatenate(lists)
+        scores = self._cosine(vector, candidates)
+        if exclude is not None:
+            scores[np.isin(candidates, np.fromiter(exclude, dtype=np.int64))] = -np.inf
+        best, best_scores = top_k(scores, k)
+        return candidates[best], best_scores
+
+    def get_params(self) -> Dict[str, Any]:
+        """Retorna os parâmetros escalares necessários para recriar o índice."""
+        return {
+            "kind": self.kind,
+            "n_components": self.n_components,
+            "n_lists": self.n_lists,
+            "n_probe": self.n_probe,
+            "random_state": self.random_state,
+        }
+
+    def get_arrays(self) -> Dict[str, np.ndarray]:
+        """Retorna os arrays que devem ser salvos junto com o modelo."""
+        self._merge_pending()
+        arrays = {
+            "centroids": self.centroids,
+            "list_offsets": self.list_offsets,
+            "list_items": self.list_items,
+        }
+        if self.components is not None:
+            arrays["components"] = self.components
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, matrix, arrays: Dict[str, np.ndarray], **params) -> "IVFIndex":
+        """Recria o índice a partir dos arrays salvos."""
+        index = cls(**params)
+        index.matrix = matrix
+        index.norms = _row_norms(matrix)
+        index.components = arrays.get("components")
+        index.centroids = arrays["centroids"]
+        index.list_offsets = arrays["list_offsets"]
+        index.list_items = arrays["list_items"]
+        return index
+
+
+INDEX_TYPES = {ExactIndex.kind: ExactIndex, IVFIndex.kind: IVFIndex}
+
+
+def build_similarity_index(kind: str, matrix, **params) -> SimilarityIndex:
+    """
+    Cria e indexa um índice de similaridade do tipo informado.
+
+    Args:
+        kind (str): Tipo do índice ('exact' ou 'ivf').
+        matrix: Matriz de itens (uma linha por notícia).
+        **params: Parâmetros específicos do índice.
+
+    Returns:
+        SimilarityIndex: Índice pronto para consultas.
+    """
+    if kind not in INDEX_TYPES:
+        raise ValueError(f"Tipo de índice desconhecido: {kind}")
+    return INDEX_TYPES[kind](**params).fit(matrix)
+
+
+def load_similarity_index(
+    params: Dict[str, Any], arrays: Dict[str, np.ndarray], matrix
+) -> SimilarityIndex:
+    """Recria um índice salvo a partir dos seus parâmetros e arrays."""
+    params = dict(params)
+    kind = params.pop("kind")
+    if kind not in INDEX_TYPES:
+        raise ValueError(f"Tipo de índice desconhecido: {kind}")
+    return INDEX_TYPES[kind].from_arrays(matrix, arrays, **params)
+
+
+def benchmark_indexes(
+    matrix,
+    indexes: Dict[str, SimilarityIndex],
+    n_queries: int = 200,
+    k: int = 10,
+    random_state: int = 42,
+) -> List[Dict[str, float]]:
+    """
+    Compara recall@k e latência de consulta dos índices contra a busca exata.
+
+    Args:
+        matrix: Matriz de itens indexada.
+        indexes (Dict[str, SimilarityIndex]): Índices a comparar, por nome.
+        n_queries (int): Quantidade de itens usados como consulta.
+        k (int): Quantidade de vizinhos por consulta.
+        random_state (int): Semente para sortear as consultas.
+
+    Returns:
+        List[Dict[str, float]]: Uma linha de resultados por índice.
+    """
+    rng = np.random.default_rng(random_state)
+    queries = rng.choice(matrix.shape[0], min(n_queries, matrix.shape[0]), False)
+    exact = ExactIndex().fit(matrix)
+    truth = [set(exact.query(matrix[q], k, exclude=[q])[0]) for q in queries]
+
+    results = []
+    for name, index in indexes.items():
+        latencies, hits = [], 0
+        for query, expected in zip(queries, truth):
+            start = time.perf_counter()
+            positions, _ = index.query(matrix[query], k, exclude=[query])
+            latencies.append(time.perf_counter() - start)
+            hits += len(expected.intersection(positions))
+        latencies_ms = np.array(latencies) * 1000
+        results.append(
+            {
+                "index": name,
+                "recall": hits / max(sum(len(t) for t in truth), 1),
+                "p50_ms": float(np.percentile(latencies_ms, 50)),
+                "p95_ms": float(np.percentile(latencies_ms, 95)),
+            }
+        )
+    return results
+
+
+if __name__ == "__main__":
+    from src.models.recommender import NewsRecommendationSystem
+
+    parser = argparse.ArgumentParser(
+        description="Compara os índices de similaridade no corpus de notícias."
+    )
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--n-probe", type=int, nargs="+", default=[1, 4, 8, 16])
+    args = parser.parse_args()
+
+    recommender = NewsRecommendationSystem()
+    recommender.load_data()
+    recommender._create_content_column()
+    recommender._compute_tfidf_matrix()
+    tfidf_matrix = recommender.tfidf_matrix
+
+    logger.info("Construindo índices...")
+    ivf = build_similarity_index("ivf", tfidf_matrix)
+    candidates = {"exact": ExactIndex().fit(tfidf_matrix)}
+    for n_probe in args.n_probe:
+        candidates[f"ivf(n_probe={n_probe})"] = load_similarity_index(
+            {**ivf.get_params(), "n_probe": n_probe}, ivf.get_arrays(), tfidf_matrix
+        )
+
+    for row in benchmark_indexes(tfidf_matrix, candidates, args.queries, args.k):
+        logger.info(
+            f"{row['index']}: recall@{args.k}={row['recall']:.3f} "
+            f"p50={row['p50_ms']:.2f}ms p95={row['p95_ms']:.2f}ms"
+        )
@@ -0,0 +1,253 @@
+import heapq
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Expoente máximo do peso dos eventos antes de reescalar os contadores
+_MAX_EXPONENT = 50.0
+
+
+class CountMinSketch:
+    """
+    Contagens aproximadas em memória fixa, com as `k` chaves mais frequentes.
+
+    Cada chave incrementa uma célula em cada uma das `depth` linhas; a
+    estimativa é o mínimo entre as linhas, que nunca subestima a contagem.
+    Um heap com as `k` maiores estimativas acompanha os itens mais
+    frequentes da cauda longa sem guardar uma contagem por chave.
+    """
+
+    def __init__(self, width: int = 2**16, depth: int = 4, k: int = 100, seed=42):
+        rng = np.random.default_rng(seed)
+        self.width = width
+        self.depth = depth
+        self.k = k
+        self.table = np.zeros((depth, width), dtype=np.float64)
+        self._salts = rng.integers(1, 2**61, size=depth, dtype=np.uint64)
+        self._top: Dict[str, float] = {}
+
+    def _columns(self, keys: Sequence[str]) -> np.ndarray:
+        """Retorna a coluna de cada chave em cada linha, shape (depth, len(keys))."""
+        hashes = np.array([hash(key) for key in keys], dtype=np.int64).view(np.uint64)
+        mixed = hashes[None, :] * self._salts[:, None]
+        return ((mixed >> np.uint64(17)) % np.uint64(self.width)).astype(np.int64)
+
+    def add(self, keys: Sequence[str], weights: np.ndarray) -> None:
+        """Soma os pesos das chaves e atualiza as mais frequentes."""
+        if not len(keys):
+            return
+        columns = self._columns(keys)
+        for row in range(self.depth):
+            np.add.at(self.table[row], columns[row], weights)
+
+        unique = list(dict.fromkeys(keys))
+        for key, estimate in zip(unique, self.estimate(unique)):
+            self._top[key] = estimate
+        if len(self._top) > self.k:
+            kept = heapq.nlargest(self.k, self._top.items(), key=lambda item: item[1])
+            self._top = dict(kept)
+
+    def estimate(self, keys: Sequence[str]) -> np.ndarray:
+        """Retorna a contagem estimada de cada chave."""
+        columns = self._columns(keys)
+        return self.table[np.arange(self.depth)[:, None], columns].min(axis=0)
+
+    def scale(self, factor: float) -> None:
+        """Multiplica todas as contagens (usado no decaimento)."""
+        self.table *= factor
+        self._top = {key: value * factor for key, value in self._top.items()}
+
+    def top(self, n: int) -> List[Tuple[str, float]]:
+        """Retorna as `n` chaves com as maiores estimativas."""
+        return heapq.nlargest(n, self._top.items(), key=lambda item: item[1])
+
+
+class StreamingPopularity:
+    """
+    Popularidade atualizada a cada clique, com decaimento e janelas móveis.
+
+    Mantém, por posição de notícia no catálogo:
+
+    - um score com decaimento exponencial (meia-vida `half_life_hours`),
+      atualizado em O(1) por evento. Em vez de decair todos os contadores a
+      cada instante, cada evento soma `exp(λ·(t - t0))`, e o score em `t`
+      é a soma multiplicada por `exp(-λ·(t - t0))`; os contadores são
+      reescalados quando o expoente fica grande;
+    - contagens em um anel de `n_buckets` blocos de `bucket_seconds`, para as
+      visualizações em janelas móveis (última hora, últimas 24 horas...).
+
+    Cliques em páginas fora do catálogo vão, opcionalmente, para um
+    count-min sketch com as páginas mais clicadas, em memória fixa.
+
+    Os contadores são alocados com folga, que dobra quando notícias novas
+    não cabem, então `resize` custa O(notícias novas) amortizado.
+
+    Args:
+        n_items (int): Notícias no catálogo.
+        half_life_hours (float): Meia-vida do score.
+        bucket_seconds (int): Duração de cada bloco do anel.
+        n_buckets (int): Blocos no anel (janela máxima de contagem).
+        sketch_width (int): Largura do count-min sketch; 0 o desativa.
+    """
+
+    def __init__(
+        self,
+        n_items: int,
+        half_life_hours: float = 6.0,
+        bucket_seconds: int = 3600,
+        n_buckets: int = 24,
+        sketch_width: int = 2**16,
+    ):
+        self.rate = np.log(2) / (half_life_hours * 3600)
+        self.bucket_seconds = bucket_seconds
+        self.n_buckets = n_buckets
+        self.landmark = time.time()
+        self._size = n_items
+        self._decayed = np.zeros(n_items, dtype=np.float64)
+        self._buckets = np.zeros((n_buckets, n_items), dtype=np.int32)
+        self.bucket_ids = np.full(n_buckets, -1, dtype=np.int64)
+        self.sketch = CountMinSketch(width=sketch_width) if sketch_width else None
+        self.events = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def decayed(self) -> np.ndarray:
+        """Contadores com decaimento, relativos a `landmark`, por notícia."""
+        return self._decayed[: self._size]
+
+    @property
+    def buckets(self) -> np.ndarray:
+        """Cliques por bloco do anel e por notícia."""
+        return self._buckets[:, : self._size]
+
+    def seed(self, counts: np.ndarray, now: Optional[float] = None) -> None:
+        """Inicia os scores com contagens de eventos anteriores (ex: do treino)."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self.decayed[: len(counts)] = counts * np.exp(
+                self.rate * (now - self.landmark)
+            )
+
+    def resize(self, n_items: int) -> None:
+        """Acomoda notícias adicionadas ao catálogo, com contagens zeradas."""
+        with self._lock:
+            if n_items <= self._size:
+                return
+            capacity = self._decayed.shape[0]
+            if n_items > capacity:
+                # A folga só recebe cliques depois do resize, então fica zerada
+                capacity = max(n_items, 2 * capacity)
+                decayed = np.zeros(capacity, dtype=np.float64)
+                decayed[: self._size] = self.decayed
+                buckets = np.zeros((self.n_buckets, capacity), dtype=np.int32)
+                buckets[:, : self._size] = self.buckets
+                self._decayed, self._buckets = decayed, buckets
+            self._size = n_items
+
+    def add(
+        self,
+        positions: np.ndarray,
+        timestamps: Optional[np.ndarray] = None,
+        unknown: Sequence[str] = (),
+        unknown_timestamps: Optional[np.ndarray] = None,
+    ) -> None:
+        """
+        Registra um lote de cliques.
+
+        Args:
+            positions (np.ndarray): Posição no catálogo da notícia de cada clique.
+            timestamps (np.ndarray, opcional): Instante de cada clique, em
+                segundos desde a época. Por padrão, agora.
+            unknown (Sequence[str]): Páginas clicadas fora do catálogo.
+            unknown_timestamps (np.ndarray, opcional): Instantes dos cliques
+                em `unknown`.
+        """
+        now = time.time()
+        positions = np.asarray(positions, dtype=np.int64)
+        timestamps = self._timestamps(timestamps, len(positions), now)
+        with self._lock:
+            if self.rate * (now - self.landmark) > _MAX_EXPONENT:
+                self._rescale(now)
+            np.add.at(
+                self._decayed,
+                positions,
+                np.exp(self.rate * (timestamps - self.landmark)),
+            )
+            self._add_to_buckets(positions, timestamps)
+            if self.sketch is not None and len(unknown):
+                unknown_timestamps = self._timestamps(
+                    unknown_timestamps, len(unknown), now
+                )
+                self.sketch.add(
+                    list(unknown),
+                    np.exp(self.rate * (unknown_timestamps - self.landmark)),
+                )
+            self.events += len(positions) + len(unknown)
+
+    @staticmethod
+    def _timestamps(timestamps: Optional[np.ndarray], size: int, now: float):
+        """Usa o instante atual para os cliques sem timestamp."""
+        if timestamps is None:
+            return np.full(size, now)
+        # Cliques sem data ou no futuro contam como ocorridos agora
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        return np.where(np.isfinite(timestamps), np.minimum(timestamps, now), now)
+
+    def _rescale(self, now: float) -> None:
+        """Move o instante de referência para `now`, reescalando os contadores."""
+        factor = np.exp(-self.rate * (now - self.landmark))
+        self._decayed *= factor
+        if self.sketch is not None:
+            self.sketch.scale(factor)
+        self.landmark = now
+
+    def _add_to_buckets(self, positions: np.ndarray, timestamps: np.ndarray) -> None:
+        """Soma os cliques aos blocos do anel, reciclando os blocos expirados."""
+        bucket_ids = (timestamps // self.bucket_seconds).astype(np.int64)
+        for bucket_id in np.unique(bucket_ids):
+            slot = bucket_id % self.n_buckets
+            if bucket_id < self.bucket_ids[slot]:
+                continue  # Mais antigo que a janela do anel
+            if bucket_id > self.bucket_ids[slot]:
+                self._buckets[slot] = 0
+                self.bucket_ids[slot] = bucket_id
+            np.add.at(self._buckets[slot], positions[bucket_ids == bucket_id], 1)
+
+    def scores(self, now: Optional[float] = None) -> np.ndarray:
+        """Retorna o score com decaimento de cada notícia no instante `now`."""
+        now = time.time() if now is None else now
+        with self._lock:
+            return self.decayed * np.exp(-self.rate * (now - self.landmark))
+
+    def top(self, n: int, now: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Retorna as posições e os scores das `n` notícias mais populares."""
+        scores = self.scores(now)
+        n = min(n, scores.shape[0])
+        if n <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        top = np.argpartition(-scores, n - 1)[:n]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return top, scores[top]
+
+    def views(self, seconds: float, now: Optional[float] = None) -> np.ndarray:
+        """Conta os cliques de cada notícia nos últimos `seconds` segundos."""
+        now = time.time() if now is None else now
+        current = int(now // self.bucket_seconds)
+        oldest = current - int(np.ceil(seconds / self.bucket_seconds)) + 1
+        with self._lock:
+            slots = np.flatnonzero(
+                (self.bucket_ids >= oldest) & (self.bucket_ids <= current)
+            )
+            return self.buckets[slots].sum(axis=0, dtype=np.int64)
+
+    def top_unknown(self, n: int) -> List[Tuple[str, float]]:
+        """Retorna as páginas fora do catálogo mais clicadas (estimativa)."""
+        if self.sketch is None:
+            return []
+        factor = np.exp(-self.rate * (time.time() - self.landmark))
+        return [(page, score * factor) for page, score in self.sketch.top(n)]
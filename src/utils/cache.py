@@ -0,0 +1,252 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from src.utils.config import Config
+from src.utils.serialization import dumps, loads
+
+
+class TTLCache:
+    """
+    Cache em memória com expiração por tempo (TTL) e descarte LRU.
+
+    Seguro para uso concorrente entre as threads de uma mesma instância da API.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Retorna o valor armazenado, ou None se ausente ou expirado."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Armazena o valor, descartando as entradas usadas há mais tempo."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove todas as entradas."""
+        with self._lock:
+            self._entries.clear()
+
+    def discard(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Remove as entradas cujas chaves satisfazem `predicate`."""
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+
+class CacheBackend:
+    """Interface de um backend de cache compartilhado entre processos."""
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Retorna o valor armazenado, ou None se ausente."""
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        """Armazena o valor por `ttl_seconds` segundos."""
+        raise NotImplementedError
+
+
+class InMemoryBackend(CacheBackend):
+    """
+    Backend em memória do próprio processo, usado em testes e em um único worker.
+
+    Como o cache local, é limitado pelo tamanho em bytes, descartando as
+    entradas usadas há mais tempo.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024**2):
+        self.max_bytes = max_bytes
+        self._values = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Retorna o valor armazenado, ou None se ausente."""
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                self._remove(key)
+                return None
+            self._values.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        """Armazena o valor por `ttl_seconds` segundos."""
+        with self._lock:
+            if key in self._values:
+                self._remove(key)
+            self._values[key] = (time.monotonic() + ttl_seconds, value)
+            self._bytes += len(value)
+            while self._bytes > self.max_bytes and self._values:
+                self._remove(next(iter(self._values)))
+
+    def _remove(self, key: str) -> None:
+        """Remove uma entrada e desconta o seu tamanho."""
+        _, value = self._values.pop(key)
+        self._bytes -= len(value)
+
+
+class RedisBackend(CacheBackend):
+    """Backend Redis, compartilhado entre os workers. Requer o pacote `redis`."""
+
+    def __init__(self, url: str):
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Retorna o valor armazenado, ou None se ausente."""
+        return self._client.get(key)
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        """Armazena o valor por `ttl_seconds` segundos."""
+        self._client.set(key, value, px=int(ttl_seconds * 1000))
+
+
+class UserRecommendationCache:
+    """
+    Cache LRU de recomendações por usuário, limitado pelo tamanho em bytes.
+
+    As entradas são guardadas serializadas em JSON, o que permite medir o
+    consumo de memória e compartilhá-las com um `CacheBackend` opcional: em
+    caso de falta local, o backend é consultado antes de recalcular.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024**2,
+        ttl_seconds: float = 300.0,
+        backend: Optional[CacheBackend] = None,
+    ):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.backend = backend
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Retorna as recomendações em cache, ou None se ausentes ou expiradas."""
+        payload = self.get_payload(key)
+        return loads(payload) if payload is not None else None
+
+    def get_payload(self, key: str) -> Optional[bytes]:
+        """Retorna as recomendações em cache ainda em JSON, sem desserializar."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, payload = entry
+                if expires_at >= time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return payload
+                self._remove(key)
+
+        payload = self.backend.get(key) if self.backend is not None else None
+        with self._lock:
+            if payload is None:
+                self.misses += 1
+                return None
+            self.shared_hits += 1
+            self._store(key, payload)
+        return payload
+
+    def set(self, key: str, value: Any) -> None:
+        """Armazena as recomendações localmente e no backend compartilhado."""
+        self.set_payload(key, dumps(value))
+
+    def set_payload(self, key: str, payload: bytes) -> None:
+        """Armazena recomendações já serializadas em JSON."""
+        with self._lock:
+            self._store(key, payload)
+        if self.backend is not None:
+            self.backend.set(key, payload, self.ttl_seconds)
+
+    def clear(self) -> None:
+        """Remove as entradas locais."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna os contadores de acertos, faltas e descartes."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "backend": type(self.backend).__name__ if self.backend else None,
+            }
+
+    def _store(self, key: str, payload: bytes) -> None:
+        """Guarda a entrada e descarta as menos usadas até caber no limite."""
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, payload)
+        self._bytes += len(payload)
+        while self._bytes > self.max_bytes and self._entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        """Remove uma entrada e desconta o seu tamanho."""
+        _, payload = self._entries.pop(key)
+        self._bytes -= len(payload)
+
+
+@lru_cache(maxsize=None)
+def shared_backend() -> Optional[CacheBackend]:
+    """Retorna o backend compartilhado configurado, criado uma única vez."""
+    if Config.USER_CACHE_BACKEND == "memory":
+        return InMemoryBackend(max_bytes=Config.USER_CACHE_MAX_BYTES)
+    if Config.USER_CACHE_BACKEND == "redis":
+        return RedisBackend(Config.REDIS_URL)
+    return None
+
+
+def build_user_cache() -> UserRecommendationCache:
+    """Cria o cache de recomendações por usuário conforme a configuração."""
+    return UserRecommendationCache(
+        max_bytes=Config.USER_CACHE_MAX_BYTES,
+        ttl_seconds=Config.USER_CACHE_TTL_SECONDS,
+        backend=shared_backend(),
+    )
@@ -8,8 +8,52 @@ class Config:
 
     MODEL_DIR = os.getenv("MODEL_DIR", "data/models")
     DATA_DIR = os.getenv("DATA_DIR", "data")
-    MODEL_PATH = Path(MODEL_DIR) / "recommendation_model.pkl"
+    MODEL_PATH = Path(MODEL_DIR) / "recommendation_model"
+    LEGACY_MODEL_PATH = Path(MODEL_DIR) / "recommendation_model.pkl"
     PORT = int(os.getenv("PORT", 8000))
+    # Processos do servidor multi-worker (python -m src.api.serve)
+    WORKERS = int(os.getenv("WORKERS", os.cpu_count() or 1))
+    # Estado dos treinamentos, compartilhado entre os workers
+    JOBS_DIR = Path(os.getenv("JOBS_DIR", Path(MODEL_DIR) / "jobs"))
     FILE_ID = os.getenv("FILE_ID", "13rvnyK5PJADJQgYe-VbdXb7PpLPj7lPr")
     OUTPUT_ZIP = os.getenv("OUTPUT_ZIP", "data.zip")
     DATA_DIR_TRANSIENT = os.getenv("DATA_DIR_TRANSIENT", "data/transient")
+    # Processos usados na tokenização durante o treinamento
+    TRAINING_JOBS = int(os.getenv("TRAINING_JOBS", os.cpu_count() or 1))
+    CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", 60))
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 1024))
+    USER_CACHE_MAX_BYTES = int(os.getenv("USER_CACHE_MAX_BYTES", 64 * 1024**2))
+    USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", 300))
+    # Backend compartilhado do cache por usuário: "none", "memory" ou "redis"
+    USER_CACHE_BACKEND = os.getenv("USER_CACHE_BACKEND", "none")
+    REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    # Threads, fila e prazo (em segundos) do cálculo de recomendações por worker
+    SCORING_THREADS = int(os.getenv("SCORING_THREADS", min(4, os.cpu_count() or 1)))
+    SCORING_QUEUE = int(os.getenv("SCORING_QUEUE", 64))
+    SCORING_TIMEOUT = float(os.getenv("SCORING_TIMEOUT", 2.0))
+    RETRY_AFTER_SECONDS = int(os.getenv("RETRY_AFTER_SECONDS", 1))
+    # Prazos maiores para os cálculos longos: um bloco do lote e o add-news
+    BATCH_BLOCK_TIMEOUT = float(os.getenv("BATCH_BLOCK_TIMEOUT", 30.0))
+    ADD_NEWS_TIMEOUT = float(os.getenv("ADD_NEWS_TIMEOUT", 60.0))
+    # Popularidade em tempo real (POST /events): meia-vida do score, blocos das
+    # janelas de contagem e largura do sketch das páginas fora do catálogo
+    STREAM_HALF_LIFE_HOURS = float(os.getenv("STREAM_HALF_LIFE_HOURS", 6))
+    STREAM_BUCKET_SECONDS = int(os.getenv("STREAM_BUCKET_SECONDS", 3600))
+    STREAM_BUCKETS = int(os.getenv("STREAM_BUCKETS", 24))
+    STREAM_SKETCH_WIDTH = int(os.getenv("STREAM_SKETCH_WIDTH", 2**16))
+    # Janela padrão, em horas, das notícias recentes (/recent e usuários novos)
+    RECENT_WINDOW_HOURS = float(os.getenv("RECENT_WINDOW_HOURS", 48))
+    # Ranking híbrido de /recommend: pesos dos retrievers, candidatos por
+    # retriever e fator de frescor (meia-vida e piso para notícias antigas)
+    RANK_CONTENT_WEIGHT = float(os.getenv("RANK_CONTENT_WEIGHT", 1.0))
+    # Vizinhos de conteúdo das últimas leituras (só com a tabela de vizinhos)
+    RANK_SIMILAR_WEIGHT = float(os.getenv("RANK_SIMILAR_WEIGHT", 0.5))
+    RANK_COVISIT_WEIGHT = float(os.getenv("RANK_COVISIT_WEIGHT", 0.8))
+    RANK_POPULAR_WEIGHT = float(os.getenv("RANK_POPULAR_WEIGHT", 0.3))
+    RANK_RECENT_WEIGHT = float(os.getenv("RANK_RECENT_WEIGHT", 0.2))
+    RANK_CANDIDATES = int(os.getenv("RANK_CANDIDATES", 100))
+    RANK_HALF_LIFE_HOURS = float(os.getenv("RANK_HALF_LIFE_HOURS", 24))
+    RANK_FRESHNESS_FLOOR = float(os.getenv("RANK_FRESHNESS_FLOOR", 0.5))
+    # Permite executar uma requisição sob o profiler com ?profile=1 (pyinstrument)
+    PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILING_INTERVAL = float(os.getenv("PROFILING_INTERVAL", 0.001))
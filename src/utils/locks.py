@@ -0,0 +1,68 @@
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class ReadWriteLock:
+    """
+    Lock de leitores e escritor: várias leituras simultâneas ou uma escrita.
+
+    Escritores têm preferência: enquanto um deles espera, novas leituras
+    aguardam, para que um fluxo contínuo de leituras não adie a escrita
+    indefinidamente. A leitura é reentrante na mesma thread (uma leitura
+    pode chamar outra sem travar atrás de um escritor em espera), e quem
+    tem a escrita também pode ler.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+        self._local = threading.local()
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        """Mantém o lock de leitura durante o bloco."""
+        depth = getattr(self._local, "depth", 0)
+        if depth or getattr(self._local, "writing", False):
+            self._local.depth = depth + 1
+            try:
+                yield
+            finally:
+                self._local.depth = depth
+            return
+
+        with self._condition:
+            while self._writer or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        self._local.depth = 1
+        try:
+            yield
+        finally:
+            self._local.depth = 0
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        """Mantém o lock de escrita, exclusivo, durante o bloco."""
+        with self._condition:
+            self._waiting_writers += 1
+            try:
+                while self._writer or self._readers:
+                    self._condition.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = True
+        self._local.writing = True
+        try:
+            yield
+        finally:
+            self._local.writing = False
+            with self._condition:
+                self._writer = False
+                self._condition.notify_all()
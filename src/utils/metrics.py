@@ -0,0 +1,257 @@
+# src/utils/metrics.py
+import bisect
+import threading
+import time
+from typing import Dict, List, Sequence, Tuple
+
+# Limites (em segundos) dos histogramas de latência, de 100 µs a 10 s
+LATENCY_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    10.0,
+)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """Formata os rótulos no padrão `{nome="valor",...}` do Prometheus."""
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace("\\", r"\\").replace('"', r"\"")
+        value = value.replace("\n", r"\n")
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    """Formata um valor numérico no texto do Prometheus."""
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """Base das métricas: nome, descrição, rótulos e valores por rótulo."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, description: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def clear(self) -> None:
+        """Remove todos os valores registrados."""
+        with self._lock:
+            self._values.clear()
+
+    def samples(self) -> List[Tuple[str, Tuple[str, ...], Tuple[str, ...], float]]:
+        """Retorna as amostras como (sufixo, rótulos, valores dos rótulos, valor)."""
+        with self._lock:
+            return [("", self.labelnames, key, v) for key, v in self._values.items()]
+
+    def render(self) -> List[str]:
+        """Retorna as linhas da métrica no formato de texto do Prometheus."""
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for suffix, names, values, value in self.samples():
+            lines.append(
+                f"{self.name}{suffix}{_format_labels(names, values)} "
+                f"{_format_value(value)}"
+            )
+        return lines
+
+
+class Counter(_Metric):
+    """Contador monotônico."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """Valor que pode subir e descer."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    """Histograma cumulativo com limites fixos, como o do Prometheus."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, description, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: Dict[Tuple[str, ...], List[int]] = {}
+        self._sums: Dict[Tuple[str, ...], float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        position = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            counts[position] += 1
+            self._sums[key] += value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self._sums.clear()
+
+    def samples(self) -> List[Tuple[str, Tuple[str, ...], Tuple[str, ...], float]]:
+        names = self.labelnames + ("le",)
+        samples = []
+        with self._lock:
+            for key, counts in self._counts.items():
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    bound = "+Inf" if bound == float("inf") else repr(bound)
+                    samples.append(("_bucket", names, key + (bound,), cumulative))
+                samples.append(("_sum", self.labelnames, key, self._sums[key]))
+                samples.append(("_count", self.labelnames, key, cumulative))
+        return samples
+
+
+class MetricsRegistry:
+    """Conjunto de métricas do processo, exportadas em texto do Prometheus."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Métrica já registrada: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, description: str, labelnames=()) -> Counter:
+        return self._register(Counter(name, description, labelnames))
+
+    def gauge(self, name: str, description: str, labelnames=()) -> Gauge:
+        return self._register(Gauge(name, description, labelnames))
+
+    def histogram(
+        self, name: str, description: str, labelnames=(), buckets=LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, description, labelnames, buckets))
+
+    def clear(self) -> None:
+        """Zera todas as métricas."""
+        for metric in self._metrics.values():
+            metric.clear()
+
+    def render(self) -> str:
+        """Retorna todas as métricas no formato de texto do Prometheus."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+REQUEST_LATENCY = registry.histogram(
+    "recommender_request_duration_seconds",
+    "Latência das requisições HTTP por endpoint.",
+    ("method", "endpoint", "status"),
+)
+STAGE_LATENCY = registry.histogram(
+    "recommender_stage_duration_seconds",
+    "Latência das etapas internas do recomendador.",
+    ("stage",),
+)
+CACHE_REQUESTS = registry.counter(
+    "recommender_cache_requests_total",
+    "Consultas aos caches de recomendação por resultado.",
+    ("cache", "result"),
+)
+CACHE_ENTRIES = registry.gauge(
+    "recommender_cache_entries", "Entradas em cada cache.", ("cache",)
+)
+USER_CACHE_BYTES = registry.gauge(
+    "recommender_user_cache_bytes", "Bytes ocupados pelo cache por usuário."
+)
+MODEL_INFO = registry.gauge(
+    "recommender_model_info", "Versão do modelo carregado.", ("version", "engine")
+)
+CATALOG_ITEMS = registry.gauge(
+    "recommender_catalog_items", "Notícias no catálogo do modelo carregado."
+)
+SCORING_PENDING = registry.gauge(
+    "recommender_scoring_pending", "Cálculos em execução ou na fila do executor."
+)
+SCORING_REJECTED = registry.counter(
+    "recommender_scoring_rejected_total",
+    "Requisições recusadas por fila cheia ou prazo esgotado.",
+    ("reason",),
+)
+EVENTS_INGESTED = registry.counter(
+    "recommender_events_total",
+    "Cliques recebidos em POST /events, por notícia no catálogo ou não.",
+    ("catalog",),
+)
+RESIDENT_MEMORY = registry.gauge(
+    "process_resident_memory_bytes", "Memória residente do processo."
+)
+
+
+class stage_timer:
+    """
+    Mede a duração de uma etapa do recomendador no histograma de etapas.
+
+    Implementado como classe, e não com `contextmanager`, para custar pouco
+    no caminho de cada requisição.
+
+    Args:
+        stage (str): Nome da etapa (por exemplo, 'lookup' ou 'similarity').
+    """
+
+    __slots__ = ("stage", "start")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        STAGE_LATENCY.observe(time.perf_counter() - self.start, stage=self.stage)
@@ -0,0 +1,51 @@
+import json
+from typing import Any, Dict
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional; sem ele, usa o json da biblioteca padrão
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """Converte os tipos que o json da biblioteca padrão não serializa."""
+    # np.float32, np.int64... não herdam de float/int, ao contrário de np.float64
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+def dumps(value: Any) -> bytes:
+    """Serializa em JSON (UTF-8), com orjson quando disponível."""
+    if orjson is not None:
+        return orjson.dumps(value, default=str, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(
+        value, ensure_ascii=False, separators=(",", ":"), default=_default
+    ).encode()
+
+
+def loads(payload: bytes) -> Any:
+    """Desserializa um JSON gerado por `dumps`."""
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def render_object(fields: Dict[str, Any]) -> bytes:
+    """
+    Monta um objeto JSON concatenando bytes.
+
+    Valores do tipo `bytes` são tratados como JSON já renderizado (por
+    exemplo, listas de notícias montadas com fragmentos pré-renderizados) e
+    entram no objeto sem serem decodificados.
+    """
+    members = [
+        dumps(key) + b":" + (value if isinstance(value, bytes) else dumps(value))
+        for key, value in fields.items()
+    ]
+    return b"{" + b",".join(members) + b"}"
+
@@ -1,7 +1,11 @@
 # tests/test_api.py
+import json
 import pytest
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
 from fastapi.testclient import TestClient
+from src.api.jobs import TrainingJobManager
 from src.api.main import app
 from src.models.recommender import NewsRecommendationSystem
 from src.utils.config import Config
@@ -61,6 +65,7 @@ def test_health_check(client, mock_recommender):
     assert "model_status" in data
     assert "model_source" in data
     assert "data_loaded" in data
+    assert data["vocabulary"] == {"vocabulary_drift": 0.0, "needs_refit": False}
 
 
 # Teste para o endpoint de recomendações
@@ -95,13 +100,22 @@ def test_get_recent_news(client, mock_recommender):
 
 
 # Teste para o endpoint de treinamento do modelo
-def test_train_model(client, mock_recommender):
+@patch("src.api.jobs._train")
+def test_train_model(mock_train, client, mock_recommender):
     app.state.recommender = mock_recommender
+    app.state.training_jobs = TrainingJobManager(executor=ThreadPoolExecutor(1))
+    mock_train.side_effect = FileNotFoundError("dados ausentes")
     response = client.post("/train-model")
-    assert response.status_code == 200
+    assert response.status_code == 202
     data = response.json()
     assert "status" in data
     assert "message" in data
+    assert "job_id" in data
+
+    response = client.get(f"/train-model/{data['job_id']}")
+    assert response.status_code == 200
+    assert response.json()["job_id"] == data["job_id"]
+    assert client.get("/train-model/desconhecido").status_code == 404
 
 
 # Teste para o endpoint de adicionar notícias
@@ -121,3 +135,50 @@ def test_add_news(client, mock_recommender):
     data = response.json()
     assert "status" in data
     assert "message" in data
+    assert data["needs_refit"] is False
+
+
+# Teste para o endpoint de recomendações em lote
+def test_get_batch_recommendations(client, mock_recommender):
+    app.state.recommender = mock_recommender
+    mock_recommender.news_df["url"] = ["url1", "url2"]
+    response = client.post(
+        "/recommend/batch", json={"user_ids": ["user1", "user2"], "n": 1}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["user_id"] for line in lines] == ["user1", "user2"]
+    assert all("recommendations" in line for line in lines)
+
+
+# Teste para o endpoint de ingestão de cliques
+def test_ingest_events(client, mock_recommender):
+    app.state.recommender = mock_recommender
+    events = [{"page": "page2", "userId": "user1"}] * 3 + [{"page": "nova"}]
+    response = client.post("/events", json={"events": events})
+    assert response.status_code == 202
+    data = response.json()
+    assert data["accepted"] == 3
+    assert data["unknown"] == 1
+    assert client.post("/events", json={"events": [{}]}).status_code == 422
+
+
+# Teste da paginação de notícias recentes com cursor inválido
+def test_get_recent_news_rejects_invalid_cursor(client, mock_recommender):
+    app.state.recommender = mock_recommender
+    response = client.get("/recent", params={"cursor": "abc"})
+    assert response.status_code == 400
+
+
+# Teste das respostas montadas a partir dos fragmentos pré-renderizados
+def test_hot_path_responses_are_pre_rendered_json(client, mock_recommender):
+    app.state.recommender = mock_recommender
+    response = client.get("/recommend/user2", params={"n": 1})
+    assert response.headers["content-type"] == "application/json"
+    data = response.json()
+    assert data["user_id"] == "user2"
+    assert data["recommendations"][0]["page"] == "page1"
+    assert set(data["recommendations"][0]) == {"page", "title", "url", "score"}
+    popular = client.get("/popular", params={"n": 1}).json()["popular_news"]
+    assert popular == mock_recommender.get_popular_recommendations(1)
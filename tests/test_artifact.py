@@ -0,0 +1,156 @@
+import json
+import pickle
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.models.artifact import (
+    MANIFEST_FILE,
+    convert_pickle,
+    read_artifact,
+    write_artifact,
+)
+from src.models.recommender import NewsRecommendationSystem
+
+
+@pytest.fixture
+def recommender():
+    recommender = NewsRecommendationSystem(neighbors_k=2)
+    recommender.news_df = pd.DataFrame(
+        {
+            "page": ["page1", "page2", "page3"],
+            "title": ["futebol gol", "futebol time", "chuva frio"],
+            "body": ["corpo longo 1", "corpo longo 2", "corpo longo 3"],
+            "caption": ["", "", ""],
+            "url": ["url1", "url2", "url3"],
+            "date": pd.to_datetime(["2023-10-01", "2023-10-02", "2023-10-03"]),
+        }
+    )
+    recommender.user_df = pd.DataFrame(
+        {"userId": ["user1", "user2"], "history": ["page1, page2", "page3"]}
+    )
+    recommender.prepare_data()
+    return recommender
+
+
+def test_write_and_read_artifact(tmp_path):
+    write_artifact(
+        tmp_path / "model",
+        {"values": np.arange(4, dtype=np.float32)},
+        {"table": pd.DataFrame({"a": [1, 2]})},
+        {"key": "value"},
+    )
+
+    arrays, tables, metadata = read_artifact(tmp_path / "model", verify=True)
+
+    assert isinstance(arrays["values"], np.memmap)
+    np.testing.assert_array_equal(arrays["values"], np.arange(4))
+    assert tables["table"]["a"].tolist() == [1, 2]
+    assert metadata == {"key": "value"}
+
+
+def test_read_artifact_rejects_other_schema_version(tmp_path):
+    write_artifact(tmp_path / "model", {}, {}, {})
+    manifest_path = tmp_path / "model" / MANIFEST_FILE
+    manifest = json.loads(manifest_path.read_text())
+    manifest["schema_version"] = 999
+    manifest_path.write_text(json.dumps(manifest))
+
+    with pytest.raises(ValueError):
+        read_artifact(tmp_path / "model")
+
+
+def test_read_artifact_detects_corruption(tmp_path):
+    write_artifact(tmp_path / "model", {"values": np.arange(4)}, {}, {})
+    np.save(tmp_path / "model" / "values.npy", np.arange(5))
+
+    with pytest.raises(ValueError):
+        read_artifact(tmp_path / "model", verify=True)
+
+
+def test_read_artifact_verifies_checksums_by_default(tmp_path):
+    write_artifact(tmp_path / "model", {"values": np.arange(4)}, {}, {})
+    np.save(tmp_path / "model" / "values.npy", np.arange(4)[::-1].copy())
+
+    with pytest.raises(ValueError):
+        read_artifact(tmp_path / "model")
+    arrays, _, _ = read_artifact(tmp_path / "model", verify_max_bytes=0)
+    assert arrays["values"].tolist() == [3, 2, 1, 0]
+
+
+def test_write_artifact_stages_in_a_unique_directory(tmp_path):
+    (tmp_path / "model.tmp").mkdir()
+    write_artifact(tmp_path / "model", {"values": np.arange(4)}, {}, {})
+    write_artifact(tmp_path / "model", {"values": np.arange(5)}, {}, {})
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["model", "model.tmp"]
+    arrays, _, _ = read_artifact(tmp_path / "model")
+    assert arrays["values"].tolist() == [0, 1, 2, 3, 4]
+
+
+def test_model_round_trip_is_memory_mapped(recommender, tmp_path):
+    recommender.save_model(tmp_path / "model")
+    loaded = NewsRecommendationSystem.load_model(str(tmp_path / "model"))
+
+    assert "body" not in loaded.news_df.columns
+    assert isinstance(loaded.neighbor_table.indices, np.memmap)
+    assert (loaded.tfidf_matrix != recommender.tfidf_matrix).nnz == 0
+    np.testing.assert_array_equal(
+        loaded.neighbor_table.indices, recommender.neighbor_table.indices
+    )
+
+    assert loaded.serving
+    assert "history" not in loaded.user_df.columns
+    assert isinstance(loaded.user_histories.positions, np.memmap)
+    assert loaded._get_profile_recommendations("user1", 1)
+    assert isinstance(loaded.covisitation.indices, np.memmap)
+    np.testing.assert_array_equal(
+        loaded.covisitation.indices, recommender.covisitation.indices
+    )
+
+    loaded.add_news(
+        [{"page": "page4", "title": "futebol gol", "body": "time", "url": "url4"}]
+    )
+    assert loaded.tfidf_matrix.shape[0] == 4
+    assert "body" not in loaded.news_df.columns
+
+
+def test_loaded_model_measures_catalog_frames_once(recommender, tmp_path):
+    recommender.save_model(tmp_path / "model")
+    loaded = NewsRecommendationSystem.load_model(str(tmp_path / "model"))
+    usage = loaded.memory_usage()
+
+    with patch("src.models.recommender.frame_mb", return_value=1.0) as measure:
+        assert loaded.memory_usage()["news_mb"] == usage["news_mb"]
+        measure.assert_not_called()
+
+        loaded.add_news([{"page": "page4", "title": "chuva", "url": "url4"}])
+        measure.assert_called_once()
+        assert loaded.memory_usage()["news_mb"] == usage["news_mb"] + 1.0
+        assert loaded.memory_usage()["users_mb"] == usage["users_mb"]
+
+
+def test_convert_pickle(recommender, tmp_path):
+    pickle_path = tmp_path / "recommendation_model.pkl"
+    with open(pickle_path, "wb") as f:
+        pickle.dump(
+            {
+                "news_df": recommender.news_df,
+                "user_df": recommender.user_df,
+                "tfidf_matrix": recommender.tfidf_matrix,
+                "popularity_scores": recommender.popularity_scores,
+            },
+            f,
+        )
+
+    convert_pickle(pickle_path, tmp_path / "model")
+    loaded = NewsRecommendationSystem.load_model(str(tmp_path / "model"))
+
+    np.testing.assert_array_equal(
+        loaded.user_histories.indptr, recommender.user_histories.indptr
+    )
+    np.testing.assert_array_equal(
+        loaded.user_histories.positions, recommender.user_histories.positions
+    )
+    assert loaded.popularity_scores.to_dict() == recommender.popularity_scores.to_dict()
@@ -0,0 +1,97 @@
+from unittest.mock import patch
+
+from src.utils.cache import InMemoryBackend, TTLCache, UserRecommendationCache
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+@patch("src.utils.cache.time.monotonic")
+def test_ttl_cache_expires_entries(mock_monotonic):
+    mock_monotonic.return_value = 100.0
+    cache = TTLCache(max_entries=10, ttl_seconds=5)
+    cache.set("a", 1)
+
+    mock_monotonic.return_value = 104.0
+    assert cache.get("a") == 1
+    mock_monotonic.return_value = 106.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_clear():
+    cache = TTLCache()
+    cache.set("a", 1)
+    cache.clear()
+    assert cache.get("a") is None
+
+
+def test_ttl_cache_discard_matching_keys():
+    cache = TTLCache()
+    cache.set(("v1", "popular", 5), 1)
+    cache.set(("v1", "recent", 5), 2)
+    assert cache.discard(lambda key: key[1] == "popular") == 1
+    assert cache.get(("v1", "popular", 5)) is None
+    assert cache.get(("v1", "recent", 5)) == 2
+
+
+def test_user_cache_evicts_by_bytes():
+    cache = UserRecommendationCache(max_bytes=40, ttl_seconds=60)
+    cache.set("a", [{"page": "p1"}])
+    cache.set("b", [{"page": "p2"}])
+    cache.set("c", [{"page": "p3"}])
+
+    assert cache.get("a") is None
+    assert cache.get("c") == [{"page": "p3"}]
+    stats = cache.stats()
+    assert stats["bytes"] <= 40
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_user_cache_shares_entries_through_backend():
+    backend = InMemoryBackend()
+    worker_a = UserRecommendationCache(backend=backend)
+    worker_b = UserRecommendationCache(backend=backend)
+
+    worker_a.set("v1:user:3-p9", [{"page": "p1", "score": 0.5}])
+
+    assert worker_b.get("v1:user:3-p9") == [{"page": "p1", "score": 0.5}]
+    assert worker_b.get("v1:user:3-p9") == [{"page": "p1", "score": 0.5}]
+    assert worker_b.stats()["shared_hits"] == 1
+    assert worker_b.stats()["hits"] == 1
+
+
+@patch("src.utils.cache.time.monotonic")
+def test_in_memory_backend_expires_entries(mock_monotonic):
+    mock_monotonic.return_value = 100.0
+    backend = InMemoryBackend()
+    backend.set("a", b"1", ttl_seconds=5)
+
+    mock_monotonic.return_value = 106.0
+    assert backend.get("a") is None
+
+
+def test_in_memory_backend_is_bounded_by_bytes():
+    backend = InMemoryBackend(max_bytes=8)
+    backend.set("a", b"1234", ttl_seconds=60)
+    backend.set("b", b"1234", ttl_seconds=60)
+    assert backend.get("a") == b"1234"
+
+    backend.set("c", b"1234", ttl_seconds=60)
+
+    assert backend.get("b") is None
+    assert backend.get("a") == b"1234"
+    assert backend.get("c") == b"1234"
@@ -0,0 +1,88 @@
+import json
+
+import numpy as np
+import pandas as pd
+from src.models.catalog import ItemFragments, UserHistories, compact_news
+
+
+def test_compact_news_keeps_serving_columns():
+    news_df = pd.DataFrame(
+        {
+            "page": ["page1", "page2"],
+            "title": ["title1", "title2"],
+            "body": ["body1", "body2"],
+            "url": ["url1", "url2"],
+            "date": ["2023-10-01", "2023-10-02"],
+            "popularity_score": [1.0, 2.0],
+        },
+        index=[10, 20],
+    )
+
+    columns = ["page", "title", "url", "date", "popularity_score"]
+    catalog = compact_news(news_df, columns)
+
+    assert list(catalog.columns) == columns
+    assert list(catalog.index) == [0, 1]
+    assert catalog["page"].dtype == "string[pyarrow]"
+    assert catalog["popularity_score"].dtype == np.float32
+    assert pd.api.types.is_datetime64_any_dtype(catalog["date"])
+    assert catalog["title"].tolist() == ["title1", "title2"]
+
+
+def test_user_histories_from_strings():
+    page_index = {"page1": 0, "page2": 1, "page3": 2}
+
+    histories = UserHistories.from_strings(
+        ["user1", "user2", "user3"],
+        pd.Series(["page1, page3", None, "unknown,page2"]),
+        page_index,
+    )
+
+    assert len(histories) == 3
+    assert histories.positions.dtype == np.int32
+    assert histories.history(histories.row("user1")).tolist() == [0, 2]
+    assert histories.history(histories.row("user2")).tolist() == []
+    assert histories.history(histories.row("user3")).tolist() == [1]
+    assert histories.row("user4") is None
+    assert histories.rows(["user3", "user4"]).tolist() == [2, -1]
+
+
+def test_user_histories_round_trip():
+    histories = UserHistories.from_strings(
+        ["user1", "user2"],
+        pd.Series(["page1", "page2,page1"]),
+        {"page1": 0, "page2": 1},
+    )
+
+    restored = UserHistories.from_arrays(["user1", "user2"], histories.get_arrays())
+
+    assert restored.history(restored.row("user2")).tolist() == [1, 0]
+
+
+def test_item_fragments_render_and_append():
+    news_df = pd.DataFrame(
+        {
+            "page": ["page1", "page2"],
+            "title": ['dito "x"', "ação"],
+            "url": ["u1", None],
+        }
+    )
+    fragments = ItemFragments.from_frame(
+        compact_news(news_df, ["page", "title", "url"])
+    )
+
+    assert json.loads(fragments.render(np.array([1, 0]))) == [
+        {"page": "page2", "title": "ação", "url": None},
+        {"page": "page1", "title": 'dito "x"', "url": "u1"},
+    ]
+    assert fragments.render(np.array([], dtype=np.int64)) == b"[]"
+
+    fragments.append(pd.DataFrame({"page": ["page3"], "title": ["t"], "url": ["u3"]}))
+    rendered = fragments.render(np.array([2]), np.array([0.5], dtype=np.float32))
+    assert json.loads(rendered) == [
+        {"page": "page3", "title": "t", "url": "u3", "score": 0.5}
+    ]
+    assert len(fragments) == 3
+    # NaN e infinito não existem em JSON: o score vira null
+    rendered = fragments.render(np.array([0, 1]), np.array([np.nan, np.inf]))
+    assert [news["score"] for news in json.loads(rendered)] == [None, None]
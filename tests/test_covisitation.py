@@ -0,0 +1,60 @@
+from unittest.mock import patch
+
+import numpy as np
+from src.models.covisitation import build_covisitation
+
+
+def _histories(histories):
+    indptr = np.cumsum([0] + [len(history) for history in histories])
+    positions = np.concatenate([np.asarray(h, dtype=np.int32) for h in histories])
+    return indptr.astype(np.int64), positions
+
+
+def test_pairs_are_windowed_weighted_and_symmetric():
+    indptr, positions = _histories([[0, 1, 2], [1, 0]])
+
+    table = build_covisitation(indptr, positions, n_items=4, k=3, window=1)
+
+    # 0-1 aparece nos dois usuários; 1-2 uma vez; 0-2 está fora da janela
+    assert table.neighbors(0, 3)[0].tolist() == [1]
+    assert table.neighbors(1, 3)[0].tolist() == [0, 2]
+    np.testing.assert_allclose(table.neighbors(1, 3)[1], [2.0, 1.0])
+    assert table.neighbors(3, 3)[0].tolist() == []
+
+
+def test_chunked_and_parallel_builds_match():
+    rng = np.random.default_rng(0)
+    histories = [rng.integers(0, 50, rng.integers(1, 12)) for _ in range(200)]
+    indptr, positions = _histories(histories)
+
+    single = build_covisitation(indptr, positions, 50, k=5, window=3)
+    chunked = build_covisitation(
+        indptr, positions, 50, k=5, window=3, chunk_entries=64
+    )
+    parallel = build_covisitation(
+        indptr, positions, 50, k=5, window=3, n_jobs=2, min_parallel_entries=0
+    )
+
+    for table in (chunked, parallel):
+        np.testing.assert_allclose(table.scores, single.scores, rtol=1e-6)
+
+
+@patch("src.models.covisitation.ProcessPoolExecutor")
+def test_small_inputs_are_counted_without_processes(mock_pool):
+    indptr, positions = _histories([[0, 1, 2], [1, 0]])
+
+    table = build_covisitation(indptr, positions, n_items=4, k=3, n_jobs=8)
+
+    mock_pool.assert_not_called()
+    assert table.neighbors(0, 3)[0].tolist() == [1, 2]
+
+
+def test_aggregate_sums_weighted_neighbors():
+    indptr, positions = _histories([[0, 1], [2, 1], [2, 3]])
+    table = build_covisitation(indptr, positions, n_items=4, k=2, window=1)
+
+    positions, scores = table.aggregate(np.array([0, 2]), np.array([0.5, 1.0]), 2)
+
+    # 1 é vizinho de 0 e de 2; 3 só de 2
+    assert positions.tolist() == [1, 3]
+    np.testing.assert_allclose(scores, [1.5, 1.0])
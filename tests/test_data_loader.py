@@ -1,7 +1,9 @@
 # tests/test_data_loader.py
 import pytest
 from unittest.mock import patch, MagicMock
-from src.data.data_loader import DataLoader
+from src.data.data_loader import BoundedHashSet, DataLoader, INTERACOES_SCHEMA
+import pyarrow as pa
+import numpy as np
 import pandas as pd
 import os
 
@@ -24,4 +26,68 @@ def test_save_data(mock_to_parquet):
     data_loader = DataLoader()
     data_loader.save_data(df, 'data/raw/interacoes.parquet')
     
-    mock_to_parquet.assert_called_once_with('data/raw/interacoes.parquet', compression='snappy', index=False)
\ No newline at end of file
+    mock_to_parquet.assert_called_once_with('data/raw/interacoes.parquet', compression='snappy', index=False)
+
+def test_stream_to_parquet_dedupes_across_files(tmp_path):
+    pd.DataFrame({'page': ['a', 'b', 'b'], 'views': [1, 2, 2]}).to_csv(
+        tmp_path / 'itens-parte1.csv', index=False
+    )
+    pd.DataFrame({'page': ['b', 'c'], 'views': [5, 3]}).to_csv(
+        tmp_path / 'itens-parte2.csv', index=False
+    )
+    output_path = str(tmp_path / 'raw' / 'noticias.parquet')
+
+    data_loader = DataLoader()
+    stats = data_loader.stream_to_parquet(
+        str(tmp_path / 'itens-parte*.csv'), output_path, key_columns=['page'], chunksize=2
+    )
+
+    df = pd.read_parquet(output_path)
+    assert df['page'].tolist() == ['a', 'b', 'c']
+    assert df['views'].tolist() == [1, 2, 3]
+    assert [s['rows_read'] for s in stats] == [3, 2]
+    assert [s['rows_written'] for s in stats] == [2, 1]
+    assert all(s['rows_per_second'] > 0 for s in stats)
+
+
+def test_bounded_hash_set_forgets_oldest_keys():
+    seen = BoundedHashSet(capacity=2)
+
+    assert seen.filter_new(np.array([1, 2, 2], dtype=np.uint64)).tolist() == [True, True, False]
+    assert seen.filter_new(np.array([3], dtype=np.uint64)).tolist() == [True]
+    assert len(seen) == 2
+    assert seen.filter_new(np.array([1, 3], dtype=np.uint64)).tolist() == [True, False]
+
+
+def test_load_tables_parallel_uses_declared_types(tmp_path):
+    pd.DataFrame(
+        {'userId': ['u1', 'u2'], 'historySize': [2, 1], 'history': ['a, b', 'c']}
+    ).to_csv(tmp_path / 'treino_parte1.csv', index=False)
+    pd.DataFrame(
+        {'userId': ['u2', 'u3'], 'historySize': [1, 4], 'history': ['c', 'd']}
+    ).to_csv(tmp_path / 'treino_parte2.csv', index=False)
+
+    data_loader = DataLoader()
+    table = data_loader.load_tables_parallel(
+        str(tmp_path / 'treino_parte*.csv'), schema=INTERACOES_SCHEMA, max_workers=2
+    )
+
+    assert table.schema.field('historySize').type == pa.int32()
+    assert pa.types.is_dictionary(table.schema.field('userId').type)
+    df = table.to_pandas()
+    assert df['userId'].tolist() == ['u1', 'u2', 'u3']
+    assert df['userId'].dtype == 'category'
+
+    output_path = str(tmp_path / 'raw' / 'interacoes.parquet')
+    data_loader.save_table(table, output_path)
+    assert len(pd.read_parquet(output_path)) == 3
+
+
+def test_drop_duplicate_rows_uses_key_columns_and_skips_unique_tables():
+    table = pa.table({'page': ['a', 'b', 'a', 'c'], 'views': [1, 2, 5, 3]})
+
+    deduped = DataLoader._drop_duplicate_rows(table, ['page'])
+
+    assert deduped.column('page').to_pylist() == ['a', 'b', 'c']
+    assert deduped.column('views').to_pylist() == [1, 2, 3]
+    assert DataLoader._drop_duplicate_rows(deduped, ['page']) is deduped
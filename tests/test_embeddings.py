@@ -0,0 +1,36 @@
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from src.models.embeddings import SVDEmbedding
+
+
+def _matrix():
+    rng = np.random.default_rng(0)
+    vocabulary = [f"termo{i}" for i in range(60)]
+    documents = [" ".join(rng.choice(vocabulary, 12)) for _ in range(80)]
+    return TfidfVectorizer().fit_transform(documents)
+
+
+def test_transform_returns_normalized_contiguous_float32():
+    matrix = _matrix()
+    embedding = SVDEmbedding(n_components=16).fit(matrix)
+
+    vectors = embedding.transform(matrix)
+
+    assert vectors.shape == (80, 16)
+    assert vectors.dtype == np.float32
+    assert vectors.flags["C_CONTIGUOUS"]
+    np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), 1.0, rtol=1e-5)
+
+
+def test_n_components_is_capped_by_matrix_shape():
+    embedding = SVDEmbedding(n_components=256).fit(_matrix()[:10])
+    assert embedding.dim == 9
+
+
+def test_round_trip_from_arrays():
+    matrix = _matrix()
+    embedding = SVDEmbedding(n_components=8).fit(matrix)
+
+    loaded = SVDEmbedding.from_arrays(embedding.get_arrays(), **embedding.get_params())
+
+    np.testing.assert_array_equal(loaded.transform(matrix), embedding.transform(matrix))
@@ -0,0 +1,81 @@
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+from src.data.synthetic import SyntheticDataset
+from src.models.evaluation import (
+    benchmark_paths,
+    ranking_metrics,
+    run_evaluation,
+    time_split,
+)
+from src.models.recommender import NewsRecommendationSystem
+
+
+def test_time_split_holds_out_last_clicks():
+    user_df = pd.DataFrame(
+        {
+            "userId": ["user1", "user2"],
+            "history": ["page1, page2, page3", "page1"],
+            "timestampHistory": ["1,2,3", "1"],
+            "historySize": [3, 1],
+        }
+    )
+
+    train_df, held_out = time_split(user_df, holdout=1)
+
+    assert held_out == {"user1": ["page3"]}
+    assert train_df["history"].tolist() == ["page1, page2", "page1"]
+    assert train_df["timestampHistory"].tolist() == ["1,2", "1"]
+    assert train_df["historySize"].tolist() == [2, 1]
+    assert user_df["history"].iloc[0] == "page1, page2, page3"
+
+
+def test_ranking_metrics():
+    metrics = ranking_metrics(
+        [["a", "b", "c"], ["d", "e", "f"], ["g", "h", "i"]],
+        [["b"], ["d"], ["z"]],
+        k=3,
+    )
+
+    assert metrics["hr@3"] == pytest.approx(2 / 3)
+    assert metrics["mrr@3"] == pytest.approx((1 / 2 + 1) / 3)
+    assert metrics["ndcg@3"] == pytest.approx((1 / 1.5849625 + 1) / 3)
+    assert metrics["users"] == 3
+
+
+def test_run_evaluation_on_synthetic_data(tmp_path):
+    SyntheticDataset(n_items=60, n_users=200, n_topics=4, seed=7).write(tmp_path)
+    recommender = NewsRecommendationSystem(data_dir=tmp_path, neighbors_k=5)
+    recommender.load_data()
+
+    report = run_evaluation(recommender, k=5, max_users=50, n_requests=10)
+
+    assert report["quality"]["hybrid"]["users"] == 50
+    assert report["quality"]["content"]["users"] == 50
+    assert set(report["latency"]) == {"cold_start", "hybrid", "popular", "batch"}
+    for stats in report["latency"].values():
+        assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"]
+        assert stats["throughput"] > 0
+
+
+def test_benchmark_paths_measures_public_calls_without_result_caches(tmp_path):
+    SyntheticDataset(n_items=40, n_users=50, n_topics=4, seed=7).write(tmp_path)
+    recommender = NewsRecommendationSystem(data_dir=tmp_path)
+    recommender.load_data()
+    recommender.prepare_data()
+    user_cache = recommender.user_cache
+    user_ids = recommender.user_df["userId"].tolist()
+
+    with patch.object(
+        recommender, "_compute_popular", wraps=recommender._compute_popular
+    ) as compute_popular, patch.object(
+        recommender, "_rank_user", wraps=recommender._rank_user
+    ) as rank_user:
+        latency = benchmark_paths(
+            recommender, user_ids, n=5, n_requests=4, n_batches=1, batch_size=10
+        )
+
+    assert latency["popular"]["calls"] == compute_popular.call_count == 4
+    assert rank_user.call_count >= 4
+    assert recommender.user_cache is user_cache
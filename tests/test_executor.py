@@ -0,0 +1,81 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from src.api.executor import DeadlineExceededError, SaturatedError, ScoringExecutor
+from src.api.main import app
+
+
+def test_run_returns_result():
+    executor = ScoringExecutor(max_workers=1, max_pending=0, timeout=1)
+
+    assert asyncio.run(executor.run(sum, [1, 2, 3])) == 6
+    assert executor.pending == 0
+
+
+def test_run_rejects_when_saturated():
+    executor = ScoringExecutor(max_workers=1, max_pending=0, timeout=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+        with pytest.raises(SaturatedError):
+            await executor.run(sum, [1])
+        release.set()
+        return await running
+
+    assert asyncio.run(scenario()) is True
+
+
+def test_run_enforces_deadline_and_skips_stale_work():
+    executor = ScoringExecutor(max_workers=1, max_pending=1, timeout=0.1)
+    calls = []
+
+    async def scenario():
+        slow = asyncio.ensure_future(executor.run(time.sleep, 0.3))
+        await asyncio.sleep(0.01)
+        with pytest.raises(DeadlineExceededError):
+            await executor.run(calls.append, "queued")
+        with pytest.raises(DeadlineExceededError):
+            await slow
+
+    asyncio.run(scenario())
+    time.sleep(0.3)
+
+    assert calls == []
+    assert executor.pending == 0
+
+
+def test_endpoint_returns_503_with_retry_after(monkeypatch):
+    async def saturated(*args, **kwargs):
+        raise SaturatedError("Servidor sobrecarregado. Tente novamente.")
+
+    app.state.recommender = SimpleNamespace(render_user_recommendations=None)
+    monkeypatch.setattr(app.state.scoring, "run", saturated)
+
+    response = TestClient(app).get("/recommend/user1")
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+
+def test_batch_and_add_news_go_through_the_executor(monkeypatch):
+    async def saturated(*args, **kwargs):
+        raise SaturatedError("Servidor sobrecarregado. Tente novamente.")
+
+    app.state.recommender = SimpleNamespace(
+        batch_block_size=lambda: 100, render_batch_block=None, add_news=None
+    )
+    monkeypatch.setattr(app.state.scoring, "run", saturated)
+    client = TestClient(app)
+
+    batch = client.post("/recommend/batch", json={"user_ids": ["user1"]})
+    added = client.post("/add-news", json={"news": [{"page": "page3"}]})
+
+    for response in (batch, added):
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
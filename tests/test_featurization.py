@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from src.models.featurization import (
+    HashingTfidfVectorizer,
+    build_content,
+    fit_transform_parallel,
+    fold_accents,
+    make_vectorizer,
+)
+
+
+@pytest.fixture
+def documents():
+    rng = np.random.default_rng(0)
+    vocabulary = [f"termo{i}" for i in range(300)]
+    return [" ".join(rng.choice(vocabulary, 20)) for _ in range(90)]
+
+
+def test_build_content_concatenates_columns():
+    news_df = pd.DataFrame(
+        {"title": ["Eleição", None], "body": ["Corpo", "b"], "caption": ["", "c"]}
+    )
+
+    assert build_content(news_df).tolist() == ["Eleição Corpo ", " b c"]
+    assert build_content(news_df, fold=True).tolist() == ["eleicao corpo ", " b c"]
+    assert build_content(news_df[["title"]]).tolist() == ["Eleição  ", "  "]
+
+
+def test_fold_accents_handles_separator_inside_documents():
+    assert fold_accents(["Ação\x1eJá", "Órgão"], chunk_size=10) == [
+        "acao\x1eja",
+        "orgao",
+    ]
+
+
+def test_portuguese_stopwords_are_removed():
+    vectorizer = make_vectorizer("tfidf", stop_words="portuguese")
+    vectorizer.fit(fold_accents(["A eleição não é para você", "o voto da urna"]))
+
+    assert set(vectorizer.vocabulary_) == {"eleicao", "voto", "urna"}
+
+
+def test_parallel_tfidf_matches_single_process(documents):
+    expected = TfidfVectorizer(max_features=100)
+    expected_matrix = expected.fit_transform(documents)
+
+    vectorizer = make_vectorizer("tfidf", max_features=100)
+    matrix = fit_transform_parallel(vectorizer, documents, n_jobs=2, chunk_size=25)
+
+    assert vectorizer.vocabulary_ == expected.vocabulary_
+    np.testing.assert_allclose(matrix.toarray(), expected_matrix.toarray())
+    np.testing.assert_allclose(
+        vectorizer.transform(documents[:5]).toarray(), expected_matrix[:5].toarray()
+    )
+
+
+def test_parallel_hashing_matches_single_process(documents):
+    expected = HashingTfidfVectorizer(n_features=2**10).fit_transform(documents)
+
+    vectorizer = make_vectorizer("hashing", n_features=2**10)
+    matrix = fit_transform_parallel(vectorizer, documents, n_jobs=2, chunk_size=25)
+
+    assert matrix.shape == (90, 2**10)
+    np.testing.assert_allclose(matrix.toarray(), expected.toarray())
+    assert not hasattr(vectorizer, "vocabulary_")
+
+
+def test_make_vectorizer_rejects_unknown_options():
+    with pytest.raises(ValueError):
+        make_vectorizer("bm25")
+    with pytest.raises(ValueError):
+        make_vectorizer("tfidf", stop_words="english")
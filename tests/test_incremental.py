@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+from src.models.incremental import (
+    AppendableArray,
+    AppendableCSR,
+    VocabularyDriftTracker,
+)
+
+
+def test_appendable_csr_matches_vstack():
+    matrix = sp.random(5, 7, density=0.4, format="csr", random_state=0)
+    buffer = AppendableCSR(matrix)
+
+    expected = matrix
+    for seed in range(1, 6):
+        rows = sp.random(3, 7, density=0.4, format="csr", random_state=seed)
+        result = buffer.append(rows)
+        expected = sp.vstack([expected, rows], format="csr")
+
+    assert result.shape == (20, 7)
+    assert (result != expected).nnz == 0
+    # A matriz retornada é uma visão dos buffers, sem cópia
+    assert np.shares_memory(result.data, buffer._data)
+
+
+def test_appendable_csr_rejects_other_width():
+    buffer = AppendableCSR(sp.csr_matrix((2, 3)))
+
+    with pytest.raises(ValueError):
+        buffer.append(sp.csr_matrix((1, 4)))
+
+
+def test_vocabulary_drift_tracker():
+    tracker = VocabularyDriftTracker(threshold=0.5, min_tokens=4)
+    vocabulary = {"futebol": 0, "gol": 1}
+
+    tracker.update(["futebol gol"], str.split, vocabulary)
+    assert tracker.drift == 0.0
+    assert not tracker.exceeded
+
+    tracker.update(["eleição urna voto"], str.split, vocabulary)
+    assert tracker.drift == pytest.approx(0.6)
+    assert tracker.exceeded
+
+    tracker.reset()
+    assert tracker.drift == 0.0
+
+
+def test_appendable_array_matches_vstack():
+    array = np.arange(6, dtype=np.float32).reshape(3, 2)
+    buffer = AppendableArray(array)
+
+    expected = array
+    for size in [1, 4, 2]:
+        rows = np.full((size, 2), size, dtype=np.float32)
+        result = buffer.append(rows)
+        expected = np.vstack([expected, rows])
+
+    np.testing.assert_array_equal(result, expected)
+    assert result.flags["C_CONTIGUOUS"]
+    with pytest.raises(ValueError):
+        buffer.append(np.zeros((1, 3)))
@@ -0,0 +1,68 @@
+import asyncio
+import signal
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from src.api.jobs import TrainingJobManager
+
+
+async def _run_job(manager, app):
+    job_id = manager.submit(app, "data", "data/models/recommendation_model")
+    await asyncio.gather(*manager._tasks)
+    return job_id
+
+
+@patch("src.api.jobs.NewsRecommendationSystem.load_model")
+@patch("src.api.jobs._train")
+def test_completed_job_swaps_recommender(mock_train, mock_load_model):
+    mock_train.return_value = "data/models/recommendation_model"
+    mock_load_model.return_value = "novo modelo"
+    app = SimpleNamespace(state=SimpleNamespace(recommender="modelo antigo"))
+    manager = TrainingJobManager(executor=ThreadPoolExecutor(1))
+
+    job_id = asyncio.run(_run_job(manager, app))
+
+    assert app.state.recommender == "novo modelo"
+    job = manager.get(job_id)
+    assert job["status"] == "completed"
+    assert job["finished_at"] is not None
+    mock_load_model.assert_called_once_with("data/models/recommendation_model")
+
+
+@patch("src.api.jobs._train")
+def test_failed_job_keeps_recommender(mock_train):
+    mock_train.side_effect = FileNotFoundError("dados ausentes")
+    app = SimpleNamespace(state=SimpleNamespace(recommender="modelo antigo"))
+    manager = TrainingJobManager(executor=ThreadPoolExecutor(1))
+
+    job_id = asyncio.run(_run_job(manager, app))
+
+    assert app.state.recommender == "modelo antigo"
+    assert manager.get(job_id)["status"] == "failed"
+    assert manager.get(job_id)["error"] == "dados ausentes"
+    assert manager.get("desconhecido") is None
+
+
+@patch("src.api.jobs.os.kill")
+@patch("src.api.jobs.NewsRecommendationSystem.load_model")
+@patch("src.api.jobs._train")
+def test_prefork_job_is_shared_and_reloads_all_workers(
+    mock_train, mock_load_model, mock_kill, tmp_path
+):
+    mock_train.return_value = "data/models/recommendation_model"
+    app = SimpleNamespace(
+        state=SimpleNamespace(recommender="modelo antigo", prefork_parent=1234)
+    )
+    manager = TrainingJobManager(executor=ThreadPoolExecutor(1), state_dir=tmp_path)
+
+    job_id = asyncio.run(_run_job(manager, app))
+
+    # O pai recarrega o modelo; o worker não o carrega por conta própria
+    mock_load_model.assert_not_called()
+    mock_kill.assert_called_once_with(1234, signal.SIGHUP)
+    assert app.state.recommender == "modelo antigo"
+    # Outro worker, com outro gerenciador, enxerga o mesmo job
+    other = TrainingJobManager(state_dir=tmp_path)
+    assert other.get(job_id)["status"] == "completed"
+    assert other.get("../segredo") is None
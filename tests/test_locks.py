@@ -0,0 +1,58 @@
+import threading
+import time
+
+from src.utils.locks import ReadWriteLock
+
+
+def test_readers_share_the_lock():
+    lock = ReadWriteLock()
+    both_inside = threading.Barrier(2, timeout=5)
+
+    def read():
+        with lock.read():
+            both_inside.wait()
+
+    threads = [threading.Thread(target=read) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert not both_inside.broken
+
+
+def test_writer_excludes_readers_and_waits_for_them():
+    lock = ReadWriteLock()
+    events = []
+    reading = threading.Event()
+
+    def read():
+        with lock.read():
+            reading.set()
+            time.sleep(0.05)
+            events.append("read")
+
+    def write():
+        with lock.write():
+            events.append("write")
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    reading.wait(timeout=5)
+    writer = threading.Thread(target=write)
+    writer.start()
+    reader.join(timeout=5)
+    writer.join(timeout=5)
+    assert events == ["read", "write"]
+
+
+def test_reads_are_reentrant_and_allowed_while_writing():
+    lock = ReadWriteLock()
+    with lock.read():
+        with lock.read():
+            pass
+    with lock.write():
+        with lock.read():
+            pass
+    # O lock continua livre depois das leituras aninhadas
+    with lock.write():
+        pass
@@ -0,0 +1,87 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.api.endpoints import router as api_router
+from src.api.executor import ScoringExecutor
+from src.api.main import app
+from src.api.metrics import MetricsMiddleware
+from src.utils.metrics import MetricsRegistry, STAGE_LATENCY, stage_timer
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    latency = registry.histogram(
+        "latency_seconds", "Latência.", ("endpoint",), buckets=(0.1, 1.0)
+    )
+    latency.observe(0.05, endpoint="/popular")
+    latency.observe(0.5, endpoint="/popular")
+    latency.observe(5.0, endpoint="/popular")
+
+    lines = registry.render().splitlines()
+
+    assert "# TYPE latency_seconds histogram" in lines
+    assert 'latency_seconds_bucket{endpoint="/popular",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{endpoint="/popular",le="1.0"} 2' in lines
+    assert 'latency_seconds_bucket{endpoint="/popular",le="+Inf"} 3' in lines
+    assert 'latency_seconds_count{endpoint="/popular"} 3' in lines
+    assert 'latency_seconds_sum{endpoint="/popular"} 5.55' in lines
+
+
+def test_counter_and_gauge_escape_labels():
+    registry = MetricsRegistry()
+    registry.counter("events_total", "Eventos.", ("kind",)).inc(kind='a"b')
+    registry.gauge("entries", "Entradas.").set(3)
+
+    lines = registry.render().splitlines()
+
+    assert 'events_total{kind="a\\"b"} 1' in lines
+    assert "entries 3" in lines
+
+
+def test_stage_timer_observes_duration():
+    STAGE_LATENCY.clear()
+
+    with stage_timer("similarity"):
+        pass
+
+    assert 'stage="similarity"' in "".join(STAGE_LATENCY.render())
+
+
+def test_metrics_endpoint_reports_request_latency():
+    app.state.recommender = None
+    client = TestClient(app)
+
+    client.get("/health")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert (
+        'recommender_request_duration_seconds_count{method="GET",'
+        'endpoint="/health",status="200"}' in response.text
+    )
+    assert "process_resident_memory_bytes" in response.text
+
+
+def test_profile_includes_the_scoring_thread():
+    pytest.importorskip("pyinstrument")
+
+    def score_in_thread(user_id, n):
+        time.sleep(0.05)
+        return b"[]"
+
+    profiled_app = FastAPI()
+    profiled_app.include_router(api_router)
+    profiled_app.add_middleware(MetricsMiddleware, profiling=True)
+    profiled_app.state.scoring = ScoringExecutor(max_workers=1)
+    profiled_app.state.recommender = SimpleNamespace(
+        render_user_recommendations=score_in_thread
+    )
+
+    response = TestClient(profiled_app).get("/recommend/user1?profile=1")
+
+    assert response.headers["content-type"].startswith("text/html")
+    assert "score_in_thread" in response.text
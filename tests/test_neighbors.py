@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from src.models.neighbors import NeighborTable
+
+
+@pytest.fixture
+def tfidf_matrix():
+    rng = np.random.default_rng(0)
+    vocabulary = [f"termo{i}" for i in range(40)]
+    documents = [" ".join(rng.choice(vocabulary, 15)) for _ in range(120)]
+    return TfidfVectorizer().fit_transform(documents)
+
+
+def _brute_force(matrix, k):
+    similarities = (matrix @ matrix.T).toarray()
+    np.fill_diagonal(similarities, -np.inf)
+    return np.sort(similarities, axis=1)[:, ::-1][:, :k]
+
+
+def test_build_matches_brute_force_with_small_blocks(tfidf_matrix):
+    table = NeighborTable.build(tfidf_matrix, k=5, max_block_bytes=2048)
+
+    assert table.indices.dtype == np.int32
+    assert table.scores.dtype == np.float32
+    np.testing.assert_allclose(table.scores, _brute_force(tfidf_matrix, 5), rtol=1e-5)
+    assert not (table.indices == np.arange(120)[:, None]).any()
+
+
+def test_append_matches_full_rebuild(tfidf_matrix):
+    table = NeighborTable.build(tfidf_matrix[:100], k=5)
+    table.append(tfidf_matrix, max_block_bytes=4096)
+
+    np.testing.assert_allclose(table.scores, _brute_force(tfidf_matrix, 5), rtol=1e-5)
+
+
+def test_neighbors_skips_padding(tfidf_matrix):
+    table = NeighborTable.build(tfidf_matrix[:3], k=5)
+    positions, scores = table.neighbors(0, 5)
+    assert len(positions) == len(scores) == 2
+    assert 0 not in positions
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.models.popularity import compute_popularity
+
+HOUR_MS = 3600 * 1000
+NOW_MS = 1_700_000_000_000
+
+
+def test_compute_popularity_decays_each_interaction():
+    history = pd.Series(["page1, page2", "page1", "page3"])
+    timestamps = pd.Series(
+        [
+            f"{NOW_MS - 10 * 24 * HOUR_MS}, {NOW_MS}",
+            f"{NOW_MS - 10 * 24 * HOUR_MS}",
+            f"{NOW_MS - 2 * HOUR_MS}",
+        ]
+    )
+
+    popularity = compute_popularity(history, timestamps, decay_factor=0.1)
+
+    # page1: duas leituras com 10 dias (peso 0.5 cada); page2: uma agora (peso 1)
+    assert popularity.loc["page1", "score"] == pytest.approx(1.0)
+    assert popularity.loc["page2", "score"] == pytest.approx(1.0)
+    assert popularity.loc["page3", "score"] < 1.0
+    assert popularity.loc["page1", "views_7d"] == 0
+    assert popularity.loc["page2", "views_1h"] == 1
+    assert popularity.loc["page3", "views_1h"] == 0
+    assert popularity.loc["page3", "views_24h"] == 1
+
+
+def test_compute_popularity_without_timestamps_counts_views():
+    history = pd.Series(["page1,page2", "page2", ""])
+
+    popularity = compute_popularity(history, windows=("1h",))
+
+    assert popularity.index.tolist() == ["page2", "page1"]
+    assert popularity["score"].tolist() == pytest.approx([1.0, 0.5])
+    assert popularity["views_1h"].tolist() == [2, 1]
+
+
+def test_compute_popularity_ignores_misaligned_timestamps():
+    history = pd.Series(["page1,page2", "page2"])
+    timestamps = pd.Series([f"{NOW_MS}", f"{NOW_MS - 100 * 24 * HOUR_MS}"])
+
+    popularity = compute_popularity(history, timestamps, windows=("24h",))
+
+    assert popularity.loc["page1", "views_24h"] == 1
+    assert np.isfinite(popularity["score"]).all()
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer
+from src.models.profiles import UserProfiles
+
+
+def _matrix():
+    return TfidfVectorizer().fit_transform(
+        ["futebol gol", "chuva frio", "eleição voto", "futebol chuva"]
+    )
+
+
+PAGE_INDEX = {"page1": 0, "page2": 1, "page3": 2, "page4": 3}
+
+
+def test_build_weights_recent_reads_more():
+    profiles = UserProfiles.build(
+        pd.Series(["page1, page2", "page2, page1", "", "page9"]),
+        PAGE_INDEX,
+        _matrix(),
+        last_n=20,
+    )
+    matrix = _matrix()
+
+    assert profiles.vectors.dtype == np.float32
+    np.testing.assert_allclose(sp.linalg.norm(profiles.vectors[:2], axis=1), 1.0)
+    first = (profiles.vector(0) @ matrix.T).toarray().ravel()
+    second = (profiles.vector(1) @ matrix.T).toarray().ravel()
+    assert first[1] > first[0]
+    assert second[0] > second[1]
+    assert profiles.vector(2).nnz == profiles.vector(3).nnz == 0
+
+
+def test_build_uses_timestamps_and_last_n():
+    profiles = UserProfiles.build(
+        pd.Series(["page1,page2,page3"]),
+        PAGE_INDEX,
+        _matrix(),
+        timestamps=pd.Series(["0,864000000,1"]),
+        last_n=2,
+        decay_factor=1.0,
+    )
+    scores = (profiles.vector(0) @ _matrix().T).toarray().ravel()
+
+    # page1 está fora das 2 últimas leituras; page2 é a mais recente
+    assert scores[1] > scores[2] > 0
+    assert scores[0] == 0
+
+
+def test_read_positions_are_sorted_and_round_trip():
+    profiles = UserProfiles.build(
+        pd.Series(["page4, page1, page4", "page3"]), PAGE_INDEX, _matrix()
+    )
+
+    np.testing.assert_array_equal(profiles.read(0), [0, 3])
+    np.testing.assert_array_equal(profiles.read(1), [2])
+    assert profiles.read_positions.dtype == np.int32
+
+    loaded = UserProfiles.from_arrays(profiles.get_arrays(), _matrix().shape[1])
+    assert (loaded.vectors != profiles.vectors).nnz == 0
+    np.testing.assert_array_equal(loaded.read(0), profiles.read(0))
@@ -0,0 +1,48 @@
+import numpy as np
+from src.models.ranking import HybridRanker
+
+
+def test_rank_fuses_normalized_scores_and_dedups():
+    ranker = HybridRanker(weights={"content": 1.0, "popular": 0.5})
+    candidates = {
+        "content": (np.array([0, 1]), np.array([0.8, 0.6])),
+        "popular": (np.array([1, 2]), np.array([100.0, 50.0])),
+    }
+
+    positions, scores = ranker.rank(candidates, 3)
+
+    # 1: 0.75 + 0.5, 0: 1.0, 2: 0.25
+    assert positions.tolist() == [1, 0, 2]
+    np.testing.assert_allclose(scores, [1.25, 1.0, 0.25])
+
+
+def test_rank_excludes_read_and_ignores_unweighted_retrievers():
+    ranker = HybridRanker(weights={"content": 1.0})
+    candidates = {
+        "content": (np.array([0, 1, 2]), np.array([0.9, 0.5, 0.1])),
+        "recent": (np.array([3]), np.array([1.0])),
+    }
+
+    positions, _ = ranker.rank(candidates, 5, exclude=[0])
+
+    assert positions.tolist() == [1, 2]
+
+
+def test_freshness_favours_newer_news():
+    ranker = HybridRanker(
+        weights={"content": 1.0}, half_life_hours=1, freshness_floor=0.5
+    )
+    now_ms = 10 * 3600 * 1000
+    published = np.array([now_ms - 3600 * 1000, now_ms, np.iinfo(np.int64).min])
+    candidates = {"content": (np.array([0, 1, 2]), np.array([1.0, 0.8, 1.0]))}
+
+    positions, scores = ranker.rank(candidates, 3, published=published, now_ms=now_ms)
+
+    assert positions.tolist() == [1, 0, 2]
+    np.testing.assert_allclose(scores, [0.8, 0.75, 0.5])
+
+
+def test_rank_without_candidates_is_empty():
+    positions, scores = HybridRanker().rank({"content": (np.array([]), [])}, 5)
+
+    assert positions.size == scores.size == 0
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.models.recency import (
+    RecencyIndex,
+    decode_cursor,
+    encode_cursor,
+    to_epoch_ms,
+)
+
+
+def test_to_epoch_ms_treats_naive_dates_as_utc_and_missing_as_oldest():
+    timestamps = to_epoch_ms(pd.Series(["1970-01-01 00:00:01", None]))
+
+    assert timestamps[0] == 1000
+    assert timestamps[1] < 0
+
+
+def test_window_and_newest_return_newest_first():
+    index = RecencyIndex(np.array([30, 10, 20, 40]))
+
+    assert index.window(20).tolist() == [3, 0, 2]
+    assert index.window(10, 30).tolist() == [2, 1]
+    positions, timestamps = index.newest(2)
+    assert positions.tolist() == [3, 0]
+    assert timestamps.tolist() == [40, 30]
+    assert index.newest(10, since=25)[0].tolist() == [3, 0]
+
+
+def test_cursor_pages_through_ties_without_gaps():
+    index = RecencyIndex(np.array([10, 20, 20, 20, 5]))
+    seen = []
+    before = None
+    while True:
+        positions, timestamps = index.newest(2, before=before)
+        if not len(positions):
+            break
+        seen.extend(positions.tolist())
+        before = decode_cursor(encode_cursor(timestamps[-1], positions[-1]))
+
+    assert seen == [3, 2, 1, 0, 4]
+
+
+def test_append_keeps_order():
+    index = RecencyIndex(np.array([10, 30]))
+
+    index.append(np.array([20, 30, 5]))
+
+    assert index.newest(5)[0].tolist() == [3, 1, 2, 0, 4]
+
+
+def test_append_in_publication_order_grows_in_place():
+    index = RecencyIndex(np.array([10, 20, 30]))
+    index.append(np.array([30]))
+    buffer = index.order
+
+    index.append(np.array([40, 30]))
+
+    assert np.shares_memory(index.order, buffer)
+    assert index.newest(6)[0].tolist() == [4, 5, 3, 2, 1, 0]
+    assert index.published.tolist() == [10, 20, 30, 30, 40, 30]
+
+
+def test_decode_cursor_rejects_garbage():
+    with pytest.raises(ValueError):
+        decode_cursor("abc")
@@ -1,7 +1,10 @@
 # tests/test_recommender.py
+import threading
 import pytest
 from unittest.mock import patch, MagicMock
+from src.models.ranking import HybridRanker
 from src.models.recommender import NewsRecommendationSystem
+from src.utils.serialization import loads
 import pandas as pd
 import numpy as np
 
@@ -30,8 +33,17 @@ def test_load_data(mock_read_parquet):
 
 
 @patch("src.models.recommender.NewsRecommendationSystem._compute_tfidf_matrix")
+@patch("src.models.recommender.NewsRecommendationSystem._build_user_profiles")
+@patch("src.models.recommender.NewsRecommendationSystem._compute_neighbor_table")
+@patch("src.models.recommender.NewsRecommendationSystem._build_similarity_index")
 @patch("src.models.recommender.NewsRecommendationSystem._calculate_popularity_scores")
-def test_prepare_data(mock_calculate_popularity, mock_compute_tfidf):
+def test_prepare_data(
+    mock_calculate_popularity,
+    mock_build_similarity_index,
+    mock_compute_neighbors,
+    mock_build_profiles,
+    mock_compute_tfidf,
+):
     recommender = NewsRecommendationSystem()
     recommender.news_df = pd.DataFrame(
         {
@@ -48,4 +60,579 @@ def test_prepare_data(mock_calculate_popularity, mock_compute_tfidf):
     recommender.prepare_data()
 
     mock_compute_tfidf.assert_called_once()
+    mock_compute_neighbors.assert_called_once()
+    mock_build_profiles.assert_called_once()
+    mock_build_similarity_index.assert_called_once()
     mock_calculate_popularity.assert_called_once()
+
+
+def test_build_indexes():
+    recommender = NewsRecommendationSystem()
+    recommender.news_df = pd.DataFrame(
+        {"page": ["page1", "page2"], "title": ["title1", "title2"]},
+        index=[10, 20],
+    )
+    recommender.user_df = pd.DataFrame(
+        {"userId": ["user1", "user2"], "history": ["page1, page2", ""]}
+    )
+
+    recommender._build_indexes()
+
+    assert recommender.page_index == {"page1": 0, "page2": 1}
+    histories = recommender.user_histories
+    assert histories.history(histories.row("user1")).tolist() == [0, 1]
+    assert histories.history(histories.row("user2")).tolist() == []
+    assert histories.row("user3") is None
+
+    recommender.add_news([{"page": "page3", "title": "title3"}])
+    assert recommender.page_index["page3"] == 2
+
+
+def test_add_news_computes_neighbors_incrementally():
+    recommender = NewsRecommendationSystem(neighbors_k=2)
+    recommender.news_df = pd.DataFrame(
+        {
+            "page": ["page1", "page2", "page3"],
+            "title": ["futebol gol", "eleição voto", "chuva frio"],
+            "body": ["time vence", "urna apuração", "previsão tempo"],
+            "caption": ["", "", ""],
+            "url": ["url1", "url2", "url3"],
+        }
+    )
+    recommender.user_df = pd.DataFrame({"userId": ["user1"], "history": ["page1"]})
+    recommender.prepare_data()
+
+    recommender.add_news(
+        [{"page": "page4", "title": "futebol gol", "body": "time vence", "url": "url4"}]
+    )
+
+    assert recommender.tfidf_matrix.shape[0] == 4
+    assert len(recommender.neighbor_table) == 4
+    assert recommender.neighbor_table.neighbors(0, 1)[0].tolist() == [3]
+
+
+def test_add_news_skips_pages_already_in_the_catalog():
+    recommender = NewsRecommendationSystem(neighbors_k=2)
+    recommender.news_df = pd.DataFrame(
+        {"page": ["page1"], "title": ["futebol"], "url": ["url1"]}
+    )
+    recommender.user_df = pd.DataFrame({"userId": ["user1"], "history": ["page1"]})
+    recommender.prepare_data()
+    news = [
+        {"page": "page2", "title": "chuva", "url": "url2"},
+        {"page": "page2", "title": "chuva", "url": "url2"},
+    ]
+
+    first = recommender.add_news(news)
+    retry = recommender.add_news(news + [{"page": "page1", "title": "x", "url": "x"}])
+
+    assert (first["added"], first["skipped"]) == (1, 1)
+    assert (retry["added"], retry["skipped"]) == (0, 3)
+    assert recommender.news_df["page"].tolist() == ["page1", "page2"]
+    assert recommender.page_index == {"page1": 0, "page2": 1}
+    assert recommender.tfidf_matrix.shape[0] == 2
+    assert len(recommender.neighbor_table) == 2
+
+
+def test_add_news_waits_for_queries_holding_the_state_lock():
+    recommender = NewsRecommendationSystem()
+    recommender.news_df = pd.DataFrame(
+        {"page": ["page1"], "title": ["futebol"], "url": ["url1"]}
+    )
+    recommender.user_df = pd.DataFrame({"userId": ["user1"], "history": ["page1"]})
+    recommender.prepare_data()
+
+    with recommender.state_lock.read():
+        adding = threading.Thread(
+            target=recommender.add_news,
+            args=([{"page": "page2", "title": "chuva", "url": "url2"}],),
+        )
+        adding.start()
+        adding.join(timeout=0.1)
+        assert adding.is_alive()
+        assert recommender.tfidf_matrix.shape[0] == 1
+    adding.join(timeout=5)
+
+    assert recommender.tfidf_matrix.shape[0] == 2
+    assert recommender.page_index["page2"] == 1
+
+
+def test_memory_usage_does_not_wait_for_the_state_lock():
+    recommender = NewsRecommendationSystem()
+    recommender.news_df = pd.DataFrame(
+        {"page": ["page1"], "title": ["futebol"], "url": ["url1"]}
+    )
+    recommender.user_df = pd.DataFrame({"userId": ["user1"], "history": ["page1"]})
+    recommender.prepare_data()
+    recommender.add_news([{"page": "page2", "title": "chuva", "url": "url2"}])
+
+    locked, release = threading.Event(), threading.Event()
+
+    def hold_write_lock():
+        with recommender.state_lock.write():
+            locked.set()
+            release.wait(timeout=5)
+
+    writer = threading.Thread(target=hold_write_lock)
+    writer.start()
+    locked.wait(timeout=5)
+    try:
+        result = {}
+        reader = threading.Thread(
+            target=lambda: result.update(
+                usage=recommender.memory_usage(), size=recommender.catalog_size()
+            )
+        )
+        reader.start()
+        reader.join(timeout=1)
+        assert not reader.is_alive()
+    finally:
+        release.set()
+        writer.join(timeout=5)
+
+    assert result["size"] == 2
+    assert result["usage"]["news_mb"] > 0
+    assert recommender._news_chunks
+
+
+@pytest.mark.parametrize("naive_catalog", [False, True])
+def test_undated_news_keeps_the_date_column_compactable(naive_catalog):
+    recommender = NewsRecommendationSystem()
+    recommender.news_df = pd.DataFrame(
+        {
+            "page": ["page1"],
+            "title": ["futebol"],
+            "url": ["url1"],
+            "issued": ["2018-03-01 10:00:00+00:00"],
+        }
+    )
+    recommender.user_df = pd.DataFrame({"userId": ["user1"], "history": ["page1"]})
+    recommender.prepare_data()
+    recommender.compact()
+    if naive_catalog:
+        # Modelos salvos antes das datas em UTC
+        recommender.news_df["date"] = recommender.news_df["date"].dt.tz_convert(None)
+    dtype = recommender.news_df["date"].dtype
+
+    recommender.add_news([{"page": "page2", "title": "chuva", "url": "url2"}])
+    recommender.compact()
+
+    assert recommender.news_df["date"].dtype == dtype
+    assert recommender.get_recent_news(1)[0]["page"] == "page2"
+
+
+def test_neighbor_table_is_opt_in_and_skipped_for_ivf():
+    news_df = pd.DataFrame(
+        {
+            "page": ["page1", "page2", "page3"],
+            "title": ["futebol gol", "eleição voto", "chuva frio"],
+            "body": ["", "", ""],
+            "caption": ["", "", ""],
+            "url": ["url1", "url2", "url3"],
+        }
+    )
+    user_df = pd.DataFrame({"userId": ["user1"], "history": ["page1"]})
+    for params in ({}, {"neighbors_k": 2, "index_type": "ivf"}):
+        recommender = NewsRecommendationSystem(**params)
+        recommender.news_df, recommender.user_df = news_df.copy(), user_df.copy()
+        recommender.prepare_data()
+
+        assert recommender.neighbor_table is None
+
+
+def test_user_recommendations_use_neighbors_of_recent_reads():
+    recommender = NewsRecommendationSystem(neighbors_k=2)
+    recommender.ranker = HybridRanker({"similar": 1.0})
+    recommender.news_df = pd.DataFrame(
+        {
+            "page": ["page1", "page2", "page3"],
+            "title": ["futebol gol", "futebol gol time", "chuva frio"],
+            "body": ["", "", ""],
+            "caption": ["", "", ""],
+            "url": ["url1", "url2", "url3"],
+        }
+    )
+    recommender.user_df = pd.DataFrame({"userId": ["user1"], "history": ["page1"]})
+    recommender.prepare_data()
+
+    recommendations = recommender.get_user_recommendations("user1", 1)
+
+    assert [r["page"] for r in recommendations] == ["page2"]
+
+
+def test_get_batch_recommendations_excludes_read_pages():
+    recommender = NewsRecommendationSystem()
+    recommender.news_df = pd.DataFrame(
+        {
+            "page": ["page1", "page2", "page3"],
+            "title": ["futebol gol", "futebol gol time", "chuva frio"],
+            "body": ["", "", ""],
+            "caption": ["", "", ""],
+            "url": ["url1", "url2", "url3"],
+        }
+    )
+    recommender.user_df = pd.DataFrame(
+        {"userId": ["user1", "user2"], "history": ["page3, page1", "page1, page2"]}
+    )
+    recommender.prepare_data()
+
+    results = list(
+        recommender.get_batch_recommendations(["user1", "user2"], n=2, max_block_bytes=1)
+    )
+
+    assert [r["user_id"] for r in results] == ["user1", "user2"]
+    assert [rec["page"] for rec in results[0]["recommendations"]] == ["page2"]
+    assert [rec["page"] for rec in results[1]["recommendations"]] == ["page3"]
+
+
+def test_batch_recommendations_match_the_hybrid_ranking():
+    recommender = NewsRecommendationSystem(neighbors_k=2)
+    recommender.news_df = pd.DataFrame(
+        {
+            "page": ["page1", "page2", "page3", "page4"],
+            "title": ["futebol gol", "futebol time", "chuva frio", "eleição voto"],
+            "url": ["url1", "url2", "url3", "url4"],
+        }
+    )
+    recommender.user_df = pd.DataFrame(
+        {
+            "userId": ["user1", "user2", "user3"],
+            "history": ["page1", "page1, page3", "page4, page2"],
+        }
+    )
+    recommender.prepare_data()
+    user_ids = ["user1", "user2", "user3", "desconhecido"]
+
+    results = recommender.get_batch_recommendations(user_ids, n=3, max_block_bytes=1)
+
+    for result, user_id in zip(results, user_ids):
+        expected = recommender.get_user_recommendations(user_id, 3)
+        # Os scores variam pouco: o frescor depende do instante do cálculo
+        assert result["recommendations"] == [pytest.approx(rec) for rec in expected]
+
+
+def test_profile_recommendations_use_whole_history():
+    recommender = NewsRecommendationSystem(neighbors_k=2)
+    recommender.news_df = pd.DataFrame(
+        {
+            "page": ["page1", "page2", "page3", "page4"],
+            "title": ["futebol gol", "chuva frio", "futebol chuva", "eleição voto"],
+            "body": ["", "", "", ""],
+            "caption": ["", "", "", ""],
+            "url": ["url1", "url2", "url3", "url4"],
+        }
+    )
+    recommender.user_df = pd.DataFrame(
+        {"userId": ["user1", "user2"], "history": ["page1, page2", "page9"]}
+    )
+    recommender.prepare_data()
+
+    recommendations = recommender._get_profile_recommendations("user1", 2)
+
+    assert recommendations[0]["page"] == "page3"
+    assert {"page1", "page2"}.isdisjoint(r["page"] for r in recommendations)
+    assert recommender._get_profile_recommendations("user2", 2) == []
+    assert recommender._get_profile_recommendations("unknown", 2) == []
+
+
+def test_svd_engine_with_ivf_index_serves_personalized_recommendations():
+    recommender = NewsRecommendationSystem(
+        engine="svd", embedding_dim=2, index_type="ivf"
+    )
+    recommender.news_df = pd.DataFrame(
+        {
+            "page": ["page1", "page2", "page3", "page4"],
+            "title": ["futebol gol", "chuva frio", "futebol gol time", "chuva neve"],
+            "url": ["url1", "url2", "url3", "url4"],
+        }
+    )
+    recommender.user_df = pd.DataFrame(
+        {"userId": ["user1", "user2"], "history": ["page1", "page2"]}
+    )
+    recommender.prepare_data()
+
+    single = recommender.get_user_recommendations("user1", 2)
+    (batch,) = recommender.get_batch_recommendations(["user1"], 2)
+
+    assert single and "page1" not in [r["page"] for r in single]
+    assert [r["page"] for r in batch["recommendations"]] == [
+        r["page"] for r in single
+    ]
+
+
+def test_svd_engine_serves_from_dense_embeddings(tmp_path):
+    recommender = NewsRecommendationSystem(
+        neighbors_k=2, engine="svd", embedding_dim=2
+    )
+    recommender.news_df = pd.DataFrame(
+        {
+            "page": ["page1", "page2", "page3", "page4"],
+            "title": ["futebol gol", "chuva frio", "futebol gol time", "chuva neve"],
+            "body": ["", "", "", ""],
+            "caption": ["", "", "", ""],
+            "url": ["url1", "url2", "url3", "url4"],
+            "date": pd.to_datetime(["2024-01-01"] * 4),
+        }
+    )
+    recommender.user_df = pd.DataFrame({"userId": ["user1"], "history": ["page1"]})
+    recommender.prepare_data()
+
+    assert isinstance(recommender.item_vectors, np.ndarray)
+    assert recommender.item_vectors.shape == (4, 2)
+    assert recommender._get_profile_recommendations("user1", 1)[0]["page"] == "page3"
+
+    recommender.add_news([{"page": "page5", "title": "futebol time", "url": "url5"}])
+    assert recommender.item_vectors.shape == (5, 2)
+    assert recommender.neighbor_table.neighbors(4, 1)[0][0] in (0, 2)
+
+    recommender.save_model(tmp_path / "model")
+    loaded = NewsRecommendationSystem.load_model(tmp_path / "model")
+    assert loaded.engine == "svd"
+    assert isinstance(loaded.item_vectors, np.memmap)
+    assert loaded._get_profile_recommendations("user1", 1)[0]["page"] in (
+        "page3",
+        "page5",
+    )
+
+
+def test_hashing_vectorizer_indexes_new_news_and_round_trips(tmp_path):
+    recommender = NewsRecommendationSystem(
+        neighbors_k=2,
+        vectorizer_type="hashing",
+        stop_words="portuguese",
+        fold_accents=True,
+    )
+    recommender.news_df = pd.DataFrame(
+        {
+            "page": ["page1", "page2", "page3"],
+            "title": ["Eleição da urna", "chuva frio", "futebol gol"],
+            "body": ["", "", ""],
+            "caption": ["", "", ""],
+            "url": ["url1", "url2", "url3"],
+            "date": pd.to_datetime(["2024-01-01"] * 3),
+        }
+    )
+    recommender.user_df = pd.DataFrame({"userId": ["user1"], "history": ["page2"]})
+    recommender.prepare_data()
+
+    result = recommender.add_news(
+        [{"page": "page4", "title": "ELEICAO na URNA", "url": "url4"}]
+    )
+    assert result["refit"] is False
+    assert recommender.neighbor_table.neighbors(0, 1)[0].tolist() == [3]
+
+    recommender.save_model(tmp_path / "model")
+    loaded = NewsRecommendationSystem.load_model(tmp_path / "model")
+    assert loaded.vectorizer_type == "hashing" and loaded.fold_accents
+    np.testing.assert_allclose(
+        loaded.vectorizer.transform(["eleicao urna"]).toarray(),
+        recommender.vectorizer.transform(["eleicao urna"]).toarray(),
+    )
+
+
+def test_unknown_engine_is_rejected():
+    with pytest.raises(ValueError):
+        NewsRecommendationSystem(engine="bm25")
+
+
+def test_add_news_refits_vocabulary_after_drift():
+    recommender = NewsRecommendationSystem(neighbors_k=2, refit_threshold=0.5)
+    recommender.drift_tracker.min_tokens = 1
+    recommender.news_df = pd.DataFrame(
+        {
+            "page": ["page1", "page2"],
+            "title": ["futebol gol", "chuva frio"],
+            "body": ["", ""],
+            "caption": ["", ""],
+            "url": ["url1", "url2"],
+        }
+    )
+    recommender.user_df = pd.DataFrame({"userId": ["user1"], "history": ["page1"]})
+    recommender.prepare_data()
+
+    result = recommender.add_news(
+        [{"page": "page3", "title": "futebol gol", "body": "", "url": "url3"}]
+    )
+    assert result == {
+        "added": 1,
+        "skipped": 0,
+        "vocabulary_drift": 0.0,
+        "needs_refit": False,
+        "refit": False,
+    }
+    assert recommender.news_df["date"].iloc[-1] is not pd.NaT
+
+    result = recommender.add_news(
+        [{"page": "page4", "title": "eleição urna voto", "url": "url4"}]
+    )
+    assert result["refit"]
+    assert "eleição" in recommender.vectorizer.vocabulary_
+    assert recommender.tfidf_matrix.shape[0] == 4
+    assert recommender.drift_tracker.drift == 0.0
+
+
+def test_compacted_model_reports_that_it_needs_refit_after_drift():
+    recommender = NewsRecommendationSystem(refit_threshold=0.5)
+    recommender.drift_tracker.min_tokens = 1
+    recommender.news_df = pd.DataFrame(
+        {"page": ["page1"], "title": ["futebol gol"], "url": ["url1"]}
+    )
+    recommender.user_df = pd.DataFrame({"userId": ["user1"], "history": ["page1"]})
+    recommender.prepare_data()
+    recommender.compact()
+
+    result = recommender.add_news(
+        [{"page": "page2", "title": "eleição urna voto", "url": "url2"}]
+    )
+
+    assert not result["refit"]
+    assert result["needs_refit"]
+    assert result["vocabulary_drift"] == 1.0
+    assert recommender.vocabulary_status() == {
+        "vocabulary_drift": 1.0,
+        "needs_refit": True,
+    }
+
+
+def test_popular_recommendations_are_cached_until_add_news():
+    recommender = NewsRecommendationSystem(neighbors_k=2)
+    recommender.news_df = pd.DataFrame(
+        {
+            "page": ["page1", "page2"],
+            "title": ["futebol gol", "chuva frio"],
+            "body": ["", ""],
+            "caption": ["", ""],
+            "url": ["url1", "url2"],
+        }
+    )
+    recommender.user_df = pd.DataFrame(
+        {"userId": ["user1", "user2"], "history": ["page1", "page1,page2"]}
+    )
+    recommender.prepare_data()
+
+    with patch.object(
+        recommender, "_compute_popular", wraps=recommender._compute_popular
+    ) as mock_compute:
+        first = recommender.get_popular_recommendations(1)
+        second = recommender.get_popular_recommendations(1)
+        assert first == second == [{"page": "page1", "title": "futebol gol", "url": "url1"}]
+        assert mock_compute.call_count == 1
+
+        version = recommender.model_version
+        recommender.add_news([{"page": "page3", "title": "futebol", "url": "url3"}])
+        assert recommender.model_version != version
+        recommender.get_popular_recommendations(1)
+        assert mock_compute.call_count == 2
+
+
+def test_recorded_events_drive_popular_and_cold_start():
+    recommender = NewsRecommendationSystem(neighbors_k=2)
+    recommender.news_df = pd.DataFrame(
+        {
+            "page": ["page1", "page2"],
+            "title": ["futebol gol", "chuva frio"],
+            "body": ["", ""],
+            "caption": ["", ""],
+            "url": ["url1", "url2"],
+            "date": pd.to_datetime(["2023-10-01", "2023-10-02"]),
+        }
+    )
+    recommender.user_df = pd.DataFrame(
+        {"userId": ["user1", "user2"], "history": ["page1", "page1,page2"]}
+    )
+    recommender.prepare_data()
+    assert recommender.get_popular_recommendations(1)[0]["page"] == "page1"
+    assert recommender.get_recommendations_for_new_user(2)[0]["page"] == "page1"
+
+    result = recommender.record_events(["page2"] * 5 + ["nova"], [None] * 6)
+
+    # As respostas em cache da popularidade são descartadas pelos cliques
+    assert result == {"accepted": 5, "unknown": 1}
+    assert recommender.get_popular_recommendations(1)[0]["page"] == "page2"
+    cold_start = recommender.get_recommendations_for_new_user(2)
+    assert cold_start[0]["page"] == "page2"
+    # O score exposto continua na escala [0, 1] do treino
+    assert cold_start[0]["popularity_score"] == pytest.approx(1.0)
+    assert all(0 <= news["popularity_score"] <= 1 for news in cold_start)
+    assert recommender.live_popularity.top_unknown(1)[0][0] == "nova"
+
+
+def test_recent_page_returns_newest_first_and_pages_by_cursor():
+    recommender = NewsRecommendationSystem(neighbors_k=2)
+    now = pd.Timestamp.now(tz="UTC")
+    recommender.news_df = pd.DataFrame(
+        {
+            "page": ["page1", "page2", "page3"],
+            "title": ["futebol gol", "chuva frio", "eleição"],
+            "body": ["", "", ""],
+            "caption": ["", "", ""],
+            "url": ["url1", "url2", "url3"],
+            "issued": [now - pd.Timedelta(hours=5), now, now - pd.Timedelta(days=9)],
+        }
+    )
+    recommender.user_df = pd.DataFrame(
+        {"userId": ["user1", "user2"], "history": ["page1", "page1,page2"]}
+    )
+    recommender.prepare_data()
+
+    first = recommender.get_recent_page(1)
+    assert [news["page"] for news in first["news"]] == ["page2"]
+    second = recommender.get_recent_page(1, cursor=first["next_cursor"])
+    assert [news["page"] for news in second["news"]] == ["page1"]
+    assert second["next_cursor"] is None
+    assert len(recommender.get_recent_page(5, hours=24 * 10)["news"]) == 3
+
+    recommender.add_news([{"page": "page4", "title": "futebol", "url": "url4"}])
+    assert recommender.get_recent_news(1)[0]["page"] == "page4"
+
+
+def test_user_recommendations_fuse_content_popular_and_recent():
+    recommender = NewsRecommendationSystem(neighbors_k=2)
+    recommender.news_df = pd.DataFrame(
+        {
+            "page": ["page1", "page2", "page3", "page4"],
+            "title": ["futebol gol", "chuva frio", "futebol chuva", "eleição voto"],
+            "body": ["", "", "", ""],
+            "caption": ["", "", "", ""],
+            "url": ["url1", "url2", "url3", "url4"],
+        }
+    )
+    recommender.user_df = pd.DataFrame(
+        {"userId": ["user1", "user2"], "history": ["page1, page2", "page4"]}
+    )
+    recommender.prepare_data()
+    recommender.record_events(["page4"] * 10)
+
+    recommendations = recommender.get_user_recommendations("user1", 2)
+
+    assert [r["page"] for r in recommendations] == ["page3", "page4"]
+    assert recommendations[0]["score"] >= recommendations[1]["score"]
+    assert recommender.get_user_recommendations("user1", 2) == recommendations
+    # As populares e recentes completam a lista, sem repetir as já lidas
+    pages = [r["page"] for r in recommender.get_user_recommendations("user2", 3)]
+    assert len(pages) == 3 and "page4" not in pages
+
+
+def test_user_recommendations_use_co_visitation():
+    recommender = NewsRecommendationSystem(neighbors_k=2, n_jobs=1)
+    recommender.news_df = pd.DataFrame(
+        {
+            "page": ["page1", "page2", "page3", "page4"],
+            "title": ["futebol gol", "chuva frio", "eleição voto", "bolsa dólar"],
+            "body": ["", "", "", ""],
+            "caption": ["", "", "", ""],
+            "url": ["url1", "url2", "url3", "url4"],
+        }
+    )
+    recommender.user_df = pd.DataFrame(
+        {
+            "userId": ["user1", "user2", "user3"],
+            "history": ["page1, page3", "page1, page3", "page1"],
+        }
+    )
+    recommender.prepare_data()
+    recommender.ranker.weights = {"covisit": 1.0}
+
+    recommendations = recommender.get_user_recommendations("user3", 1)
+
+    assert recommendations[0]["page"] == "page3"
@@ -0,0 +1,39 @@
+import json
+
+import numpy as np
+import pandas as pd
+from src.utils import serialization
+from src.utils.serialization import dumps, loads, render_object
+
+
+def test_dumps_handles_numpy_and_dates():
+    payload = dumps({"score": np.float32(0.5), "date": pd.Timestamp("2023-10-01")})
+
+    data = loads(payload)
+    assert data["score"] == 0.5
+    assert data["date"].startswith("2023-10-01")
+
+
+def test_render_object_embeds_pre_rendered_bytes():
+    payload = render_object({"items": b'[{"page":"p"}]', "cursor": None, "n": 1})
+
+    assert json.loads(payload) == {"items": [{"page": "p"}], "cursor": None, "n": 1}
+
+
+def test_fallback_without_orjson(monkeypatch):
+    monkeypatch.setattr(serialization, "orjson", None)
+
+    payload = dumps({"title": "ação", "values": [1, 2]})
+
+    assert payload == '{"title":"ação","values":[1,2]}'.encode()
+    assert loads(payload) == {"title": "ação", "values": [1, 2]}
+
+
+def test_fallback_converts_numpy_types(monkeypatch):
+    monkeypatch.setattr(serialization, "orjson", None)
+
+    payload = dumps(
+        {"score": np.float32(0.5), "n": np.int64(3), "values": np.arange(2)}
+    )
+
+    assert loads(payload) == {"score": 0.5, "n": 3, "values": [0, 1]}
@@ -0,0 +1,72 @@
+import asyncio
+import signal
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+from src.api import main
+from src.api.serve import PreforkServer
+
+
+@patch("src.api.serve.os.waitpid")
+@patch.object(PreforkServer, "_spawn")
+def test_reap_respawns_only_current_workers(mock_spawn, mock_waitpid):
+    server = PreforkServer(main.app, workers=2)
+    server.generation = 1
+    server.children = {10: 0, 11: 1, 12: 1}
+    mock_waitpid.side_effect = [(10, 0), (11, 9), (0, 0)]
+
+    server._reap()
+
+    mock_spawn.assert_called_once()
+    assert server.children == {12: 1}
+
+
+@patch("src.api.serve.gc")
+@patch("src.api.serve.os.kill")
+@patch("src.api.serve.load_recommender", return_value="novo modelo")
+@patch.object(PreforkServer, "_spawn")
+def test_reload_replaces_workers(mock_spawn, mock_load, mock_kill, mock_gc):
+    server = PreforkServer(main.app, workers=2)
+    server.children = {10: 0, 11: 0}
+    server.reload_requested = True
+
+    try:
+        server._reload()
+    finally:
+        main.app.state.preloaded = False
+
+    assert main.app.state.recommender == "novo modelo"
+    assert server.generation == 1
+    assert mock_spawn.call_count == 2
+    assert [call.args[0] for call in mock_kill.call_args_list] == [10, 11]
+    mock_gc.freeze.assert_called_once()
+
+
+@patch("src.api.main.load_recommender")
+def test_startup_keeps_preloaded_model(mock_load):
+    main.app.state.recommender = "modelo do pai"
+    main.app.state.preloaded = True
+    try:
+        asyncio.run(main.startup_event())
+    finally:
+        main.app.state.preloaded = False
+
+    mock_load.assert_not_called()
+    assert main.app.state.recommender == "modelo do pai"
+
+
+@patch("src.api.jobs.os.kill")
+def test_prefork_workers_delegate_reload_and_refuse_local_changes(mock_kill):
+    main.app.state.prefork_parent = 1234
+    try:
+        client = TestClient(main.app)
+        reload = client.get("/reload-model")
+        added = client.post("/add-news", json={"news": [{"page": "page3"}]})
+        events = client.post("/events", json={"events": [{"page": "page1"}]})
+    finally:
+        del main.app.state.prefork_parent
+
+    assert reload.json()["status"] == "accepted"
+    mock_kill.assert_called_once_with(1234, signal.SIGHUP)
+    assert added.status_code == 501
+    assert events.status_code == 501
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from src.models.similarity_index import (
+    ExactIndex,
+    benchmark_indexes,
+    build_similarity_index,
+    load_similarity_index,
+    top_k,
+)
+
+
+@pytest.fixture
+def tfidf_matrix():
+    rng = np.random.default_rng(0)
+    vocabulary = [f"termo{i}" for i in range(50)]
+    documents = [" ".join(rng.choice(vocabulary, 20)) for _ in range(300)]
+    return TfidfVectorizer().fit_transform(documents)
+
+
+def test_top_k_excludes_positions():
+    positions, scores = top_k(np.array([0.1, 0.9, 0.5, 0.7]), 2, exclude=[1])
+
+    assert positions.tolist() == [3, 2]
+    assert scores.tolist() == pytest.approx([0.7, 0.5])
+
+
+def test_exact_index_matches_full_sort(tfidf_matrix):
+    index = build_similarity_index("exact", tfidf_matrix)
+    positions, _ = index.query(tfidf_matrix[0], 5, exclude=[0])
+
+    similarities = (tfidf_matrix @ tfidf_matrix[0].T).toarray().ravel()
+    expected = np.argsort(-similarities)[1:6]
+    assert set(positions) == set(expected)
+
+
+def test_ivf_index_recall_grows_with_n_probe(tfidf_matrix):
+    ivf = build_similarity_index("ivf", tfidf_matrix, n_components=16, n_lists=10)
+    indexes = {
+        n_probe: load_similarity_index(
+            {**ivf.get_params(), "n_probe": n_probe}, ivf.get_arrays(), tfidf_matrix
+        )
+        for n_probe in (1, 10)
+    }
+
+    results = benchmark_indexes(tfidf_matrix, indexes, n_queries=30, k=5)
+
+    assert results[0]["recall"] <= results[1]["recall"]
+    assert results[1]["recall"] == pytest.approx(1.0)
+
+
+def test_unknown_index_type(tfidf_matrix):
+    with pytest.raises(ValueError):
+        build_similarity_index("desconhecido", tfidf_matrix)
+
+
+def test_ivf_index_add_keeps_all_items(tfidf_matrix):
+    ivf = build_similarity_index(
+        "ivf", tfidf_matrix[:250], n_components=16, n_lists=5, n_probe=5
+    )
+    ivf.add(tfidf_matrix)
+
+    assert sorted(ivf.list_items.tolist()) == list(range(300))
+    positions, _ = ivf.query(tfidf_matrix[299], 1)
+    assert positions.tolist() == [299]
+
+
+def test_ivf_index_queries_pending_items_before_merge(tfidf_matrix):
+    ivf = build_similarity_index(
+        "ivf", tfidf_matrix[:290], n_components=16, n_lists=5, n_probe=5
+    )
+
+    ivf.add(tfidf_matrix)
+
+    assert ivf.list_items.shape[0] == 290
+    assert ivf.pending_items.array.tolist() == list(range(290, 300))
+    assert ivf.query(tfidf_matrix[295], 1)[0].tolist() == [295]
+    assert sorted(ivf.get_arrays()["list_items"].tolist()) == list(range(300))
+
+
+def test_ivf_index_accepts_dense_query_vectors():
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(200, 8)).astype(np.float32)
+    ivf = build_similarity_index("ivf", vectors, n_components=4, n_lists=5)
+    exact = ExactIndex().fit(vectors)
+
+    positions, scores = ivf.query(vectors[3], 5, exclude=[3])
+
+    assert positions.shape == (5,) and 3 not in positions.tolist()
+    expected, _ = exact.query(vectors[3], 1, exclude=[3])
+    assert positions[0] == expected[0]
@@ -0,0 +1,81 @@
+import numpy as np
+from src.models.streaming import CountMinSketch, StreamingPopularity
+
+
+def test_scores_decay_with_half_life():
+    popularity = StreamingPopularity(3, half_life_hours=1, sketch_width=0)
+    now = popularity.landmark
+
+    popularity.add(np.array([0, 0, 1]), np.array([now, now, now]))
+
+    np.testing.assert_allclose(popularity.scores(now), [2, 1, 0])
+    np.testing.assert_allclose(popularity.scores(now + 3600), [1, 0.5, 0])
+
+
+def test_top_ranks_by_decayed_score():
+    popularity = StreamingPopularity(3, half_life_hours=1, sketch_width=0)
+    now = popularity.landmark
+    # Dois cliques antigos valem menos que um clique recente
+    popularity.add(np.array([0, 0, 2]), np.array([now - 3 * 3600] * 2 + [now]))
+
+    positions, scores = popularity.top(2, now)
+
+    assert positions.tolist() == [2, 0]
+    np.testing.assert_allclose(scores, [1, 0.25])
+
+
+def test_views_count_recent_buckets_only():
+    popularity = StreamingPopularity(2, bucket_seconds=60, n_buckets=5)
+    now = popularity.landmark
+
+    popularity.add(np.array([0, 0, 1]), np.array([now - 120, now, now]))
+
+    assert popularity.views(60, now).tolist() == [1, 1]
+    assert popularity.views(300, now).tolist() == [2, 1]
+    assert popularity.views(300, now + 600).tolist() == [0, 0]
+
+
+def test_seed_and_resize():
+    popularity = StreamingPopularity(2, sketch_width=0)
+    now = popularity.landmark
+    popularity.seed(np.array([5.0, 1.0]), now)
+
+    popularity.resize(3)
+    popularity.add(np.array([2]), np.array([now]))
+
+    np.testing.assert_allclose(popularity.scores(now), [5, 1, 1])
+
+
+def test_resize_keeps_counts_and_reserves_capacity():
+    popularity = StreamingPopularity(2, bucket_seconds=60, sketch_width=0)
+    now = popularity.landmark
+    popularity.add(np.array([0, 1, 1]), np.array([now] * 3))
+
+    popularity.resize(3)
+    buffer = popularity.decayed
+    popularity.resize(4)
+    popularity.add(np.array([3]), np.array([now]))
+
+    assert np.shares_memory(popularity.decayed, buffer)
+    np.testing.assert_allclose(popularity.scores(now), [1, 2, 0, 1])
+    assert popularity.views(60, now).tolist() == [1, 2, 0, 1]
+
+
+def test_count_min_sketch_tracks_heavy_hitters():
+    sketch = CountMinSketch(width=1024, depth=4, k=2)
+    keys = ["a"] * 50 + ["b"] * 30 + [f"tail{i}" for i in range(200)]
+
+    sketch.add(keys, np.ones(len(keys)))
+
+    assert [key for key, _ in sketch.top(2)] == ["a", "b"]
+    assert sketch.estimate(["a"])[0] >= 50
+
+
+def test_unknown_pages_go_to_sketch():
+    popularity = StreamingPopularity(1)
+
+    popularity.add(np.array([], dtype=np.int64), unknown=["nova"] * 3 + ["outra"])
+
+    top = popularity.top_unknown(1)
+    assert top[0][0] == "nova"
+    assert popularity.events == 4
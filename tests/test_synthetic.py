@@ -0,0 +1,27 @@
+import pandas as pd
+from src.data.synthetic import SyntheticDataset
+
+
+def test_generates_raw_files_in_chunks(tmp_path):
+    dataset = SyntheticDataset(n_items=50, n_users=120, n_topics=5, seed=1)
+    dataset.write(tmp_path, chunk_size=40)
+
+    news = pd.read_parquet(tmp_path / "raw/noticias.parquet")
+    users = pd.read_parquet(tmp_path / "raw/interacoes.parquet")
+
+    assert len(news) == 50 and news["page"].is_unique
+    assert {"page", "url", "issued", "title", "body", "caption"} <= set(news.columns)
+    assert len(users) == 120 and users["userId"].is_unique
+
+    pages = users["history"].str.split(",")
+    timestamps = users["timestampHistory"].str.split(",")
+    assert (pages.str.len() == users["historySize"]).all()
+    assert (pages.str.len() == timestamps.str.len()).all()
+    assert pages.explode().isin(news["page"]).all()
+    assert timestamps.map(lambda t: t == sorted(t, key=int)).all()
+
+
+def test_generation_is_deterministic():
+    first = next(SyntheticDataset(n_items=20, n_users=10, seed=3).interactions())
+    second = next(SyntheticDataset(n_items=20, n_users=10, seed=3).interactions())
+    pd.testing.assert_frame_equal(first, second)